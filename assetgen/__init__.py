@@ -0,0 +1 @@
+"""Shared rendering helpers for the store asset generator scripts."""
@@ -0,0 +1,55 @@
+"""
+One entry point for the asset tooling.
+
+    python -m assetgen build [-j N] [--launcher-icons] [--dry-run] ...
+    python -m assetgen achievements [--delta] [--preview] ...
+    python -m assetgen store [--launcher-icons] ...
+    python -m assetgen bench run|compare ...
+    python -m assetgen watch [--port 8765] ...
+    python -m assetgen validate [store_assets/achievements_import.zip] ...
+    python -m assetgen golden [-j N] [--only GLOB] [--exact] [--update]
+
+Each command hands the rest of the command line to that tool's own
+``main(argv)``, so ``python -m assetgen store --help`` lists the store
+options. Only the chosen tool is imported.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# command -> (module, help)
+COMMANDS = {
+    "build": ("assetgen.build", "build every store asset, skipping targets whose inputs are unchanged"),
+    "achievements": ("generate_achievements_zip", "build the Play Games achievements import ZIP"),
+    "store": ("generate_store_assets", "render the Play Store icon, feature graphic and launcher icons"),
+    "bench": ("assetgen.bench", "benchmark the renderers and compare against a baseline"),
+    "watch": ("assetgen.watch", "re-render on change and serve a live preview page"),
+    "validate": ("assetgen.validate", "check an achievements import ZIP against the Play Games rules"),
+    "golden": ("assetgen.golden", "re-render every committed PNG and diff it against the committed file"),
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = argparse.ArgumentParser(prog="python -m assetgen", description="GeoQuiz store asset tooling.")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    for name, (_, help) in COMMANDS.items():
+        sub.add_parser(name, help=help)
+    # Only the command is parsed here; everything after it (including --help)
+    # belongs to the tool.
+    args = parser.parse_args(argv[:1])
+
+    module_name = COMMANDS[args.command][0]
+    if "." not in module_name and REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    module = importlib.import_module(module_name)
+    sys.argv[0] = f"python -m assetgen {args.command}"  # for the tool's usage lines
+    return module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Reproducible in-memory ZIP building.
+
+Entries are written in sorted order with a fixed timestamp and fixed
+permissions, so the archive bytes (and therefore its hash) only change when an
+entry's content does. Already-compressed payloads such as PNGs are stored
+rather than deflated a second time.
+"""
+
+import io
+import os
+
+from assetgen.lazy import lazy_import
+
+hashlib = lazy_import("hashlib")
+zipfile = lazy_import("zipfile")
+
+# Earliest timestamp the ZIP format can represent.
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+STORED_EXTENSIONS = (".png", ".webp", ".jpg", ".jpeg", ".zip")
+
+
+def _compression_for(name):
+    return zipfile.ZIP_STORED if name.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+
+
+def build_zip(entries):
+    """Return the bytes of a reproducible ZIP holding ``entries`` (name -> bytes or str)."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name in sorted(entries):
+            data = entries[name]
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            info = zipfile.ZipInfo(name, date_time=FIXED_DATE_TIME)
+            info.create_system = 3  # unix, so the external attributes below mean the same everywhere
+            info.external_attr = 0o644 << 16
+            info.compress_type = _compression_for(name)
+            zf.writestr(info, data, compresslevel=9 if info.compress_type == zipfile.ZIP_DEFLATED else None)
+    return buf.getvalue()
+
+
+def sha256_file(path):
+    """Hex SHA-256 of the file at ``path``, or None if it doesn't exist."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def write_if_changed(path, data):
+    """
+    Write ``data`` to ``path`` unless the file already holds identical bytes.
+
+    Returns ``(sha256, changed)``; an unchanged archive keeps its mtime, so
+    upload steps can skip it.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    if sha256_file(path) == digest:
+        return digest, False
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return digest, True
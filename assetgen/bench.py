@@ -0,0 +1,239 @@
+"""
+Benchmarks for the store asset renderers.
+
+    python -m assetgen.bench run [-o results.json] [--scale 2000] [--jobs N]
+    python -m assetgen.bench compare baseline.json [results.json] [--threshold 0.10]
+
+``run`` times every ``draw_*_symbol`` function (and records its display-list
+op count, a machine-independent complexity measure), ``create_achievement_icon``
+per tier, ``create_icon``, ``create_feature_graphic`` and a full uncached
+achievements ZIP build. Each case runs in a fresh spawned process, so its
+peak RSS is its own. ``--scale N`` adds a throughput case rendering N
+synthetic achievements (the real list repeated with unique ids).
+
+``compare`` reports the per-case change against a stored baseline and exits
+non-zero when any case is slower by more than ``--threshold``.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS = os.path.join(REPO_ROOT, "benchmarks", "latest.json")
+
+
+def _generators():
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    import generate_achievements_zip as achievements
+    import generate_store_assets as store
+    return achievements, store
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def time_call(fn, min_time=0.2, repeat=3):
+    """Best-of-``repeat`` seconds per call, looping each round for at least ``min_time``."""
+    fn()  # warm caches (fonts, templates) so every round measures steady state
+    best = float("inf")
+    calls = 0
+    for _ in range(repeat):
+        n = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            n += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        calls += n
+        best = min(best, elapsed / n)
+    return best, calls
+
+
+def synthetic_achievements(count, base):
+    """``count`` achievements cycling through ``base`` with unique ids."""
+    batch = []
+    for i in range(count):
+        aid, *rest = base[i % len(base)]
+        batch.append((f"{aid}_{i}", *rest))
+    return batch
+
+
+def list_cases(scale=0):
+    achievements, _ = _generators()
+    cases = [("symbol", theme) for theme in achievements.DRAW_FUNCTIONS]
+    cases += [("icon", tier) for tier in achievements.TIER_COLORS]
+    cases += [("store", "icon"), ("store", "feature_graphic"), ("zip", "main")]
+    if scale:
+        cases.append(("scale", str(scale)))
+    return cases
+
+
+def run_case(kind, arg, jobs=1):
+    """Run one benchmark case in this process and return its result dict."""
+    from PIL import Image, ImageDraw
+
+    achievements, store = _generators()
+    items = 1
+    extra = {}
+    if kind == "symbol":
+        s = 1024
+        color = achievements.TIER_COLORS["GOLD"]["glow"]
+        draw_fn = achievements.DRAW_FUNCTIONS[arg]
+        # Recorded draw calls: how complex the symbol is, independent of the machine.
+        extra["ops"] = len(achievements.symbol_display_list(arg))
+
+        def fn():
+            img = Image.new("RGBA", (s, s), (0, 0, 0, 0))
+            draw_fn(ImageDraw.Draw(img), s // 2, s // 2, int(s * 0.38), color)
+    elif kind == "icon":
+        def fn():
+            achievements.create_achievement_icon("bench", "Bench", arg, "star")
+    elif kind == "store":
+        fn = getattr(store, f"create_{arg}")
+    elif kind == "zip":
+        items = len(achievements.ACHIEVEMENTS)
+        tmp = tempfile.mkdtemp(prefix="assetgen-bench-")
+        argv = ["--no-cache", "-j", str(jobs), "-o", os.path.join(tmp, "achievements_import.zip")]
+
+        def fn():
+            with contextlib.redirect_stdout(io.StringIO()):
+                achievements.main(argv)
+    elif kind == "scale":
+        batch = synthetic_achievements(int(arg), achievements.ACHIEVEMENTS)
+        items = len(batch)
+
+        def fn():
+            for _ in achievements.render_icons(batch, jobs):
+                pass
+    else:
+        raise ValueError(f"Unknown benchmark kind: {kind!r}")
+
+    if kind in ("zip", "scale"):
+        start = time.perf_counter()
+        fn()
+        seconds, calls = time.perf_counter() - start, 1
+    else:
+        seconds, calls = time_call(fn)
+    return {
+        "seconds": seconds,
+        "calls": calls,
+        "items_per_sec": items / seconds if seconds else None,
+        "peak_rss_kb": peak_rss_kb(),
+        **extra,
+    }
+
+
+def run(cases, jobs=1, isolate=True):
+    """Run ``cases``, each in a fresh spawned process when ``isolate`` is set."""
+    results = {}
+    ctx = multiprocessing.get_context("spawn")
+    for kind, arg in cases:
+        name = f"{kind}/{arg}"
+        if isolate:
+            with ctx.Pool(1) as pool:
+                results[name] = pool.apply(run_case, (kind, arg, jobs))
+        else:
+            results[name] = run_case(kind, arg, jobs)
+        r = results[name]
+        rss = f"{r['peak_rss_kb'] / 1024:7.0f} MB" if r["peak_rss_kb"] else "      -"
+        ops = f"  {r['ops']:4d} ops" if "ops" in r else ""
+        print(f"  {name:<28} {r['seconds'] * 1000:10.2f} ms  {r['items_per_sec']:9.1f}/s  {rss}{ops}",
+              flush=True)
+    return results
+
+
+def environment():
+    import numpy
+    import PIL
+    return {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(baseline, current, threshold):
+    """Print per-case changes; return the names that regressed beyond ``threshold``."""
+    regressions = []
+    print(f"  {'Case':<28} {'Baseline':>11} {'Current':>11} {'Change':>8}")
+    for name, base in baseline["results"].items():
+        cur = current["results"].get(name)
+        if cur is None:
+            print(f"  {name:<28} {base['seconds'] * 1000:9.2f}ms {'missing':>11}")
+            continue
+        change = cur["seconds"] / base["seconds"] - 1 if base["seconds"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<28} {base['seconds'] * 1000:9.2f}ms {cur['seconds'] * 1000:9.2f}ms "
+              f"{change:+7.1%}{flag}")
+    for name in current["results"].keys() - baseline["results"].keys():
+        print(f"  {name:<28} {'new':>11} {current['results'][name]['seconds'] * 1000:9.2f}ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the store asset renderers.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run the benchmarks and save a JSON result file")
+    run_p.add_argument("-o", "--output", default=DEFAULT_RESULTS, help=f"results file (default: {DEFAULT_RESULTS})")
+    run_p.add_argument("--scale", type=int, default=0, help="add a throughput case with N synthetic achievements")
+    run_p.add_argument("-j", "--jobs", type=int, default=1, help="worker processes for the zip and scale cases")
+    run_p.add_argument("-k", "--filter", default="", help="only run cases whose name contains this string")
+    run_p.add_argument("--no-isolate", action="store_true", help="run every case in this process")
+
+    cmp_p = sub.add_parser("compare", help="compare a result file against a baseline")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current", nargs="?", default=DEFAULT_RESULTS)
+    cmp_p.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown (default: 0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        cases = [c for c in list_cases(args.scale) if args.filter in f"{c[0]}/{c[1]}"]
+        print(f"Running {len(cases)} benchmarks...")
+        report = {"environment": environment(), "results": run(cases, args.jobs, not args.no_isolate)}
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n  Saved: {args.output}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n  {len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\n  No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
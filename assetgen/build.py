@@ -0,0 +1,169 @@
+"""
+Build every store asset in one incremental, parallel run.
+
+    python -m assetgen build [-j N] [--launcher-icons] [--dry-run] [--force]
+
+Declares the store icon, feature graphic (and, with --launcher-icons, the
+mipmaps), each achievement icon, the achievement CSVs and the import ZIP
+(and, with --localized-icons, every locale's icons; with --variants, the
+locked/dimmed/high-contrast/dark icon variants) as targets of one build
+graph (see ``assetgen.graph``). Targets whose inputs are unchanged since the
+last run are skipped, and the rest run on all cores. --res-format and
+--variants-format write the mipmaps and variants as PNG or lossless WebP.
+"""
+
+import argparse
+import os
+import sys
+
+from assetgen import fonts, instrument
+from assetgen.encoders import TARGET_FORMATS, remove_other_formats
+from assetgen.graph import BuildError, BuildGraph
+from assetgen.localization import TranslationError
+from assetgen.png_optimize import PngOptions
+from assetgen.quality import DEFAULT as DEFAULT_QUALITY, PRESETS as QUALITY_PRESETS
+from assetgen.render_cache import DEFAULT_MAX_BYTES, RenderCache
+from assetgen.validate import format_report, validate_path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(REPO_ROOT, ".render_cache", "build")
+STATE_PATH = os.path.join(REPO_ROOT, ".render_cache", "build_state.json")
+PROFILE_DIR = os.path.join(REPO_ROOT, ".profile")
+
+
+def _generators():
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    import generate_achievements_zip as achievements
+    import generate_store_assets as store
+    return achievements, store
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build all store assets, skipping unchanged targets.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="targets to build in parallel (default: number of CPUs)",
+    )
+    parser.add_argument("--launcher-icons", action="store_true", help="also build the mipmap launcher icons")
+    parser.add_argument(
+        "--res-format", choices=TARGET_FORMATS, default="png",
+        help="format of the launcher icons (default: png; the store icon always stays PNG)",
+    )
+    parser.add_argument("--no-store", action="store_true", help="skip the store icon and feature graphic")
+    parser.add_argument("--no-achievements", action="store_true", help="skip the achievements ZIP")
+    parser.add_argument(
+        "--quality", choices=list(QUALITY_PRESETS), default=DEFAULT_QUALITY,
+        help=f"supersampling preset for achievement icons (default: {DEFAULT_QUALITY})",
+    )
+    parser.add_argument(
+        "--write-files", nargs="?", const="", metavar="DIR",
+        help="also write the loose achievement icons and CSVs (default DIR: store_assets/achievements)",
+    )
+    parser.add_argument(
+        "--localized-icons", nargs="?", const="", metavar="DIR",
+        help="also build each locale's icons with translated tier labels "
+             "(default DIR: store_assets/achievements_localized)",
+    )
+    parser.add_argument(
+        "--variants", nargs="?", const="", metavar="DIR",
+        help="also build the locked/dimmed/high-contrast/dark variants of every icon "
+             "(default DIR: store_assets/achievements_variants)",
+    )
+    parser.add_argument(
+        "--variants-format", choices=TARGET_FORMATS, default="png",
+        help="format of the --variants icons (default: png)",
+    )
+    parser.add_argument(
+        "--allow-font-substitutes", action="store_true",
+        help="build even if Arial is missing (the text then won't match the committed artwork)",
+    )
+    parser.add_argument("-n", "--dry-run", action="store_true", help="list the targets that would be built")
+    parser.add_argument("--force", action="store_true", help="rebuild every target")
+    parser.add_argument(
+        "--optimize-png", action="store_true", help="search for the smallest PNG encoding of each asset",
+    )
+    parser.add_argument(
+        "--png-tolerance", type=int, default=0,
+        help="max per-channel error a smaller encoding may introduce (default: 0, pixel exact)",
+    )
+    parser.add_argument(
+        "--png-time-budget", type=float, default=PngOptions().time_budget,
+        help="seconds the optimizer may spend per asset",
+    )
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help=f"intermediate blob cache (default: {CACHE_DIR})")
+    parser.add_argument(
+        "--cache-size-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="evict least recently used cache entries beyond this size",
+    )
+    parser.add_argument("--state", default=STATE_PATH, help=f"build state file (default: {STATE_PATH})")
+    parser.add_argument("--timings", action="store_true", help="record per-stage timings and peak memory")
+    parser.add_argument("--profile", action="store_true", help="like --timings, plus a cProfile stats dump")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help=f"where reports go (default: {PROFILE_DIR})")
+    return parser.parse_args(argv)
+
+
+def release_targets(args):
+    """Every target the arguments ask for."""
+    achievements, store = _generators()
+    png_options = PngOptions(args.png_tolerance, args.png_time_budget) if args.optimize_png else None
+    result = []
+    if not args.no_store:
+        result += store.targets(launcher_icons=args.launcher_icons, png_options=png_options,
+                                res_format=args.res_format)
+    if not args.no_achievements:
+        files_dir = achievements.OUTPUT_DIR if args.write_files == "" else args.write_files
+        localized_dir = achievements.LOCALIZED_ICONS_DIR if args.localized_icons == "" else args.localized_icons
+        variants_dir = achievements.VARIANTS_DIR if args.variants == "" else args.variants
+        result += achievements.targets(png_options=png_options, quality=args.quality, files_dir=files_dir,
+                                       localized_dir=localized_dir, variants_dir=variants_dir,
+                                       variants_format=args.variants_format)
+    return result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with instrument.session("build", args.profile_dir, timings=args.timings, profile=args.profile):
+        return build(args)
+
+
+def build(args):
+    try:
+        fonts.require_faces(args.allow_font_substitutes)
+    except fonts.FontError as e:
+        print(f"  Font error: {e}", file=sys.stderr)
+        return 1
+    try:
+        graph = BuildGraph(release_targets(args))
+    except TranslationError as e:
+        print("  Translation errors:\n    " + "\n    ".join(e.problems), file=sys.stderr)
+        return 1
+    cache = RenderCache(args.cache_dir, args.cache_size_mb * 1024 * 1024)
+    print(f"Building {len(graph.order)} targets ({args.jobs} jobs)...")
+    try:
+        report = graph.run(args.jobs, cache, args.state, force=args.force, dry_run=args.dry_run)
+    except BuildError as e:
+        print(f"\n  Build failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        cache.evict()
+    if not args.dry_run:
+        # A mipmap or variant left over in the other format would be a
+        # duplicate resource (see encoders.write_resource)
+        for path in (p for t in graph.targets.values() for p in t.outputs if p):
+            remove_other_formats(path)
+    built, restored, skipped = len(report.built), len(report.restored), len(report.skipped)
+    if args.dry_run:
+        print(f"\n  Would build {built} and restore {restored} from cache; {skipped} up to date")
+    else:
+        print(f"\n  {built} built, {restored} restored from cache, {skipped} up to date ({report.seconds:.2f}s)")
+    if not args.dry_run and not args.no_achievements:
+        check = validate_path(_generators()[0].ZIP_PATH)
+        print(format_report(check))
+        if check.errors:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Single-pass layer compositing.
+
+Translucent decorations are drawn onto one shared RGBA overlay and blended
+onto the opaque base in a single ``alpha_composite`` limited to the overlay's
+bounding box, instead of allocating and compositing a full-canvas layer per
+shape.
+"""
+
+from assetgen.gradients import linear_gradient
+from assetgen.lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+
+
+class LayerCompositor:
+    """Collect translucent shapes on one overlay and flatten them onto ``base`` once."""
+
+    def __init__(self, base):
+        self.base = base
+        self._overlay = None
+        self._overlay_draw = None
+
+    @classmethod
+    def with_linear_gradient(cls, size, color_start, color_end, horizontal=True):
+        """Start a compositor whose base is a linear gradient."""
+        return cls(linear_gradient(size, color_start, color_end, horizontal))
+
+    @property
+    def overlay(self):
+        """ImageDraw for the shared translucent overlay, created on first use."""
+        if self._overlay_draw is None:
+            self._overlay = Image.new("RGBA", self.base.size, (0, 0, 0, 0))
+            self._overlay_draw = ImageDraw.Draw(self._overlay)
+        return self._overlay_draw
+
+    def flatten(self):
+        """Blend the overlay onto the base in place and return the base image."""
+        if self._overlay is None:
+            return self.base
+        bbox = self._overlay.getbbox()
+        if bbox is not None:
+            region = self.base.crop(bbox).convert("RGBA")
+            region.alpha_composite(self._overlay.crop(bbox))
+            self.base.paste(region.convert(self.base.mode), bbox[:2])
+        self._overlay = None
+        self._overlay_draw = None
+        return self.base
@@ -0,0 +1,54 @@
+"""
+Labelled contact sheets: many small images tiled into one PNG for review.
+"""
+
+import math
+
+from assetgen import fonts
+from assetgen.lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+
+BACKGROUND = "#202124"
+LABEL_COLOR = "#E8EAED"
+
+
+def contact_sheet(groups, cell, columns=8, background=BACKGROUND, label_color=LABEL_COLOR):
+    """
+    Tile ``groups`` of images into one sheet.
+
+    ``groups`` is a list of ``(heading, heading_color, [(label, img), ...])``;
+    each group starts a new row under its heading. Images are centred in
+    ``cell`` x ``cell`` tiles (or ``cell = (width, height)`` tiles) with
+    their label underneath.
+    """
+    cell_w, cell_h = (cell, cell) if isinstance(cell, int) else cell
+    pad = max(4, cell_h // 16)
+    label_size = max(9, cell_h // 10)
+    heading_size = max(12, cell_h // 6)
+    label_h = label_size + pad
+    heading_h = heading_size + 2 * pad
+    tile_w, tile_h = cell_w + pad, cell_h + label_h + pad
+
+    height = pad
+    for _, _, items in groups:
+        height += heading_h + math.ceil(len(items) / columns) * tile_h
+    sheet = Image.new("RGB", (columns * tile_w + pad, height), background)
+    draw = ImageDraw.Draw(sheet)
+
+    y = pad
+    for heading, heading_color, items in groups:
+        fonts.draw_text(draw, (pad, y + pad // 2), heading, heading_color, "bold", heading_size)
+        y += heading_h
+        for i, (label, img) in enumerate(items):
+            row, col = divmod(i, columns)
+            x0, y0 = pad + col * tile_w, y + row * tile_h
+            tile = img if img.mode == "RGBA" else img.convert("RGBA")
+            sheet.paste(tile, (x0 + (cell_w - tile.width) // 2, y0 + (cell_h - tile.height) // 2), tile)
+            # Trim labels that would run into the next tile
+            while label and fonts.text_bbox(label, "regular", label_size)[2] > cell_w:
+                label = label[:-2] + "…" if len(label) > 2 else ""
+            fonts.draw_text(draw, (x0, y0 + cell_h + pad // 2), label, label_color, "regular", label_size)
+        y += math.ceil(len(items) / columns) * tile_h
+    return sheet
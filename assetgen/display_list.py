@@ -0,0 +1,118 @@
+"""
+Recorded drawing: capture ``ImageDraw`` calls once, replay them at any scale.
+
+A ``DisplayList`` stands in for ``ImageDraw.Draw`` the way ``SdfDraw`` does,
+so drawing code can be pointed at it unchanged. Instead of touching pixels it
+appends each primitive (``ellipse``, ``arc``, ``line``, ``polygon``,
+``rectangle``, and text drawn through ``fonts.draw_text``) to its ``ops``.
+``replay()`` issues the same calls on a real ``ImageDraw`` with every
+coordinate and width scaled, so a symbol laid out once can be rasterised at a
+preview size, the icon size or any supersampling factor without running the
+Python that laid it out.
+
+Ops are plain lists of numbers and strings, so ``dumps()`` and ``loads()``
+round-trip them through compact JSON for the render cache, and the number of
+ops is a measure of how complex a drawing is.
+"""
+
+import json
+
+from assetgen import fonts
+
+# Bump when the op layout changes, so stale serialised lists are rejected.
+FORMAT = 1
+
+
+def _flat(xy):
+    """``[(x, y), ...]`` or ``[x0, y0, ...]`` as a flat list of coordinates."""
+    if xy and isinstance(xy[0], (tuple, list)):
+        return [c for point in xy for c in point]
+    return list(xy)
+
+
+def _color(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+class DisplayList:
+    """Drawing primitives in the order they were issued; see the module docstring."""
+
+    def __init__(self, ops=None):
+        self.ops = [] if ops is None else ops
+
+    def __len__(self):
+        return len(self.ops)
+
+    # ── Recording (the ImageDraw subset the renderers use) ──────────────
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(["ellipse", _flat(xy), fill, outline, width])
+
+    def arc(self, xy, start, end, fill=None, width=1):
+        self.ops.append(["arc", _flat(xy), start, end, fill, width])
+
+    def line(self, xy, fill=None, width=0, joint=None):
+        self.ops.append(["line", _flat(xy), fill, width, joint])
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(["polygon", _flat(xy), fill, outline, width])
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(["rectangle", _flat(xy), fill, outline, width])
+
+    def record_text(self, xy, text, fill, face, size):
+        """Called by ``fonts.draw_text`` in place of compositing the glyph mask."""
+        self.ops.append(["text", list(xy), text, fill, face, size])
+
+    # ── Replay ──────────────────────────────────────────────────────────
+
+    def replay(self, draw, scale=1.0, offset=(0, 0)):
+        """
+        Issue every op on ``draw`` with coordinates mapped to ``c * scale + offset``.
+
+        Widths and font sizes are scaled too (widths rounded to whole pixels,
+        at least 1). ``scale=1`` with no offset reproduces the recording exactly.
+        """
+        dx, dy = offset
+
+        def xy(coords):
+            return [c * scale + (dy if i % 2 else dx) for i, c in enumerate(coords)]
+
+        def w(width):
+            return max(1, round(width * scale)) if width else width
+
+        for kind, *args in self.ops:
+            if kind == "ellipse":
+                coords, fill, outline, width = args
+                draw.ellipse(xy(coords), fill=_color(fill), outline=_color(outline), width=w(width))
+            elif kind == "arc":
+                coords, start, end, fill, width = args
+                draw.arc(xy(coords), start, end, fill=_color(fill), width=w(width))
+            elif kind == "line":
+                coords, fill, width, joint = args
+                draw.line(xy(coords), fill=_color(fill), width=w(width), joint=joint)
+            elif kind == "polygon":
+                coords, fill, outline, width = args
+                draw.polygon(xy(coords), fill=_color(fill), outline=_color(outline), width=w(width))
+            elif kind == "rectangle":
+                coords, fill, outline, width = args
+                draw.rectangle(xy(coords), fill=_color(fill), outline=_color(outline), width=w(width))
+            elif kind == "text":
+                position, text, fill, face, size = args
+                fonts.draw_text(draw, xy(position), text, _color(fill), face, size * scale)
+            else:
+                raise ValueError(f"unknown display list op {kind!r}")
+
+    # ── Serialisation ───────────────────────────────────────────────────
+
+    def dumps(self):
+        """The display list as compact JSON bytes."""
+        return json.dumps({"format": FORMAT, "ops": self.ops}, separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def loads(cls, data):
+        """Rebuild a display list from ``dumps()`` output; ValueError if it's from another format."""
+        doc = json.loads(data)
+        if doc.get("format") != FORMAT:
+            raise ValueError(f"display list format {doc.get('format')!r}, expected {FORMAT}")
+        return cls(doc["ops"])
@@ -0,0 +1,210 @@
+"""
+Encoder backends and per-asset format selection for in-app raster resources.
+
+PNG stays the default, and the only format for store uploads: the Play
+Console takes PNG icons and graphics, and the achievements import ZIP is
+PNG only. For rasters the app itself ships (launcher mipmaps, icon
+variants) ``encode_best`` also tries lossless WebP and, where a rule asks
+for it, near-lossless WebP. Every candidate is decoded once to check its
+error (colour under fully transparent pixels doesn't count) and a few more
+times to time the decode. The smallest one that decodes no slower than
+DECODE_SLACK times the PNG wins, so the choice can't cost low-end devices
+decode time.
+
+Backends are ENCODERS entries (name -> file extension, encode function);
+another format is one function and one entry.
+
+Pillow doesn't expose libwebp's near-lossless switch, so it is done here:
+colour channels are rounded to a grid of ``2 * level + 1`` steps before the
+lossless encode. That bounds the error by ``level`` and leaves far fewer
+distinct colours to code. Alpha is kept exact, so nothing turns fully
+transparent and loses its colour.
+"""
+
+import fnmatch
+import io
+import os
+import time
+from collections import namedtuple
+
+from assetgen.archive import write_if_changed
+from assetgen.lazy import lazy_import
+from assetgen.png_optimize import encode_png, max_error
+
+Image = lazy_import("PIL.Image")
+np = lazy_import("numpy")
+
+FORMAT_CHOICES = ("png", "webp", "auto")
+# Formats a build target can be declared in: its output names must be known
+# up front, so the per-asset "auto" pick only exists in the generators' CLIs.
+TARGET_FORMATS = ("png", "webp")
+
+# A candidate may decode this much slower than the PNG (relative, or
+# absolute for tiny assets where timer noise dominates) and still win.
+DECODE_SLACK = 1.5
+DECODE_SLACK_MS = 0.25
+DECODE_REPEATS = 5
+
+FormatOptions = namedtuple("FormatOptions", "format near_lossless png_options webp_method",
+                           defaults=("png", (), None, 4))
+FormatOptions.__doc__ = """\
+Settings for encode_best: ``format`` is one of FORMAT_CHOICES,
+``near_lossless`` a list of ``(glob, level)`` rules matched against asset
+names, ``png_options`` is passed to encode_png and ``webp_method`` is the
+libwebp effort (0-6; 6 is ~10x slower than 4 for another 10-30%)."""
+
+Encoded = namedtuple("Encoded", "backend data decode_ms max_error")
+Encoded.__doc__ = "One candidate encoding: backend name, bytes, best decode time and max per-channel error."
+
+
+def _png(img, options, level):
+    return encode_png(img, options.png_options).data
+
+
+def encode_webp(img, level=0, method=4):
+    """Lossless WebP bytes for ``img``, near-lossless (max error ``level``) if ``level`` > 0."""
+    if level:
+        img = quantize_colors(img, level)
+    buf = io.BytesIO()
+    img.save(buf, "WEBP", lossless=True, quality=100, method=method)
+    return buf.getvalue()
+
+
+def quantize_colors(img, level):
+    """``img`` as RGBA with R, G and B rounded to steps of ``2 * level + 1``."""
+    rgba = np.asarray(img.convert("RGBA")).copy()
+    step = 2 * level + 1
+    rgb = rgba[..., :3].astype(np.int16)
+    rgba[..., :3] = np.clip((rgb + level) // step * step, 0, 255)
+    return Image.fromarray(rgba, "RGBA")
+
+
+# backend -> (file extension, encode(img, options, near-lossless level))
+ENCODERS = {
+    "png": (".png", _png),
+    "webp": (".webp", lambda img, options, level: encode_webp(img, 0, options.webp_method)),
+    "webp-nl": (".webp", lambda img, options, level: encode_webp(img, level, options.webp_method)),
+}
+
+
+def near_lossless_rule(value):
+    """argparse type for ``GLOB=LEVEL``: near-lossless error bound for matching assets."""
+    pattern, _, level = value.rpartition("=")
+    if not pattern or not level.isdigit() or not 1 <= int(level) <= 16:
+        raise ValueError(f"expected GLOB=LEVEL with LEVEL 1-16, got {value!r}")
+    return pattern, int(level)
+
+
+def near_lossless_level(name, rules):
+    """Level of the first rule matching ``name``, or 0 for lossless only."""
+    for pattern, level in rules:
+        if fnmatch.fnmatch(name, pattern):
+            return level
+    return 0
+
+
+def backends(name, options):
+    """The backends ``encode_best`` tries for the asset ``name``, PNG first."""
+    webp = ["webp", "webp-nl"] if near_lossless_level(name, options.near_lossless) else ["webp"]
+    if options.format == "png":
+        return ["png"]
+    if options.format == "webp":
+        return webp
+    return ["png"] + webp
+
+
+def decode_ms(data, repeats=DECODE_REPEATS):
+    """Best wall time over ``repeats`` full decodes of ``data``, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        Image.open(io.BytesIO(data)).load()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def encode_best(img, name, options):
+    """
+    Encode ``img`` with every backend for ``name``; return ``(best, candidates)``.
+
+    With a single backend nothing is decoded or timed (``decode_ms`` and
+    ``max_error`` are None).
+    """
+    level = near_lossless_level(name, options.near_lossless)
+    names = backends(name, options)
+    if len(names) == 1:
+        only = Encoded(names[0], ENCODERS[names[0]][1](img, options, level), None, None)
+        return only, [only]
+    reference = np.asarray(img.convert("RGBA"))
+    candidates = []
+    for backend in names:
+        data = ENCODERS[backend][1](img, options, level)
+        candidates.append(Encoded(backend, data, decode_ms(data), max_error(reference, data)))
+    baseline = candidates[0].decode_ms if options.format == "auto" else float("inf")
+    limit = max(baseline * DECODE_SLACK, baseline + DECODE_SLACK_MS)
+    eligible = [c for c in candidates if c.decode_ms <= limit] or candidates[:1]
+    return min(eligible, key=lambda c: len(c.data)), candidates
+
+
+def target_extension(image_format):
+    """File extension for a build target in ``image_format``; ValueError if it isn't one of TARGET_FORMATS."""
+    if image_format not in TARGET_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(TARGET_FORMATS)}, got {image_format!r}")
+    return ENCODERS[image_format][0]
+
+
+def extension(data):
+    """File extension for encoded ``data``, from its signature."""
+    return ".webp" if data[:4] == b"RIFF" and data[8:12] == b"WEBP" else ".png"
+
+
+def write_resource(stem, data):
+    """
+    Write ``data`` to ``stem`` plus its format's extension and return the path.
+
+    Same-named files in the other formats are removed: Android rejects two
+    resources that differ only in extension, and a stale one would shadow
+    the new asset elsewhere.
+    """
+    path = stem + extension(data)
+    write_if_changed(path, data)
+    remove_other_formats(path)
+    return path
+
+
+def remove_other_formats(path):
+    """Delete the files named like the image ``path`` but with another format's extension."""
+    stem, ext = os.path.splitext(path)
+    extensions = {e for e, _ in ENCODERS.values()}
+    if ext not in extensions:
+        return
+    for other in extensions - {ext}:
+        if os.path.exists(stem + other):
+            os.remove(stem + other)
+
+
+def format_comparison(rows):
+    """
+    Format a per-asset table of candidate encodings.
+
+    ``rows`` are ``(name, best, candidates)`` from ``encode_best``; the
+    winner is marked with ``*``.
+    """
+    width = max([len("Asset")] + [len(r[0]) for r in rows])
+    lines = [f"  {'Asset':<{width}}  {'Format':<8}  {'Bytes':>9}  {'vs PNG':>7}  {'Decode':>8}  {'Error':>5}"]
+    total_png = total_best = 0
+    for name, best, candidates in rows:
+        png = next((c for c in candidates if c.backend == "png"), None)
+        total_png += len(png.data) if png else 0
+        total_best += len(best.data)
+        for c in candidates:
+            ratio = f"{100 * len(c.data) / len(png.data):6.1f}%" if png else "      -"
+            decode = f"{c.decode_ms:6.2f}ms" if c.decode_ms is not None else "       -"
+            error = str(c.max_error) if c.max_error is not None else "-"
+            mark = "*" if c is best else " "
+            lines.append(f"{mark} {name:<{width}}  {c.backend:<8}  {len(c.data):>9,}  {ratio}  {decode}  {error:>5}")
+            name = ""
+    if total_png:
+        lines.append(f"  {'Total (chosen)':<{width}}  {'':<8}  {total_best:>9,}  "
+                     f"{100 * total_best / total_png:6.1f}%")
+    return "\n".join(lines)
@@ -0,0 +1,103 @@
+"""
+Variant spec files for feature-graphic experiments.
+
+A spec is one JSON file listing the variants to render; each variant names
+only what differs from the shipped graphic, optionally on top of shared
+``defaults``::
+
+    {
+      "defaults": {"accent": "#FFA726"},
+      "variants": [
+        {"name": "control"},
+        {"name": "de-globe-right", "locale": "de-DE", "globe": "right",
+         "title": ["Geografie", "Quiz"], "subtitle": "Wie viele Länder kennst du?"},
+        {"name": "pink", "accent": "#F06292"}
+      ]
+    }
+
+``title`` is the two title lines, ``accent`` colours the second line and
+(unless ``badge`` overrides it) the question-mark badge, and ``globe`` is
+``left`` or ``right``. ``locale`` only groups the comparison sheet. Names
+become file names, so they are limited to letters, digits, ``-`` and ``_``.
+"""
+
+import json
+import re
+from collections import namedtuple
+
+from assetgen.lazy import lazy_import
+from assetgen.localization import DEFAULT_LOCALE, LOCALE_RE
+
+ImageColor = lazy_import("PIL.ImageColor")
+
+NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*$")
+GLOBE_PLACEMENTS = ("left", "right")
+# Keys a variant (or the defaults) may set, besides ``name`` and ``locale``.
+STYLE_KEYS = ("title", "subtitle", "accent", "badge", "globe")
+
+Variant = namedtuple("Variant", "name locale overrides")
+Variant.__doc__ = """\
+One variant: its file ``name``, the ``locale`` it is grouped under and the
+``overrides`` (a subset of STYLE_KEYS) it applies to the default style."""
+
+
+class SpecError(ValueError):
+    """A variant spec that can't be rendered; the message names the variant and key."""
+
+
+def _check_style(where, values):
+    unknown = sorted(set(values) - set(STYLE_KEYS))
+    if unknown:
+        raise SpecError(f"{where}: unknown key(s) {', '.join(unknown)} (expected {', '.join(STYLE_KEYS)})")
+    if "title" in values:
+        title = values["title"]
+        if not (isinstance(title, list) and len(title) == 2 and all(isinstance(t, str) and t for t in title)):
+            raise SpecError(f"{where}: title must be a list of two non-empty strings")
+    if "subtitle" in values and not isinstance(values["subtitle"], str):
+        raise SpecError(f"{where}: subtitle must be a string")
+    for key in ("accent", "badge"):
+        if key in values:
+            try:
+                ImageColor.getrgb(values[key])
+            except (ValueError, AttributeError):
+                raise SpecError(f"{where}: {key} {values[key]!r} is not a colour") from None
+    if "globe" in values and values["globe"] not in GLOBE_PLACEMENTS:
+        raise SpecError(f"{where}: globe must be one of {', '.join(GLOBE_PLACEMENTS)}")
+
+
+def parse_spec(doc, source="spec"):
+    """The ``Variant`` list described by the decoded JSON ``doc``; SpecError if it's invalid."""
+    if not isinstance(doc, dict) or not isinstance(doc.get("variants"), list) or not doc["variants"]:
+        raise SpecError(f"{source}: expected an object with a non-empty \"variants\" list")
+    defaults = doc.get("defaults", {})
+    if not isinstance(defaults, dict):
+        raise SpecError(f"{source}: \"defaults\" must be an object")
+    _check_style(f"{source}: defaults", defaults)
+
+    variants, seen = [], set()
+    for i, entry in enumerate(doc["variants"]):
+        if not isinstance(entry, dict):
+            raise SpecError(f"{source}: variant {i + 1} must be an object")
+        entry = dict(entry)
+        name = entry.pop("name", None)
+        if not isinstance(name, str) or not NAME_RE.match(name):
+            raise SpecError(f"{source}: variant {i + 1} needs a name of letters, digits, - and _ (got {name!r})")
+        if name in seen:
+            raise SpecError(f"{source}: duplicate variant name {name!r}")
+        seen.add(name)
+        locale = entry.pop("locale", DEFAULT_LOCALE)
+        if not isinstance(locale, str) or not LOCALE_RE.match(locale):
+            raise SpecError(f"{source}: {name}: invalid locale {locale!r}")
+        _check_style(f"{source}: {name}", entry)
+        variants.append(Variant(name, locale, {**defaults, **entry}))
+    return variants
+
+
+def load_spec(path):
+    """Read and validate the spec file at ``path``."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            doc = json.load(f)
+    except json.JSONDecodeError as e:
+        raise SpecError(f"{path}: {e}") from None
+    return parse_spec(doc, path)
@@ -0,0 +1,161 @@
+"""
+Font resolution and cached text layers shared by both generators.
+
+Faces are looked up once through a search path (``ASSETGEN_FONT_PATH``, then
+the usual system font folders) instead of letting every ``ImageFont.truetype``
+call probe the filesystem. The committed artwork is drawn with Arial. Without
+it a face falls back to a substitute (Liberation Sans, DejaVu Sans, or
+Pillow's built-in font), whose glyphs differ, so release builds call
+``require_faces`` and refuse to run unless substitutes are explicitly allowed.
+
+Rendered strings are cached as L-mode alpha masks, so drawing the same label
+again is a single ``ImageDraw.bitmap`` composite.
+"""
+
+import functools
+import os
+import sys
+
+from assetgen.lazy import lazy_import
+from assetgen.render_cache import file_fingerprint
+
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
+
+# File names of the face the committed artwork is drawn with, per logical face.
+FACES = {
+    "bold": ("arialbd.ttf", "Arial Bold.ttf"),
+    "regular": ("arial.ttf", "Arial.ttf"),
+}
+# Stand-ins tried (in order) when none of a face's own files can be found.
+SUBSTITUTES = {
+    "bold": ("LiberationSans-Bold.ttf", "DejaVuSans-Bold.ttf"),
+    "regular": ("LiberationSans-Regular.ttf", "DejaVuSans.ttf"),
+}
+# Face to try next when neither a face's own files nor its substitutes exist.
+FACE_FALLBACKS = {"bold": "regular"}
+BUILTIN_FONT = "Pillow's built-in font"
+
+
+class FontError(Exception):
+    """The faces the committed artwork is drawn with aren't installed."""
+
+
+def font_search_path():
+    """Directories searched for font files, highest priority first."""
+    paths = [p for p in os.environ.get("ASSETGEN_FONT_PATH", "").split(os.pathsep) if p]
+    windir = os.environ.get("WINDIR")
+    if windir:
+        paths.append(os.path.join(windir, "Fonts"))
+    home = os.path.expanduser("~")
+    paths += [
+        "/usr/share/fonts",
+        "/usr/local/share/fonts",
+        os.path.join(home, ".local", "share", "fonts"),
+        os.path.join(home, ".fonts"),
+        "/Library/Fonts",
+        "/System/Library/Fonts",
+        os.path.join(home, "Library", "Fonts"),
+    ]
+    return paths
+
+
+@functools.lru_cache(maxsize=None)
+def _font_index():
+    """Map lower-cased font file names to the first matching path on the search path."""
+    index = {}
+    for directory in font_search_path():
+        for root, _, files in os.walk(directory):
+            for name in files:
+                index.setdefault(name.lower(), os.path.join(root, name))
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_face(face):
+    """Return the font file used for ``face``, or None to use Pillow's built-in font."""
+    if face not in FACES:
+        raise ValueError(f"Unknown font face: {face!r} (expected one of {sorted(FACES)})")
+    index = _font_index()
+    while face:
+        for candidate in FACES[face] + SUBSTITUTES[face]:
+            path = index.get(candidate.lower())
+            if path:
+                return path
+        face = FACE_FALLBACKS.get(face)
+    return None
+
+
+def substituted_faces(faces=tuple(FACES)):
+    """The faces in ``faces`` that resolve to something other than one of their own files."""
+    result = []
+    for face in faces:
+        path = resolve_face(face)
+        if path is None or os.path.basename(path).lower() not in {name.lower() for name in FACES[face]}:
+            result.append(face)
+    return result
+
+
+def require_faces(allow_substitutes=False, faces=tuple(FACES)):
+    """
+    Check that ``faces`` resolve to the face the committed artwork uses.
+
+    Raises FontError naming every substituted face, or with
+    ``allow_substitutes`` prints the same as a warning and carries on.
+    """
+    substituted = substituted_faces(faces)
+    if not substituted:
+        return
+    problems = [f"{face}: {FACES[face][0]} not found, using {resolve_face(face) or BUILTIN_FONT}"
+                for face in substituted]
+    if not allow_substitutes:
+        raise FontError("; ".join(problems) + ". Install Arial or add its directory to ASSETGEN_FONT_PATH "
+                        "(--allow-font-substitutes renders anyway, but not the committed artwork)")
+    print("  WARNING: rendering with substitute fonts; text won't match the committed artwork\n    "
+          + "\n    ".join(problems), file=sys.stderr)
+
+
+def face_files(faces=tuple(FACES)):
+    """``[face, file fingerprint]`` per face, for cache keys (None for the built-in font)."""
+    return [[face, file_fingerprint(resolve_face(face))] for face in faces]
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(face, size):
+    """Memoised FreeTypeFont for (face, size)."""
+    size = int(size)
+    path = resolve_face(face)
+    if path is None:
+        return ImageFont.load_default(size=size)
+    return ImageFont.truetype(path, size)
+
+
+@functools.lru_cache(maxsize=512)
+def text_layer(text, face, size):
+    """
+    Rasterise ``text`` once as an alpha mask.
+
+    Returns ``(mask, bbox)`` where ``bbox`` is the text's bounding box relative
+    to the drawing origin (as from ``ImageDraw.textbbox((0, 0), ...)``) and
+    ``mask`` covers exactly that box. The mask is shared; don't modify it.
+    """
+    font = get_font(face, size)
+    bbox = font.getbbox(text)
+    mask = Image.new("L", (max(1, bbox[2] - bbox[0]), max(1, bbox[3] - bbox[1])), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, fill=255, font=font)
+    return mask, bbox
+
+
+def text_bbox(text, face, size):
+    """Bounding box of ``text`` relative to the drawing origin."""
+    return text_layer(text, face, int(size))[1]
+
+
+def draw_text(draw, xy, text, fill, face, size):
+    """Like ``draw.text(xy, text, fill, font)`` but composites the cached mask."""
+    if hasattr(draw, "record_text"):  # a display_list.DisplayList
+        draw.record_text(xy, text, fill, face, size)
+        return
+    mask, bbox = text_layer(text, face, int(size))
+    draw.bitmap((int(xy[0]) + bbox[0], int(xy[1]) + bbox[1]), mask, fill=fill)
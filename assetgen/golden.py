@@ -0,0 +1,279 @@
+"""
+Golden-image regression check: re-render every committed PNG and diff it.
+
+    python -m assetgen golden [-j N] [--only GLOB] [--exact] [--launcher-icons [--res-format png|webp]] [--update]
+
+The committed store icon, feature graphic and achievement icons (and, with
+--launcher-icons, the launcher mipmaps, as PNG or with --res-format webp as
+WebP) are the reference. Each is re-rendered in memory from its build target
+(``targets()`` of both generators; never from the render cache) and compared
+pixel by pixel in NumPy: per-channel max error, PSNR and the mask of pixels
+that changed by more than the noise floor.
+
+Whether a difference fails is decided per asset by the first TOLERANCES
+pattern matching its path. The default only allows rounding noise, not
+changed anti-aliasing or moved, missing or recoloured shapes; --exact
+requires identical pixels. Each failure gets a heatmap (golden | render |
+changed pixels) under .golden/. Targets render in a process pool, so the
+whole set takes a few seconds.
+
+The goldens are drawn with Arial, so without it the check refuses to run
+(see ``fonts.require_faces``). Exits non-zero if any asset fails. --update
+overwrites the failing goldens with the new renders once a change is
+intended.
+"""
+
+import argparse
+import fnmatch
+import io
+import math
+import os
+import sys
+import time
+from collections import namedtuple
+
+from assetgen import fonts, instrument
+from assetgen.archive import write_if_changed
+from assetgen.encoders import TARGET_FORMATS
+from assetgen.lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+np = lazy_import("numpy")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEATMAP_DIR = os.path.join(REPO_ROOT, ".golden")
+
+Tolerance = namedtuple("Tolerance", "max_error min_psnr max_changed noise")
+Tolerance.__doc__ = """\
+How far a render may drift from its golden: the largest per-channel error,
+the lowest PSNR (dB) and the largest fraction of changed pixels, where a
+pixel only counts as changed if some channel moved by more than ``noise``."""
+
+EXACT = Tolerance(0, math.inf, 0.0, 0)
+# Unchanged drawing code re-rendered with the faces the goldens were drawn
+# with reproduces them to within 1 LSB (gradient rounding). The slack above
+# that is for other FreeType and Pillow builds hinting a glyph edge
+# differently; a redrawn, moved or re-anti-aliased edge moves by far more.
+DEFAULT = Tolerance(8, 40.0, 0.01, 1)
+
+# (path pattern relative to the repo, tolerance); the first match wins.
+TOLERANCES = [
+    ("*", DEFAULT),
+]
+
+Diff = namedtuple("Diff", "max_error psnr changed bbox")
+Diff.__doc__ = """\
+``compare()`` result: the per-channel (R, G, B, A) max error, the PSNR in
+dB (inf when identical), the fraction of changed pixels and their bounding
+box (None when nothing changed)."""
+
+Result = namedtuple("Result", "path ok diff message")
+Result.__doc__ = """\
+One asset's outcome. ``diff`` is None if the images couldn't be compared
+(missing golden, different size); ``message`` then says why."""
+
+
+def tolerance_for(rel_path):
+    for pattern, tolerance in TOLERANCES:
+        if fnmatch.fnmatch(rel_path, pattern):
+            return tolerance
+    return DEFAULT
+
+
+def rgba(image):
+    """``image`` as an (H, W, 4) uint8 array."""
+    return np.asarray(image if image.mode == "RGBA" else image.convert("RGBA"))
+
+
+def compare(golden, render, noise=0):
+    """Diff two same-sized (H, W, 4) uint8 arrays; returns ``(Diff, changed mask)``."""
+    error = np.abs(golden.astype(np.int16) - render.astype(np.int16))
+    # Colour under fully transparent pixels is invisible (and WebP drops it).
+    error[(golden[..., 3] == 0) & (render[..., 3] == 0), :3] = 0
+    max_error = tuple(int(v) for v in error.max(axis=(0, 1)))
+    mse = np.square(error, dtype=np.float32).mean()
+    psnr = 10 * math.log10(255 ** 2 / mse) if mse else math.inf
+    mask = error.max(axis=2) > noise
+    rows, cols = np.flatnonzero(mask.any(axis=1)), np.flatnonzero(mask.any(axis=0))
+    bbox = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1) if len(rows) else None
+    return Diff(max_error, psnr, float(mask.mean()), bbox), mask
+
+
+def within(diff, tolerance):
+    return (max(diff.max_error) <= tolerance.max_error and diff.psnr >= tolerance.min_psnr
+            and diff.changed <= tolerance.max_changed)
+
+
+def heatmap(golden, render, mask, background=(32, 33, 36)):
+    """
+    Golden, render and a heatmap side by side, as one RGB image.
+
+    The heatmap is the golden dimmed to grey with every changed pixel
+    coloured from red (small error) to yellow (the largest error).
+    """
+    def flatten(a):
+        alpha = a[..., 3:4].astype(np.float32) / 255
+        return (a[..., :3] * alpha + np.array(background, np.float32) * (1 - alpha)).astype(np.uint8)
+
+    golden_rgb, render_rgb = flatten(golden), flatten(render)
+    error = np.abs(golden.astype(np.int16) - render.astype(np.int16))
+    error[(golden[..., 3] == 0) & (render[..., 3] == 0), :3] = 0
+    error = error.max(axis=2)
+    heat = (golden_rgb.mean(axis=2, keepdims=True) * 0.3).astype(np.uint8).repeat(3, axis=2)
+    scale = error[mask].astype(np.float32) / max(1, int(error.max()))
+    heat[mask] = np.stack([np.full_like(scale, 255), 255 * scale, np.zeros_like(scale)], axis=1).astype(np.uint8)
+    return Image.fromarray(np.concatenate([golden_rgb, render_rgb, heat], axis=1), "RGB")
+
+
+def check_image(path, data, tolerance, heatmap_dir=None):
+    """Compare the rendered ``data`` (PNG or WebP) with the golden file at ``path``."""
+    rel = os.path.relpath(path, REPO_ROOT)
+    if not os.path.exists(path):
+        return Result(rel, False, None, "no golden file")
+    with instrument.stage("diff", rel):
+        golden = rgba(Image.open(path))
+        render = rgba(Image.open(io.BytesIO(data)))
+        if golden.shape != render.shape:
+            return Result(rel, False, None, f"golden is {golden.shape[1]}x{golden.shape[0]}, "
+                                            f"render is {render.shape[1]}x{render.shape[0]}")
+        diff, mask = compare(golden, render, tolerance.noise)
+    ok = within(diff, tolerance)
+    if not ok and heatmap_dir:
+        out = os.path.join(heatmap_dir, rel)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        heatmap(golden, render, mask).save(out)
+    return Result(rel, ok, diff, None)
+
+
+def golden_targets(only=None, launcher_icons=False, res_format="png"):
+    """
+    Build targets whose outputs are all images, limited to paths matching ``only``.
+
+    Like ``python -m assetgen build``, the launcher mipmaps are only included
+    with ``launcher_icons``, and are then checked in ``res_format``.
+    """
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    import generate_achievements_zip as achievements
+    import generate_store_assets as store
+
+    candidates = store.targets(launcher_icons=launcher_icons, res_format=res_format)
+    candidates += achievements.targets(files_dir=achievements.OUTPUT_DIR, tables=[])
+    result = []
+    for target in candidates:
+        paths = [os.path.relpath(p, REPO_ROOT) for p in target.outputs if p]
+        if len(paths) != len(target.outputs) or not all(p.endswith((".png", ".webp")) for p in paths):
+            continue
+        if only and not any(fnmatch.fnmatch(p, pattern) for p in paths for pattern in only):
+            continue
+        result.append(target)
+    return result
+
+
+def check_target(target, exact=False, heatmap_dir=None, only=None):
+    """Render ``target`` and return ``(Result, encoded bytes)`` per output (matching ``only``)."""
+    with instrument.stage("render", target.name):
+        blobs = target.fn(*target.args)
+    blobs = (blobs,) if len(target.outputs) == 1 else blobs
+    checks = []
+    for path, data in zip(target.outputs, blobs):
+        rel = os.path.relpath(path, REPO_ROOT)
+        if only and not any(fnmatch.fnmatch(rel, pattern) for pattern in only):
+            continue
+        tolerance = EXACT if exact else tolerance_for(rel)
+        checks.append((check_image(path, data, tolerance, heatmap_dir), data))
+    return checks
+
+
+def _check_task(target, exact, heatmap_dir, only):
+    """Process-pool task: the target's checks plus the worker's stage timings."""
+    return check_target(target, exact, heatmap_dir, only), instrument.drain()
+
+
+def run_checks(targets, jobs=1, exact=False, heatmap_dir=HEATMAP_DIR, only=None):
+    """``(Result, encoded bytes)`` for every output of ``targets``, sorted by path."""
+    if jobs <= 1:
+        checks = [c for t in targets for c in check_target(t, exact, heatmap_dir, only)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs, initializer=instrument.reset,
+                                 initargs=(instrument.enabled(),)) as pool:
+            checks = []
+            for future in [pool.submit(_check_task, t, exact, heatmap_dir, only) for t in targets]:
+                target_checks, timings = future.result()
+                instrument.merge(timings)
+                checks += target_checks
+    return sorted(checks, key=lambda c: c[0].path)
+
+
+def format_result(result):
+    if result.diff is None:
+        return f"  FAIL {result.path}: {result.message}"
+    d = result.diff
+    status = "ok  " if result.ok else "FAIL"
+    psnr = "identical" if d.psnr == math.inf else f"{d.psnr:.1f} dB"
+    line = f"  {status} {result.path}: max error {'/'.join(map(str, d.max_error))}, {psnr}, {d.changed:.3%} changed"
+    if d.bbox and not result.ok:
+        line += f" in {d.bbox}"
+    return line
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-render every committed PNG and diff it against the golden file.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="worker processes (default: CPU count; 1 = in-process)",
+    )
+    parser.add_argument(
+        "--only", action="append", metavar="GLOB",
+        help="only check assets whose repo-relative path matches GLOB (repeatable)",
+    )
+    parser.add_argument("--exact", action="store_true", help="require identical pixels for every asset")
+    parser.add_argument(
+        "--launcher-icons", action="store_true",
+        help="also check the launcher mipmaps (once they are generated rather than placeholders)",
+    )
+    parser.add_argument(
+        "--res-format", choices=TARGET_FORMATS, default="png",
+        help="format the launcher mipmaps are committed in (default: png)",
+    )
+    parser.add_argument(
+        "--allow-font-substitutes", action="store_true",
+        help="check even if Arial is missing (every asset with text will then fail)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="list passing assets too")
+    parser.add_argument(
+        "--heatmap-dir", default=HEATMAP_DIR, help=f"where failure heatmaps go (default: {HEATMAP_DIR})",
+    )
+    parser.add_argument("--update", action="store_true", help="overwrite failing goldens with the new renders")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        fonts.require_faces(args.allow_font_substitutes)
+    except fonts.FontError as e:
+        print(f"  Font error: {e}", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    targets = golden_targets(args.only, args.launcher_icons, args.res_format)
+    checks = run_checks(targets, args.jobs, args.exact, args.heatmap_dir, args.only)
+    failed = [(r, data) for r, data in checks if not r.ok]
+    for result, _ in checks:
+        if args.verbose or not result.ok:
+            print(format_result(result))
+    print(f"  {len(checks)} assets, {len(checks) - len(failed)} ok, {len(failed)} failed "
+          f"({time.perf_counter() - start:.2f}s)")
+    if failed and args.update:
+        for result, data in failed:
+            write_if_changed(os.path.join(REPO_ROOT, result.path), data)
+        print(f"  Updated {len(failed)} golden files")
+        return 0
+    if failed:
+        print(f"  Heatmaps: {args.heatmap_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
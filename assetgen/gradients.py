@@ -0,0 +1,100 @@
+"""
+Vectorised gradient fills.
+
+Both generators used to build their backgrounds by stacking one ellipse (or
+one line) per integer radius/column. These helpers compute the same ramps in a
+single NumPy pass over a distance field and paste the result straight into the
+target image.
+"""
+
+import math
+
+from assetgen import sdf
+from assetgen.lazy import lazy_import
+
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+ImageColor = lazy_import("PIL.ImageColor")
+
+# PIL's ellipse rasteriser treats a pixel as inside radius r when its centre is
+# roughly within r + 0.45; matching that keeps the stepped ramp pixel-equivalent
+# to the old concentric-ellipse loop.
+_ELLIPSE_EDGE = 0.45
+
+
+def to_rgb(color):
+    """Return an (r, g, b) tuple for a hex string, colour name or tuple."""
+    if isinstance(color, str):
+        return ImageColor.getrgb(color)[:3]
+    return tuple(color[:3])
+
+
+def _lerp_colors(t, color_a, color_b):
+    """Blend two colours by the array ``t`` (0 -> a, 1 -> b), truncating like int()."""
+    a = np.asarray(to_rgb(color_a), dtype=np.float64)
+    b = np.asarray(to_rgb(color_b), dtype=np.float64)
+    t = t[..., None]
+    return (a * (1 - t) + b * t).astype(np.uint8)
+
+
+def radial_gradient_array(width, height, cx, cy, radius, color_inner, color_outer):
+    """
+    Compute a stepped radial gradient over a ``height x width`` grid.
+
+    Returns ``(rgb, mask)`` where ``rgb`` is a uint8 array of shape (h, w, 3)
+    and ``mask`` is a bool array marking the pixels inside the disc.
+    """
+    ys = np.arange(height, dtype=np.float32)[:, None] - np.float32(cy)
+    xs = np.arange(width, dtype=np.float32)[None, :] - np.float32(cx)
+    dist = np.sqrt(xs * xs + ys * ys)
+    radius = int(radius)
+    steps = np.ceil(dist - np.float32(_ELLIPSE_EDGE)).astype(np.int32)
+    np.clip(steps, 1, radius, out=steps)
+    # One colour per integer radius, then a table lookup per pixel.
+    lut = _lerp_colors(np.arange(radius + 1, dtype=np.float64) / radius, color_inner, color_outer)
+    rgb = lut[steps]
+    mask = dist <= radius + _ELLIPSE_EDGE
+    return rgb, mask
+
+
+def fill_radial_gradient_aa(img, cx, cy, radius, color_inner, color_outer, extent=None):
+    """
+    Paint a radial gradient disc with an anti-aliased edge, for drawing at final size.
+
+    ``cx``, ``cy`` and ``radius`` are continuous (pixel ``i`` spans
+    ``[i, i + 1)``) and may be fractional. The ramp runs
+    from the centre to ``radius``; the disc is cut at ``extent`` (default
+    ``radius``), e.g. to stop just under a ring drawn over its edge.
+    """
+    extent = radius if extent is None else extent
+    box = (max(0, int(cx - extent) - 1), max(0, int(cy - extent) - 1),
+           min(img.width, int(math.ceil(cx + extent)) + 1), min(img.height, int(math.ceil(cy + extent)) + 1))
+    x0, y0, x1, y1 = box
+    rgb, _ = radial_gradient_array(x1 - x0, y1 - y0, cx - x0 - 0.5, cy - y0 - 0.5, radius,
+                                   color_inner, color_outer)
+    xs, ys = sdf.pixel_grid(box, cx, cy)
+    edge = Image.fromarray(sdf.coverage(sdf.ellipse_distance(xs, ys, extent, extent)), "L")
+    patch = Image.fromarray(rgb, "RGB")
+    if img.mode == "RGBA":
+        patch.putalpha(edge)
+        img.alpha_composite(patch, (x0, y0))
+    else:
+        img.paste(patch.convert(img.mode), (x0, y0), edge)
+
+
+def linear_gradient_array(width, height, color_start, color_end, horizontal=True):
+    """Compute a linear gradient as a uint8 (h, w, 3) array, stepping per column or row."""
+    if horizontal:
+        t = np.arange(width, dtype=np.float64) / width
+        ramp = _lerp_colors(t, color_start, color_end)[None, :, :]
+    else:
+        t = np.arange(height, dtype=np.float64) / height
+        ramp = _lerp_colors(t, color_start, color_end)[:, None, :]
+    return np.ascontiguousarray(np.broadcast_to(ramp, (height, width, 3)))
+
+
+def linear_gradient(size, color_start, color_end, horizontal=True, mode="RGB"):
+    """Return a new image of ``size`` filled with a linear gradient."""
+    width, height = size
+    img = Image.fromarray(linear_gradient_array(width, height, color_start, color_end, horizontal), "RGB")
+    return img if mode == "RGB" else img.convert(mode)
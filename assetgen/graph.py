@@ -0,0 +1,321 @@
+"""
+A small build graph: targets, their inputs, and an incremental parallel runner.
+
+Each ``Target`` names a module-level function that produces one blob per
+output (bytes, or str written as UTF-8), the arguments it is called with, the
+targets whose blobs it consumes, and a content ``key`` over everything else
+that affects its result (its source, parameters, fonts...). A target's
+effective key also covers its dependencies' keys. So when an input changes,
+only the targets downstream of it change key, however they are scheduled.
+
+``run()`` skips a target when its effective key matches the state file and
+its output files still hold the bytes it last wrote. Blobs that have no
+output path (an icon that only goes into a ZIP) live in a RenderCache, so a
+dependent that does need rebuilding can still get them without re-rendering.
+Independent stale targets run concurrently in a process pool.
+"""
+
+import inspect
+import json
+import os
+import sys
+import time
+import traceback
+from collections import namedtuple
+
+from assetgen import instrument
+from assetgen.archive import sha256_file, write_if_changed
+from assetgen.render_cache import cache_key
+
+# Bump when the state file layout changes.
+STATE_FORMAT = 1
+
+
+class Target(namedtuple("Target", "name fn args deps key outputs")):
+    """
+    One node of the graph.
+
+    ``fn(*args, *dep_blobs)`` returns a blob per entry of ``outputs`` (a bare
+    blob when there is one output, else a tuple). An output is a file path,
+    or None for a blob that is only passed on to dependents. ``key``
+    defaults to a hash of ``fn``'s source and ``args``.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, name, fn, args=(), deps=(), key=None, outputs=(None,)):
+        if key is None:
+            key = cache_key(fn.__module__, fn.__qualname__, inspect.getsource(fn), args)
+        return super().__new__(cls, name, fn, tuple(args), tuple(deps), key, tuple(outputs))
+
+
+class BuildError(RuntimeError):
+    """The graph is malformed, or some of its targets failed to build."""
+
+
+RunReport = namedtuple("RunReport", "built restored skipped seconds")
+
+
+def _blobs(result, outputs):
+    blobs = (result,) if len(outputs) == 1 else tuple(result)
+    if len(blobs) != len(outputs):
+        raise BuildError(f"expected {len(outputs)} outputs, got {len(blobs)}")
+    return tuple(b.encode("utf-8") if isinstance(b, str) else b for b in blobs)
+
+
+def _unwrap(blobs):
+    return blobs[0] if len(blobs) == 1 else blobs
+
+
+def _run_target(fn, args, outputs):
+    """Pool task: the target's blobs plus the worker's stage timings."""
+    with instrument.stage("target"):
+        blobs = _blobs(fn(*args), outputs)
+    return blobs, instrument.drain()
+
+
+def _init_worker(path, record):
+    # Spawned workers need the parent's sys.path to unpickle the generators' functions.
+    sys.path[:] = path
+    instrument.reset(record)
+
+
+class BuildGraph:
+    """A validated set of targets in dependency order, with their effective keys."""
+
+    def __init__(self, targets):
+        self.targets = {}
+        for t in targets:
+            if t.name in self.targets:
+                raise BuildError(f"duplicate target {t.name!r}")
+            self.targets[t.name] = t
+        for t in self.targets.values():
+            missing = [d for d in t.deps if d not in self.targets]
+            if missing:
+                raise BuildError(f"{t.name!r} depends on unknown targets: {', '.join(missing)}")
+        self.order = self._sort()
+        self.keys = {}
+        for name in self.order:
+            t = self.targets[name]
+            self.keys[name] = cache_key(t.key, [self.keys[d] for d in t.deps]) if t.deps else t.key
+
+    def _sort(self):
+        order, state = [], {}
+        for root in self.targets:
+            stack = [(root, iter(self.targets[root].deps))]
+            if state.get(root):
+                continue
+            state[root] = "visiting"
+            while stack:
+                name, deps = stack[-1]
+                for dep in deps:
+                    if state.get(dep) == "visiting":
+                        raise BuildError(f"dependency cycle through {dep!r}")
+                    if not state.get(dep):
+                        state[dep] = "visiting"
+                        stack.append((dep, iter(self.targets[dep].deps)))
+                        break
+                else:
+                    stack.pop()
+                    state[name] = "done"
+                    order.append(name)
+        return order
+
+    # ── Planning ────────────────────────────────────────────────────────
+
+    def up_to_date(self, name, state):
+        """Whether ``name``'s outputs are on disk exactly as its current key last wrote them."""
+        t = self.targets[name]
+        entry = state.get(name)
+        if not entry or entry["key"] != self.keys[name]:
+            return False
+        if [path for path, _ in entry["outputs"]] != list(t.outputs):
+            return False
+        return all(path is None or sha256_file(path) == digest for path, digest in entry["outputs"])
+
+    def _cached_blobs(self, name, state, cache):
+        """The blobs for ``name``'s current key from the cache or its up-to-date files, or None."""
+        t = self.targets[name]
+        on_disk = None
+        blobs = []
+        for i, path in enumerate(t.outputs):
+            data = cache.get(cache_key(self.keys[name], i)) if cache is not None else None
+            if data is None and path is not None:
+                if on_disk is None:
+                    on_disk = self.up_to_date(name, state)
+                if on_disk:
+                    with open(path, "rb") as f:
+                        data = f.read()
+            if data is None:
+                return None
+            blobs.append(data)
+        return tuple(blobs)
+
+    def plan(self, state, cache=None, force=False):
+        """
+        Return ``(stale, inputs)``: the targets to run, in dependency order,
+        and the already-built blobs that they consume.
+        """
+        stale = set()
+        for name in self.order:
+            has_files = any(p is not None for p in self.targets[name].outputs)
+            if force or (has_files and not self.up_to_date(name, state)):
+                stale.add(name)
+        inputs = {}
+        # Walk dependents before their dependencies, so a dependency that
+        # turns out to be needed (its blobs are gone) is still visited.
+        for name in reversed(self.order):
+            if name not in stale:
+                continue
+            for dep in self.targets[name].deps:
+                if dep in stale or dep in inputs:
+                    continue
+                blobs = self._cached_blobs(dep, state, cache)
+                if blobs is None:
+                    stale.add(dep)
+                else:
+                    inputs[dep] = blobs
+        return [n for n in self.order if n in stale], inputs
+
+    # ── Running ─────────────────────────────────────────────────────────
+
+    def run(self, jobs=1, cache=None, state_path=None, force=False, dry_run=False):
+        """
+        Build every stale target and record the result in ``state_path``.
+
+        Prints one line per target as it finishes and returns a RunReport.
+        If a target fails, nothing that depends on it runs, the state of
+        everything that did build is still saved, and BuildError is raised.
+        """
+        start = time.perf_counter()
+        state = load_state(state_path)
+        stale, results = self.plan(state, cache, force)
+        skipped = [n for n in self.order if n not in stale]
+        # A stale target whose blobs are cached (its output was deleted or
+        # moved) is restored rather than rebuilt.
+        restored = {} if force else {n: b for n in stale for b in [self._cached_blobs(n, {}, cache)] if b}
+        if dry_run:
+            for name in stale:
+                print(f"  would {'restore' if name in restored else 'build'} {name}")
+            return RunReport([n for n in stale if n not in restored], list(restored), skipped,
+                             time.perf_counter() - start)
+
+        built, failed = [], {}
+        waiting = {n: {d for d in self.targets[n].deps if d in stale} for n in stale}
+        dependents = {}
+        for name, deps in waiting.items():
+            for dep in deps:
+                dependents.setdefault(dep, []).append(name)
+
+        def finish(name, blobs, note):
+            t = self.targets[name]
+            digests = []
+            for i, (path, data) in enumerate(zip(t.outputs, blobs)):
+                if cache is not None and name not in restored:
+                    cache.put(cache_key(self.keys[name], i), data)
+                if path is None:
+                    digests.append([None, None])
+                else:
+                    with instrument.stage("write", name):
+                        digest, _ = write_if_changed(path, data)
+                    digests.append([path, digest])
+            results[name] = blobs
+            state[name] = {"key": self.keys[name], "outputs": digests}
+            built.append(name)
+            print(f"  [{len(built)}/{len(stale)}] {name} ({note})", flush=True)
+
+        def ready():
+            in_flight = {name for name, _ in running.values()}
+            return [n for n in stale if n not in results and n not in failed and not waiting[n]
+                    and n not in in_flight]
+
+        def settle(name):
+            for dependent in dependents.get(name, ()):
+                waiting[dependent].discard(name)
+
+        def fail(name, error):
+            failed[name] = error
+            print(f"  FAILED {name}", flush=True)
+            todo = list(dependents.get(name, ()))
+            while todo:
+                dependent = todo.pop()
+                if dependent not in failed:
+                    failed[dependent] = f"skipped: depends on {name}\n"
+                    todo.extend(dependents.get(dependent, ()))
+
+        def call_args(name):
+            t = self.targets[name]
+            return t.args + tuple(_unwrap(results[d]) for d in t.deps)
+
+        running = {}
+        try:
+            for name, blobs in restored.items():
+                finish(name, blobs, "cached")
+                settle(name)
+            if jobs <= 1:
+                for name in stale:
+                    if name in failed or name in results:
+                        continue
+                    t = self.targets[name]
+                    started = time.perf_counter()
+                    try:
+                        blobs, _ = _run_target(t.fn, call_args(name), t.outputs)
+                    except Exception:
+                        fail(name, traceback.format_exc())
+                        continue
+                    finish(name, blobs, f"{(time.perf_counter() - started) * 1000:.0f} ms")
+            else:
+                from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+                with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                         initargs=(list(sys.path), instrument.enabled())) as pool:
+                    while True:
+                        for name in ready():
+                            t = self.targets[name]
+                            future = pool.submit(_run_target, t.fn, call_args(name), t.outputs)
+                            running[future] = (name, time.perf_counter())
+                        if not running:
+                            break
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name, started = running.pop(future)
+                            try:
+                                blobs, timings = future.result()
+                            except Exception:
+                                fail(name, traceback.format_exc())
+                                continue
+                            instrument.merge(timings)
+                            finish(name, blobs, f"{(time.perf_counter() - started) * 1000:.0f} ms")
+                            settle(name)
+        finally:
+            save_state(state_path, state)
+
+        if failed:
+            for name, error in failed.items():
+                print(f"\n  {name}:\n{error}", file=sys.stderr, end="")
+            raise BuildError(f"{len(failed)} target(s) failed: {', '.join(sorted(failed))}")
+        return RunReport([n for n in built if n not in restored], list(restored), skipped,
+                         time.perf_counter() - start)
+
+
+# ── State file ──────────────────────────────────────────────────────────────
+
+def load_state(path):
+    """``{target: {"key": ..., "outputs": [[path, sha256], ...]}}`` from the last run ({} if none)."""
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get("targets", {}) if data.get("format") == STATE_FORMAT else {}
+
+
+def save_state(path, state):
+    if not path:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"format": STATE_FORMAT, "targets": state}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
@@ -0,0 +1,150 @@
+"""
+Per-stage timing, cProfile and memory instrumentation for the generators.
+
+Wrap pipeline steps in ``stage()``::
+
+    with instrument.stage("downsample", asset=achievement_id):
+        img = img.resize(...)
+
+While no session is active ``stage()`` returns a shared null context, so
+leaving the calls in costs a function call and nothing else. ``session()``
+turns recording on for one run and, on exit, prints a per-stage summary and
+writes a JSON report (plus a cProfile ``.pstats`` dump and tracemalloc peak
+when requested).
+
+Worker processes record into their own recorder; ``drain()`` hands the
+records back so the parent can ``merge()`` them into its report.
+"""
+
+import contextlib
+import json
+import os
+import time
+
+_NULL = contextlib.nullcontext()
+_records = None  # list of (stage, asset, seconds) while recording, else None
+
+
+@contextlib.contextmanager
+def _timed(records, name, asset):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        records.append((name, asset, time.perf_counter() - start))
+
+
+def stage(name, asset=None):
+    """Context manager timing one pipeline stage (a no-op unless recording)."""
+    records = _records
+    if records is None:
+        return _NULL
+    return _timed(records, name, asset)
+
+
+def enabled():
+    return _records is not None
+
+
+def reset(enable):
+    """Start (or stop) recording in this process with an empty record list."""
+    global _records
+    _records = [] if enable else None
+
+
+def drain():
+    """Return and clear the records collected so far (empty when not recording)."""
+    global _records
+    if _records is None:
+        return []
+    records, _records = _records, []
+    return records
+
+
+def merge(records):
+    """Add records produced elsewhere (e.g. by a worker process)."""
+    if _records is not None:
+        _records.extend(records)
+
+
+def summarize(records):
+    """Aggregate records into per-stage and per-asset timings."""
+    stages = {}
+    assets = {}
+    for name, asset, seconds in records:
+        s = stages.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        s["count"] += 1
+        s["total"] += seconds
+        s["max"] = max(s["max"], seconds)
+        if asset is not None:
+            per_asset = assets.setdefault(asset, {})
+            per_asset[name] = per_asset.get(name, 0.0) + seconds
+    for s in stages.values():
+        s["mean"] = s["total"] / s["count"]
+    return stages, assets
+
+
+def format_summary(stages, wall):
+    lines = [f"  {'Stage':<20} {'Count':>6} {'Total':>10} {'Mean':>10} {'Max':>10} {'% wall':>7}"]
+    for name, s in sorted(stages.items(), key=lambda item: -item[1]["total"]):
+        share = 100 * s["total"] / wall if wall else 0
+        lines.append(f"  {name:<20} {s['count']:>6} {s['total'] * 1000:>8.1f}ms "
+                     f"{s['mean'] * 1000:>8.2f}ms {s['max'] * 1000:>8.2f}ms {share:>6.1f}%")
+    lines.append(f"  {'wall':<20} {'':>6} {wall * 1000:>8.1f}ms")
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def session(name, out_dir, timings=True, profile=False):
+    """
+    Instrument one generator run.
+
+    ``timings`` records stages and tracemalloc's peak; ``profile`` also runs
+    cProfile. Reports go to ``<out_dir>/<name>.json`` (and ``.pstats``).
+    Worker stages are summed across processes, so stage totals can exceed
+    wall time when rendering in parallel.
+    """
+    if not (timings or profile):
+        yield
+        return
+
+    import cProfile
+    import tracemalloc
+
+    reset(True)
+    tracemalloc.start()
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        wall = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stages, assets = summarize(drain())
+        reset(False)
+
+        os.makedirs(out_dir, exist_ok=True)
+        report = {
+            "name": name,
+            "wall_seconds": wall,
+            "peak_traced_bytes": peak,
+            "stages": stages,
+            "assets": assets,
+        }
+        json_path = os.path.join(out_dir, f"{name}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n  Timings ({name}):")
+        print(format_summary(stages, wall))
+        print(f"  Peak traced memory: {peak / (1024 * 1024):.1f} MB")
+        print(f"  Report: {json_path}")
+        if profiler:
+            pstats_path = os.path.join(out_dir, f"{name}.pstats")
+            profiler.dump_stats(pstats_path)
+            print(f"  cProfile stats: {pstats_path}")
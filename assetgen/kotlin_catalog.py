@@ -0,0 +1,92 @@
+"""
+Read the achievement catalogue from the app's ``Achievement.kt`` enum.
+
+The Kotlin enum is the source of truth for ids, titles, descriptions and
+tiers. Parsing is cheap, but the result is still cached on disk keyed by the
+file's mtime and size so repeated builds (and pool workers) skip it.
+"""
+
+import json
+import os
+import re
+
+ACHIEVEMENT_KT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "app", "src", "main", "java", "com", "geoquiz", "app", "domain", "model", "Achievement.kt",
+)
+
+_STRING = r'"((?:[^"\\]|\\.)*)"'
+_ENTRY_RE = re.compile(
+    r"^\s*([A-Z][A-Z0-9_]*)\s*\(\s*" + _STRING + r"\s*,\s*" + _STRING + r"\s*,\s*" + _STRING
+    + r"\s*,\s*AchievementTier\.([A-Z]+)\s*\)",
+    re.MULTILINE,
+)
+_ESCAPES = {'"': '"', "\\": "\\", "$": "$", "n": "\n", "t": "\t", "'": "'"}
+
+# (realpath, stamp) -> entries, so repeated loads in one process skip the disk cache too.
+_loaded = {}
+
+
+class CatalogError(ValueError):
+    """Achievement.kt could not be parsed into a usable catalogue."""
+
+
+def _unescape(value):
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+
+
+def parse_achievements(source):
+    """Return ``[(id, title, description, tier), ...]`` in declaration order."""
+    entries = [
+        (_unescape(aid), _unescape(title), _unescape(desc), tier)
+        for _, aid, title, desc, tier in _ENTRY_RE.findall(source)
+    ]
+    if not entries:
+        raise CatalogError("no Achievement enum entries found")
+    ids = [e[0] for e in entries]
+    duplicates = sorted({aid for aid in ids if ids.count(aid) > 1})
+    if duplicates:
+        raise CatalogError(f"duplicate achievement ids: {', '.join(duplicates)}")
+    return entries
+
+
+def load_achievements(path=ACHIEVEMENT_KT, cache_path=None):
+    """
+    Parse ``path``, reusing ``cache_path`` when the file's mtime and size match.
+
+    The cache is best-effort: unreadable or stale caches are ignored and
+    rewritten.
+    """
+    st = os.stat(path)
+    stamp = [st.st_mtime_ns, st.st_size]
+    memo_key = (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+    if memo_key in _loaded:
+        return list(_loaded[memo_key])
+    entries = _load(path, stamp, cache_path)
+    _loaded[memo_key] = tuple(entries)
+    return entries
+
+
+def _load(path, stamp, cache_path):
+    if cache_path:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["path"] == os.path.realpath(path) and cached["stamp"] == stamp:
+                return [tuple(e) for e in cached["entries"]]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    with open(path, encoding="utf-8") as f:
+        entries = parse_achievements(f.read())
+
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp = f"{cache_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"path": os.path.realpath(path), "stamp": stamp, "entries": entries}, f)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+    return entries
@@ -0,0 +1,30 @@
+"""
+Deferred imports for heavy dependencies.
+
+``lazy_import("numpy")`` returns a module object that is only actually
+imported on first attribute access, so importing the generators (for
+``--help``, tests or other tooling) does not pay for PIL and NumPy until
+something is rendered.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Return ``name`` as a module that finishes importing on first use."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,127 @@
+"""
+Translation tables for achievement names, descriptions and tier labels.
+
+One JSON file per locale, named after it (``de-DE.json``)::
+
+    {
+      "tiers": {"BRONZE": "BRONZE", "SILVER": "SILBER", "GOLD": "GOLD"},
+      "achievements": {
+        "first_game": {"title": "Erste Schritte", "description": "Schließe dein erstes Quiz ab"}
+      }
+    }
+
+Entries are keyed by achievement id, so retitling an achievement in English
+does not orphan its translations. ``validate()`` checks a table against the
+catalogue and the Play Games limits. ``localization_rows()`` yields the rows
+of ``AchievementsLocalizations.csv`` one at a time.
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+
+# The locale of AchievementsMetadata.csv; it never gets a localization row.
+DEFAULT_LOCALE = "en-US"
+
+# Play Games Services limits for an achievement's name and description.
+NAME_LIMIT = 100
+DESCRIPTION_LIMIT = 500
+
+# Language with an optional region or UN M.49 area ("de", "pt-BR", "es-419").
+LOCALE_RE = re.compile(r"^[a-z]{2,3}(?:-(?:[A-Z]{2}|[0-9]{3}))?$")
+
+Translation = namedtuple("Translation", "locale tiers entries")
+Translation.__doc__ = """\
+One locale's table: ``tiers`` maps a tier to its label and ``entries`` maps
+an achievement id to ``(title, description)``."""
+
+
+class TranslationError(ValueError):
+    """A translation table is unreadable or fails validation."""
+
+    def __init__(self, problems):
+        super().__init__("\n".join(problems))
+        self.problems = problems
+
+
+def load_table(path):
+    """Read the translation table at ``path``; its locale is the file name."""
+    locale = os.path.splitext(os.path.basename(path))[0]
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        tiers = {str(k): v for k, v in data.get("tiers", {}).items()}
+        entries = {str(aid): (e.get("title"), e.get("description"))
+                   for aid, e in data.get("achievements", {}).items()}
+    except (OSError, ValueError, AttributeError) as e:
+        raise TranslationError([f"{path}: {e}"]) from e
+    return Translation(locale, tiers, entries)
+
+
+def load_tables(directory):
+    """Every ``*.json`` table in ``directory`` in locale order ([] if it doesn't exist)."""
+    try:
+        names = sorted(n for n in os.listdir(directory) if n.endswith(".json"))
+    except FileNotFoundError:
+        return []
+    return [load_table(os.path.join(directory, n)) for n in names]
+
+
+def validate(table, catalogue, label_fits=None, allow_missing=False):
+    """
+    Check ``table`` against ``catalogue`` (``(id, title, description, tier, ...)`` tuples).
+
+    Returns ``(errors, warnings)`` as lists of messages. ``label_fits(label)``,
+    if given, says whether a tier label fits on the icon. Untranslated
+    achievements are errors unless ``allow_missing``.
+    """
+    errors, warnings = [], []
+    locale = table.locale
+    if not LOCALE_RE.match(locale):
+        errors.append(f"{locale}: {locale!r} is not a locale code like 'de-DE'")
+    if locale == DEFAULT_LOCALE:
+        errors.append(f"{locale}: {DEFAULT_LOCALE} is the default locale and comes from Achievement.kt")
+
+    ids = {a[0] for a in catalogue}
+    for aid in sorted(ids - table.entries.keys()):
+        (warnings if allow_missing else errors).append(f"{locale}: no translation for {aid!r}")
+    for aid in sorted(table.entries.keys() - ids):
+        warnings.append(f"{locale}: {aid!r} is not in the catalogue")
+    for aid, (title, desc) in sorted(table.entries.items()):
+        for field, value, limit in (("title", title, NAME_LIMIT), ("description", desc, DESCRIPTION_LIMIT)):
+            if not isinstance(value, str) or not value.strip():
+                errors.append(f"{locale}: {aid!r} has no {field}")
+            elif len(value) > limit:
+                errors.append(f"{locale}: {aid!r} {field} is {len(value)} characters (limit {limit})")
+            elif value != value.strip():
+                warnings.append(f"{locale}: {aid!r} {field} has leading or trailing whitespace")
+
+    tiers = {a[3] for a in catalogue}
+    for tier in sorted(tiers - table.tiers.keys()):
+        warnings.append(f"{locale}: no label for tier {tier}, icons keep the English one")
+    for tier, label in sorted(table.tiers.items()):
+        if tier not in tiers:
+            warnings.append(f"{locale}: tier {tier!r} is not used by any achievement")
+        elif not isinstance(label, str) or not label.strip():
+            errors.append(f"{locale}: tier {tier} has an empty label")
+        elif label_fits is not None and not label_fits(label):
+            errors.append(f"{locale}: tier label {label!r} is too wide for the icon")
+    return errors, warnings
+
+
+def localization_rows(catalogue, tables, selected=None):
+    """
+    Yield ``[name, localized name, localized description, locale]`` rows.
+
+    ``name`` is the default-locale title the console matches rows on.
+    ``selected`` restricts the rows to those catalogue indices. Achievements
+    a table doesn't translate are left out.
+    """
+    indices = range(len(catalogue)) if selected is None else selected
+    for table in tables:
+        for i in indices:
+            aid, title = catalogue[i][0], catalogue[i][1]
+            entry = table.entries.get(aid)
+            if entry and entry[0] and entry[1]:
+                yield [title, entry[0], entry[1], table.locale]
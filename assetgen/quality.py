@@ -0,0 +1,30 @@
+"""
+Render quality presets.
+
+Shapes the SDF rasteriser can't draw (symbol lines, polygons, text) are
+drawn ``supersample`` times larger and reduced with ``resample``. ``draft``
+skips supersampling entirely, for fast previews.
+"""
+
+from collections import namedtuple
+
+from assetgen.lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+
+Quality = namedtuple("Quality", "supersample resample")
+
+# Filters are Image.Resampling member names, resolved when used.
+PRESETS = {
+    "draft": Quality(1, "BILINEAR"),
+    "normal": Quality(2, "LANCZOS"),
+    "ultra": Quality(4, "LANCZOS"),
+}
+DEFAULT = "normal"
+
+
+def downsample(img, size, quality):
+    """Reduce a supersampled ``img`` to ``size`` with the preset's filter (no-op at 1x)."""
+    if img.size == tuple(size):
+        return img
+    return img.resize(size, Image.Resampling[quality.resample])
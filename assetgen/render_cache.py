@@ -0,0 +1,115 @@
+"""
+Content-addressed on-disk cache for rendered assets.
+
+Entries are stored as ``<dir>/<key[:2]>/<key>.bin`` where ``key`` is a SHA-256
+over everything that influences the rendered bytes. Reads refresh an entry's
+mtime so eviction can drop the least recently used files once the cache grows
+past its size limit.
+"""
+
+import json
+import os
+
+from assetgen.lazy import lazy_import
+
+hashlib = lazy_import("hashlib")
+tempfile = lazy_import("tempfile")
+
+# Bump when the key recipe or entry format changes so stale entries miss.
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(*parts):
+    """Hash ``parts`` (JSON-serialisable values or bytes) into a hex cache key."""
+    h = hashlib.sha256()
+    h.update(f"v{CACHE_FORMAT}".encode())
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        else:
+            data = json.dumps(part, sort_keys=True, default=str).encode()
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def file_fingerprint(path):
+    """Identify a file by resolved path, size and mtime, or None if it doesn't exist."""
+    if not isinstance(path, str) or not os.path.isfile(path):
+        return None
+    st = os.stat(path)
+    return [os.path.realpath(path), st.st_size, st.st_mtime_ns]
+
+
+class RenderCache:
+    """Byte cache keyed by content hash, with hit/miss counters and LRU eviction."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.bin")
+
+    def get(self, key):
+        """Return the cached bytes for ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store ``data`` under ``key`` atomically."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.writes += 1
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+                total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        return total
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = 100 * self.hits / lookups if lookups else 0
+        return (f"{self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), "
+                f"{self.writes} written, {self.evictions} evicted")
@@ -0,0 +1,317 @@
+"""
+Check an achievements import ZIP against the Play Games import rules.
+
+    python -m assetgen validate [PATH ...]
+
+PATH is an import ZIP or a directory of loose files (``--write-files``);
+the default is the release ZIP. Icons are checked from their IHDR chunk
+alone and the CSVs are streamed from the archive, so nothing is decoded or
+extracted and an archive with thousands of entries takes milliseconds:
+
+- every CSV row has the right column count and field formats
+- achievement names are unique and within the name/description limits
+- points are multiples of 5, at most 200 each and 1000 in total
+- every icon mapping names a known achievement and a 512x512 PNG in the archive
+- localization rows name a known achievement and a non-default locale
+- anything else in the archive is a stray file (e.g. the legacy
+  ``AchievementsIconMappings.csv``), which the console ignores at best
+
+Exits non-zero if any archive has errors; warnings alone pass.
+"""
+
+import csv
+import io
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+
+from assetgen.lazy import lazy_import
+from assetgen.localization import DEFAULT_LOCALE, DESCRIPTION_LIMIT, LOCALE_RE, NAME_LIMIT
+
+zipfile = lazy_import("zipfile")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ZIP_PATH = os.path.join(REPO_ROOT, "store_assets", "achievements_import.zip")
+
+METADATA_CSV = "AchievementsMetadata.csv"
+LOCALIZATIONS_CSV = "AchievementsLocalizations.csv"
+MAPPINGS_CSV = "AchievementsIconsMappings.csv"
+# Files the console has been seen to be handed by mistake, and what they should be.
+LEGACY_NAMES = {"AchievementsIconMappings.csv": MAPPINGS_CSV}
+
+ICON_SIZE = (512, 512)
+MAX_POINTS = 200
+MAX_TOTAL_POINTS = 1000
+MIN_STEPS, MAX_STEPS = 2, 10000
+INITIAL_STATES = ("Revealed", "Hidden")
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Signature, IHDR length and type, then the 13 bytes of IHDR data.
+_IHDR = struct.Struct(">8sI4sIIBBBBB")
+_COLOUR_TYPES = {0: "greyscale", 2: "RGB", 3: "palette", 4: "greyscale+alpha", 6: "RGBA"}
+
+PngHeader = namedtuple("PngHeader", "width height bit_depth colour_type compression filter interlace")
+
+Report = namedtuple("Report", "path errors warnings achievements icons localizations points")
+Report.__doc__ = """\
+What validate_path found in one archive: its error and warning messages and
+the number of achievements, mapped icons, localization rows and points."""
+
+
+def png_header(head):
+    """The PngHeader parsed from a PNG's first 29 bytes, or None if they aren't a PNG's."""
+    if len(head) < _IHDR.size:
+        return None
+    signature, length, kind, *fields = _IHDR.unpack_from(head)
+    if signature != _PNG_SIGNATURE or kind != b"IHDR" or length != 13:
+        return None
+    return PngHeader(*fields)
+
+
+# ── Archive sources ─────────────────────────────────────────────────────────
+
+class _ZipSource:
+    """Entries of a ZIP; ``head()`` reads straight from the mapped file, without a ZipExtFile per entry."""
+
+    _LOCAL_HEADER = struct.Struct("<4s22xHH")  # signature ... file name length, extra field length
+
+    def __init__(self, path):
+        self.zf = zipfile.ZipFile(path)
+        self.names = self.zf.namelist()
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.zf.infolist() else b""
+
+    def open(self, name):
+        return self.zf.open(name)
+
+    def head(self, name, size):
+        info = self.zf.getinfo(name)
+        offset = info.header_offset
+        signature, name_len, extra_len = self._LOCAL_HEADER.unpack_from(self.map, offset)
+        if signature != b"PK\x03\x04" or info.flag_bits & 1:
+            with self.open(name) as f:  # corrupt or encrypted: let zipfile report it
+                return f.read(size)
+        start = offset + self._LOCAL_HEADER.size + name_len + extra_len
+        if info.compress_type == zipfile.ZIP_STORED:
+            return self.map[start:start + min(size, info.file_size)]
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            # A few KB of deflate data is plenty for the first bytes of any entry.
+            data = self.map[start:start + min(info.compress_size, 4096)]
+            return zlib.decompressobj(-15).decompress(data, size)
+        with self.open(name) as f:
+            return f.read(size)
+
+    def close(self):
+        if self.map:
+            self.map.close()
+        self.file.close()
+        self.zf.close()
+
+
+class _DirSource:
+    def __init__(self, path):
+        self.path = path
+        self.names = sorted(e.name + ("/" if e.is_dir() else "") for e in os.scandir(path))
+
+    def open(self, name):
+        return open(os.path.join(self.path, name), "rb")
+
+    def head(self, name, size):
+        with self.open(name) as f:
+            return f.read(size)
+
+    def close(self):
+        pass
+
+
+def _rows(source, name, columns, errors):
+    """Yield ``(line, row)`` for the CSV ``name`` with ``columns`` fields, reporting bad rows."""
+    try:
+        with io.TextIOWrapper(source.open(name), encoding="utf-8", newline="") as f:
+            for line, row in enumerate(csv.reader(f), 1):
+                if len(row) != columns:
+                    errors.append(f"{name}:{line}: {len(row)} columns, expected {columns}")
+                else:
+                    yield line, row
+    except (UnicodeDecodeError, csv.Error) as e:
+        errors.append(f"{name}: unreadable ({e})")
+
+
+def _int(value):
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+# ── Checks ──────────────────────────────────────────────────────────────────
+
+def _check_metadata(source, errors):
+    """Check AchievementsMetadata.csv; returns ``{name: points}`` of its valid names."""
+    names, orders = {}, {}
+    for line, (name, desc, incremental, steps, state, points, order) in _rows(source, METADATA_CSV, 7, errors):
+        where = f"{METADATA_CSV}:{line}"
+        if not name.strip():
+            errors.append(f"{where}: empty name")
+        elif len(name) > NAME_LIMIT:
+            errors.append(f"{where}: name is {len(name)} characters (limit {NAME_LIMIT})")
+        elif name in names:
+            errors.append(f"{where}: duplicate name {name!r}")
+        if not desc.strip():
+            errors.append(f"{where}: empty description")
+        elif len(desc) > DESCRIPTION_LIMIT:
+            errors.append(f"{where}: description is {len(desc)} characters (limit {DESCRIPTION_LIMIT})")
+        if incremental == "True":
+            n = _int(steps)
+            if n is None or not MIN_STEPS <= n <= MAX_STEPS:
+                errors.append(f"{where}: incremental achievement needs {MIN_STEPS}-{MAX_STEPS} steps, got {steps!r}")
+        elif incremental == "False":
+            if steps:
+                errors.append(f"{where}: steps {steps!r} on a non-incremental achievement")
+        else:
+            errors.append(f"{where}: incremental must be True or False, got {incremental!r}")
+        if state not in INITIAL_STATES:
+            errors.append(f"{where}: initial state must be one of {', '.join(INITIAL_STATES)}, got {state!r}")
+        p = _int(points)
+        if p is None or p < 0 or p > MAX_POINTS or p % 5:
+            errors.append(f"{where}: points must be a multiple of 5 from 0 to {MAX_POINTS}, got {points!r}")
+            p = 0
+        o = _int(order)
+        if o is None or o < 1:
+            errors.append(f"{where}: list order must be a positive integer, got {order!r}")
+        elif o in orders:
+            errors.append(f"{where}: list order {o} already used on line {orders[o]}")
+        else:
+            orders[o] = line
+        if name.strip() and name not in names and len(name) <= NAME_LIMIT:
+            names[name] = p
+    return names
+
+
+def _check_mappings(source, names, errors, warnings):
+    """Check AchievementsIconsMappings.csv and the icons it names; returns the mapped files present."""
+    mapped, icons = {}, set()
+    present = set(source.names)
+    for line, (name, filename) in _rows(source, MAPPINGS_CSV, 2, errors):
+        where = f"{MAPPINGS_CSV}:{line}"
+        if name not in names:
+            errors.append(f"{where}: {name!r} is not in {METADATA_CSV}")
+        elif name in mapped:
+            errors.append(f"{where}: second icon for {name!r}")
+            continue
+        mapped[name] = filename
+        if filename not in present:
+            errors.append(f"{where}: {filename!r} is not in the archive")
+            continue
+        icons.add(filename)
+        header = png_header(source.head(filename, _IHDR.size))
+        if header is None:
+            errors.append(f"{filename}: not a PNG")
+        elif (header.width, header.height) != ICON_SIZE:
+            errors.append(f"{filename}: {header.width}x{header.height}, icons must be {ICON_SIZE[0]}x{ICON_SIZE[1]}")
+        elif (header.colour_type not in _COLOUR_TYPES or header.compression or header.filter
+              or header.interlace not in (0, 1)):
+            errors.append(f"{filename}: corrupt IHDR {tuple(header)}")
+        elif header.bit_depth != 8:
+            warnings.append(f"{filename}: {header.bit_depth}-bit {_COLOUR_TYPES[header.colour_type]} "
+                            f"(8-bit is smaller and displays the same)")
+    for name in names.keys() - mapped.keys():
+        warnings.append(f"{name!r} has no icon mapping (the console keeps its current icon)")
+    return icons
+
+
+def _check_localizations(source, names, errors):
+    """Check AchievementsLocalizations.csv; returns its row count."""
+    seen = {}
+    for line, (name, loc_name, loc_desc, locale) in _rows(source, LOCALIZATIONS_CSV, 4, errors):
+        where = f"{LOCALIZATIONS_CSV}:{line}"
+        if name not in names:
+            errors.append(f"{where}: {name!r} is not in {METADATA_CSV}")
+        if not LOCALE_RE.match(locale):
+            errors.append(f"{where}: {locale!r} is not a locale code like 'de-DE'")
+        elif locale == DEFAULT_LOCALE:
+            errors.append(f"{where}: {DEFAULT_LOCALE} is the default locale and belongs in {METADATA_CSV}")
+        if (name, locale) in seen:
+            errors.append(f"{where}: {name!r} already localized for {locale} on line {seen[name, locale]}")
+        seen[name, locale] = line
+        for field, value, limit in (("name", loc_name, NAME_LIMIT), ("description", loc_desc, DESCRIPTION_LIMIT)):
+            if not value.strip():
+                errors.append(f"{where}: empty localized {field}")
+            elif len(value) > limit:
+                errors.append(f"{where}: localized {field} is {len(value)} characters (limit {limit})")
+    return len(seen)
+
+
+def validate_path(path):
+    """Validate the import ZIP or loose-file directory at ``path``; returns a Report."""
+    errors, warnings = [], []
+    try:
+        source = _DirSource(path) if os.path.isdir(path) else _ZipSource(path)
+    except (OSError, zipfile.BadZipFile) as e:
+        return Report(path, [f"cannot read: {e}"], [], 0, 0, 0, 0)
+    try:
+        present = set(source.names)
+        names, icons, localizations = {}, set(), 0
+        if METADATA_CSV in present:
+            names = _check_metadata(source, errors)
+        else:
+            errors.append(f"no {METADATA_CSV}")
+        if MAPPINGS_CSV in present:
+            icons = _check_mappings(source, names, errors, warnings)
+        elif names:
+            warnings.append(f"no {MAPPINGS_CSV}, so no icons will be imported")
+        if LOCALIZATIONS_CSV in present:
+            localizations = _check_localizations(source, names, errors)
+        points = sum(names.values())
+        if points > MAX_TOTAL_POINTS:
+            errors.append(f"{points} points in total (limit {MAX_TOTAL_POINTS})")
+
+        if len(present) != len(source.names):
+            errors.append("duplicate entry names: " + ", ".join(sorted(
+                {n for n in source.names if source.names.count(n) > 1})))
+        expected = {METADATA_CSV, MAPPINGS_CSV, LOCALIZATIONS_CSV} | icons
+        for name in sorted(present):
+            if name in LEGACY_NAMES:
+                warnings.append(f"stray {name} (legacy name; the console only reads {LEGACY_NAMES[name]})")
+            elif name not in expected:
+                warnings.append(f"stray {name}" + (" (no icon mapping uses it)" if name.endswith(".png") else ""))
+    finally:
+        source.close()
+    return Report(path, errors, warnings, len(names), len(icons), localizations, points)
+
+
+def format_report(report):
+    lines = [f"  {os.path.relpath(report.path)}: {report.achievements} achievements, {report.icons} icons, "
+             f"{report.localizations} localizations, {report.points} points"]
+    lines += [f"    error: {e}" for e in report.errors]
+    lines += [f"    warning: {w}" for w in report.warnings]
+    lines.append(f"    {len(report.errors)} errors, {len(report.warnings)} warnings"
+                 if report.errors or report.warnings else "    OK")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check achievements import ZIPs against the Play Games rules.")
+    parser.add_argument(
+        "paths", nargs="*", default=[ZIP_PATH], metavar="PATH",
+        help=f"import ZIPs or directories of loose files (default: {os.path.relpath(ZIP_PATH, REPO_ROOT)})",
+    )
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = parser.parse_args(argv)
+    failed = False
+    for path in args.paths:
+        start = time.perf_counter()
+        report = validate_path(path)
+        print(format_report(report) + f" ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        failed |= bool(report.errors or (args.strict and report.warnings))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
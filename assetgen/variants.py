@@ -0,0 +1,103 @@
+"""
+Icon variants (locked, dimmed, high-contrast, dark-surface) derived from finished renders.
+
+Each variant is a 4x5 colour matrix in Android's ``ColorMatrix`` layout:
+rows produce R, G, B and A from ``(r, g, b, a, 1)``, with offsets in 0-255
+units, so the app can apply the same matrix at runtime if it ever draws the
+icons itself. ``derive()`` stacks every icon into one (N, H, W, 4) batch and
+every variant's matrix into one (4V, 5) matrix, so all variants of all icons
+come out of a single matrix product per block of pixels; nothing is redrawn.
+"""
+
+from assetgen.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Rec. 709 luma weights.
+LUMA = (0.2126, 0.7152, 0.0722)
+
+# Pixels transformed per block: bounds the float32 working set (~16 bytes
+# in and out per pixel per variant) to tens of MB whatever the batch size.
+BLOCK_PIXELS = 1 << 20
+
+
+def _identity():
+    return [[1.0 if r == c else 0.0 for c in range(5)] for r in range(4)]
+
+
+def _compose(*matrices):
+    """The 4x5 matrix applying ``matrices`` left to right."""
+    result = _identity()
+    for m in matrices:
+        # Treat both as 5x5 affine matrices with an implicit (0, 0, 0, 0, 1) row.
+        result = [[sum(m[r][k] * (result[k][c] if k < 4 else float(c == 4)) for k in range(5))
+                   for c in range(5)] for r in range(4)]
+    return result
+
+
+def saturation(s):
+    """Scale saturation by ``s`` around the pixel's luma (0 is greyscale)."""
+    m = _identity()
+    for r in range(3):
+        for c in range(3):
+            m[r][c] = LUMA[c] * (1 - s) + (s if r == c else 0.0)
+    return m
+
+
+def brightness(k):
+    """Multiply R, G and B by ``k``."""
+    m = _identity()
+    for r in range(3):
+        m[r][r] = k
+    return m
+
+
+def contrast(k):
+    """Stretch R, G and B away from mid-grey by ``k``."""
+    m = brightness(k)
+    for r in range(3):
+        m[r][4] = 127.5 * (1 - k)
+    return m
+
+
+def opacity(k):
+    """Multiply alpha by ``k``."""
+    m = _identity()
+    m[3][3] = k
+    return m
+
+
+VARIANTS = {
+    # Greyscale, darkened and faded: an achievement not yet unlocked.
+    "locked": _compose(saturation(0.0), brightness(0.8), opacity(0.6)),
+    # Same colours at half brightness, e.g. behind a dialog or when disabled.
+    "dimmed": brightness(0.5),
+    # Stronger contrast and colour for the accessibility high-contrast setting.
+    "high_contrast": _compose(contrast(1.4), saturation(1.2)),
+    # Slightly desaturated and toned down, so the rim doesn't glare on a dark surface.
+    "dark": _compose(saturation(0.75), brightness(0.87)),
+}
+
+
+def stack(images):
+    """The RGBA ``images`` (all the same size) as one uint8 (N, H, W, 4) array."""
+    return np.stack([np.asarray(img.convert("RGBA")) for img in images])
+
+
+def derive(batch, names=tuple(VARIANTS)):
+    """
+    Apply the named variants to ``batch`` (N, H, W, 4 uint8) in one pass.
+
+    Returns ``{name: (N, H, W, 4) uint8 array}``.
+    """
+    matrices = np.array([VARIANTS[n] for n in names], np.float32).reshape(-1, 5)  # (4V, 5)
+    linear, offset = matrices[:, :4].T.copy(), matrices[:, 4]
+    pixels = batch.reshape(-1, 4)
+    out = np.empty((len(pixels), len(names) * 4), np.uint8)
+    for start in range(0, len(pixels), BLOCK_PIXELS):
+        block = pixels[start:start + BLOCK_PIXELS].astype(np.float32)
+        values = block @ linear
+        values += offset + np.float32(0.5)
+        np.clip(values, 0, 255, out=values)
+        out[start:start + len(block)] = values
+    return {name: out[:, 4 * i:4 * i + 4].reshape(batch.shape) for i, name in enumerate(names)}
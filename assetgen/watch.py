@@ -0,0 +1,297 @@
+"""
+Watch mode: keep the renderers warm and serve a live preview page.
+
+    python -m assetgen.watch [--port 8765] [--size 256] [--quality normal]
+
+Polls both generator scripts, ``Achievement.kt`` and the ``assetgen``
+modules. On a change it reloads just the changed code in this process, so
+PIL, loaded fonts and unchanged tier templates stay resident. It then
+re-renders only the assets whose render key (the same content hash the
+render cache uses) changed. The results are served at
+http://127.0.0.1:<port>/, which reloads itself whenever a new render lands.
+"""
+
+import argparse
+import html
+import importlib
+import inspect
+import io
+import linecache
+import os
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from assetgen import fonts
+from assetgen.quality import DEFAULT as DEFAULT_QUALITY, PRESETS as QUALITY_PRESETS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Library modules in dependency order. When one changes it is reloaded along
+# with every module after it (they may hold ``from ... import`` bindings to
+# it); fonts is only reloaded when fonts.py itself changes, so loaded faces
+# and cached text layers survive everything else.
+LIBRARY_MODULES = ["render_cache", "fonts", "sdf", "gradients", "compositing", "quality", "contact_sheet",
+                   "display_list", "png_optimize", "png_prefix", "archive", "encoders", "variants",
+                   "kotlin_catalog", "localization", "validate", "feature_variants"]
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>assetgen preview</title>
+<style>
+body {{ background: #202124; color: #e8eaed; font: 13px sans-serif; margin: 16px; }}
+h2 {{ margin: 20px 0 8px; font-size: 16px; }}
+.grid {{ display: flex; flex-wrap: wrap; gap: 12px; }}
+figure {{ margin: 0; width: {cell}px; }}
+figure.wide {{ width: {wide}px; }}
+img {{ max-width: 100%; display: block; }}
+figcaption {{ margin-top: 4px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }}
+pre {{ background: #5c1f1f; padding: 8px; white-space: pre-wrap; }}
+</style></head><body>
+<div>Build {version} &middot; {status}</div>
+{error}
+{groups}
+<script>
+setInterval(async () => {{
+  try {{
+    const v = await (await fetch("/version")).text();
+    if (v !== "{version}") location.reload();
+  }} catch (e) {{}}
+}}, 300);
+</script>
+</body></html>
+"""
+
+
+def _generators():
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    import generate_achievements_zip as achievements
+    import generate_store_assets as store
+    return achievements, store
+
+
+def _png(img):
+    buf = io.BytesIO()
+    img.save(buf, "PNG", compress_level=1)
+    return buf.getvalue()
+
+
+class Watcher:
+    """Render state shared between the poll loop and the HTTP handler."""
+
+    def __init__(self, size=256, quality=DEFAULT_QUALITY, achievements=True, store=True):
+        self.size = size
+        self.quality = quality
+        self.want_achievements = achievements
+        self.want_store = store
+        self.achievements, self.store = _generators()
+        self.library = {name: importlib.import_module(f"assetgen.{name}") for name in LIBRARY_MODULES}
+        self.assets = {}  # name -> (group, label, png bytes, wide)
+        self.keys = {}  # name -> render key of the bytes in self.assets
+        self.version = 0
+        self.status = "starting"
+        self.error = None
+        self.lock = threading.Lock()
+        self.mtimes = self._scan()
+        self._template_state = self._capture_template()
+
+    def watched_files(self):
+        files = {
+            self.achievements.__file__: "achievements",
+            self.store.__file__: "store",
+            self.achievements.ACHIEVEMENT_KT: "catalog",
+        }
+        for name, module in self.library.items():
+            files[module.__file__] = name
+        return files
+
+    def _scan(self):
+        mtimes = {}
+        for path in self.watched_files():
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[path] = None
+        return mtimes
+
+    def poll(self):
+        """Return the watched things ("store", "catalog", a library module...) that changed."""
+        mtimes = self._scan()
+        changed = {self.watched_files()[p] for p, m in mtimes.items() if self.mtimes.get(p) != m}
+        self.mtimes = mtimes
+        return changed
+
+    # ── Reloading ───────────────────────────────────────────────────────
+
+    def _capture_template(self):
+        """The tier background and template functions with their source, read while it matches the file."""
+        module = self.achievements
+        functions = (module.tier_background, module.tier_template)
+        return functions, self._template_source(module), dict(module.TIER_COLORS)
+
+    @staticmethod
+    def _template_source(module):
+        return [inspect.getsource(f) for f in (module.tier_background, module.tier_label_font_size,
+                                                 module.tier_template)]
+
+    def reload(self, changed):
+        """Reload changed code in place, keeping warm state wherever its inputs are unchanged."""
+        old_templates, old_template_src, old_colors = self._template_state
+        linecache.checkcache()
+
+        library_changed = [name for name in LIBRARY_MODULES if name in changed]
+        if library_changed:
+            first = LIBRARY_MODULES.index(library_changed[0])
+            for name in LIBRARY_MODULES[first:]:
+                if name != "fonts" or "fonts" in changed:
+                    self.library[name] = importlib.reload(self.library[name])
+        if library_changed or changed & {"achievements", "catalog"}:
+            self.achievements = importlib.reload(self.achievements)
+            # Fresh lru_caches would re-render every tier background; keep the
+            # old ones when nothing they draw with has changed.
+            if (not library_changed and self.achievements.TIER_COLORS == old_colors
+                    and self._template_source(self.achievements) == old_template_src):
+                self.achievements.tier_background, self.achievements.tier_template = old_templates
+            self._template_state = self._capture_template()
+        if library_changed or "store" in changed:
+            self.store = importlib.reload(self.store)
+
+    # ── Rendering ───────────────────────────────────────────────────────
+
+    def _jobs(self):
+        """Yield (name, group, label, key, render, wide) for every asset in the preview."""
+        achievements, store = self.achievements, self.store
+        if self.want_store:
+            sources = [inspect.getsource(store)] + [inspect.getsource(m) for m in self.library.values()]
+            key = self.library["render_cache"].cache_key(sources, self.size)
+            yield ("store_icon", "Store", "Play Store icon", key,
+                   lambda: store.create_icon(self.size), False)
+            width = self.size * 2
+            yield ("feature_graphic", "Store", "Feature graphic", key,
+                   lambda: store.create_feature_graphic(width, round(width * 500 / 1024)), True)
+        if self.want_achievements:
+            for a in achievements.ACHIEVEMENTS:
+                aid, title, desc, tier, theme = a
+                key = achievements.icon_cache_key(a, self.size, quality=self.quality)
+                yield (aid, tier.title(), title, key,
+                       lambda a=a: achievements.create_achievement_icon(
+                           a[0], a[1], a[3], a[4], self.size, self.quality), False)
+
+    def render(self):
+        """Re-render the assets whose key changed; return how many were rendered."""
+        rendered = 0
+        assets, keys = {}, {}
+        for name, group, label, key, render, wide in self._jobs():
+            if self.keys.get(name) == key:
+                _, _, data, _ = self.assets[name]
+            else:
+                data = _png(render())
+                rendered += 1
+            assets[name], keys[name] = (group, label, data, wide), key
+        with self.lock:
+            self.assets, self.keys = assets, keys
+        return rendered
+
+    def update(self, changed=None):
+        start = time.perf_counter()
+        try:
+            if changed:
+                self.reload(changed)
+            rendered = self.render()
+            error = None
+        except Exception:
+            rendered, error = 0, traceback.format_exc()
+        elapsed = (time.perf_counter() - start) * 1000
+        what = ", ".join(sorted(changed)) if changed else "initial build"
+        with self.lock:
+            self.error = error
+            self.status = f"{what}: {'failed' if error else f'{rendered} re-rendered'} in {elapsed:.0f} ms"
+            self.version += 1
+        print(f"  [{self.version}] {self.status}", flush=True)
+        if error:
+            print(error, file=sys.stderr, flush=True)
+
+    def page(self):
+        with self.lock:
+            groups = {}
+            for name, (group, label, _, wide) in self.assets.items():
+                groups.setdefault(group, []).append(
+                    f'<figure class="{"wide" if wide else ""}"><img src="/asset/{name}.png?v={self.version}">'
+                    f"<figcaption>{html.escape(label)}</figcaption></figure>"
+                )
+            body = "".join(f'<h2>{html.escape(g)}</h2><div class="grid">{"".join(items)}</div>'
+                           for g, items in groups.items())
+            error = f"<pre>{html.escape(self.error)}</pre>" if self.error else ""
+            return PAGE.format(cell=self.size, wide=self.size * 2, version=self.version,
+                               status=html.escape(self.status), error=error, groups=body)
+
+
+def make_handler(watcher):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/":
+                self._send(200, "text/html; charset=utf-8", watcher.page().encode("utf-8"))
+            elif path == "/version":
+                self._send(200, "text/plain", str(watcher.version).encode())
+            elif path.startswith("/asset/") and path.endswith(".png"):
+                with watcher.lock:
+                    asset = watcher.assets.get(path[len("/asset/"):-len(".png")])
+                if asset is None:
+                    self._send(404, "text/plain", b"not found")
+                else:
+                    self._send(200, "image/png", asset[2])
+            else:
+                self._send(404, "text/plain", b"not found")
+
+        def _send(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-render assets on change and serve a live preview.")
+    parser.add_argument("--port", type=int, default=8765, help="preview server port (default: 8765)")
+    parser.add_argument("--size", type=int, default=256, help="icon size in the preview (default: 256)")
+    parser.add_argument(
+        "--quality", choices=list(QUALITY_PRESETS), default=DEFAULT_QUALITY,
+        help=f"supersampling preset for achievement icons (default: {DEFAULT_QUALITY})",
+    )
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between file checks")
+    parser.add_argument("--no-store", action="store_true", help="don't preview the store icon and feature graphic")
+    parser.add_argument("--no-achievements", action="store_true", help="don't preview achievement icons")
+    args = parser.parse_args(argv)
+
+    fonts.require_faces(allow_substitutes=True)
+    watcher = Watcher(args.size, args.quality, not args.no_achievements, not args.no_store)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(watcher))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Preview: http://127.0.0.1:{server.server_port}/  (Ctrl+C to stop)", flush=True)
+
+    watcher.update()
+    try:
+        while True:
+            time.sleep(args.interval)
+            changed = watcher.poll()
+            if changed:
+                watcher.update(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,69 +7,154 @@ Creates:
   - AchievementsIconsMappings.csv  (note: singular "Icon" per Google docs)
   - 512x512 PNG icons for each achievement
   - achievements_import.zip containing everything
+
+The ZIP is built in memory and is reproducible (sorted entries, fixed
+timestamps). Pass --write-files [DIR] to also write the loose files to DIR
+(default store_assets/achievements/). Other tooling can call
+build_achievements_zip() directly; importing this module renders and writes
+nothing, and defers PIL and NumPy until the first icon is drawn. The
+written ZIP is checked against the import rules (``assetgen.validate``) and
+the build fails if it breaks any.
+
+Achievement ids, titles, descriptions and tiers are parsed from
+Achievement.kt; only the icon theme per id is kept here. --mark-published
+records the catalogue in store_assets/achievements_manifest.json, and
+--delta then builds achievements_delta.zip with only the achievements (and
+icons) that are new or changed since that manifest.
+
+--variants [DIR] also writes locked, dimmed, high-contrast and dark-surface
+variants of every icon (``assetgen.variants``) to DIR/<variant>/<id>.png;
+--variants-format webp|auto writes them as (or picks per icon) lossless or
+near-lossless WebP (``assetgen.encoders``). The import ZIP is always PNG.
+
+--preview skips the CSVs and ZIP and renders every icon small, without
+supersampling, into one contact sheet grouped by tier; --quality picks the
+draft/normal/ultra supersampling preset for either mode.
 """
 
 import csv
+import functools
 import io
+import json
 import math
 import os
-import zipfile
-
-from PIL import Image, ImageDraw, ImageFont
+import sys
+import time
+from collections import namedtuple
+
+from assetgen import display_list, encoders, fonts, gradients, instrument, png_optimize, png_prefix, sdf, variants
+from assetgen.archive import build_zip, write_if_changed
+from assetgen.contact_sheet import contact_sheet
+from assetgen.display_list import DisplayList
+from assetgen.encoders import (FORMAT_CHOICES, FormatOptions, encode_best, encode_webp, format_comparison,
+                               near_lossless_rule, target_extension, write_resource)
+from assetgen.png_optimize import PngOptions, encode_png, format_size_report
+from assetgen.quality import DEFAULT as DEFAULT_QUALITY, PRESETS as QUALITY_PRESETS, downsample
+from assetgen.gradients import fill_radial_gradient_aa
+from assetgen.kotlin_catalog import ACHIEVEMENT_KT, load_achievements
+from assetgen.lazy import lazy_import
+from assetgen.localization import TranslationError, load_tables, localization_rows, validate
+from assetgen.render_cache import DEFAULT_MAX_BYTES, RenderCache, cache_key
+from assetgen.sdf import SdfDraw
+from assetgen.validate import format_report, validate_path
+from assetgen.variants import VARIANTS, derive, stack
+
+PIL = lazy_import("PIL")
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageColor = lazy_import("PIL.ImageColor")
+np = lazy_import("numpy")
+# Slow to import and only used by some commands
+inspect = lazy_import("inspect")
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "store_assets", "achievements")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-# ── Achievement data (matches Achievement.kt) ──────────────────────────────
-
-ACHIEVEMENTS = [
-    # (id, title, description, tier, theme)
+ZIP_PATH = os.path.join(os.path.dirname(__file__), "store_assets", "achievements_import.zip")
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".render_cache", "achievements")
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), ".profile")
+CATALOG_CACHE = os.path.join(os.path.dirname(__file__), ".render_cache", "achievement_catalog.json")
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "store_assets", "achievements_manifest.json")
+DELTA_ZIP_PATH = os.path.join(os.path.dirname(__file__), "store_assets", "achievements_delta.zip")
+PREVIEW_PATH = os.path.join(os.path.dirname(__file__), "store_assets", "achievements_preview.png")
+TRANSLATIONS_DIR = os.path.join(os.path.dirname(__file__), "translations", "achievements")
+LOCALIZED_ICONS_DIR = os.path.join(os.path.dirname(__file__), "store_assets", "achievements_localized")
+VARIANTS_DIR = os.path.join(os.path.dirname(__file__), "store_assets", "achievements_variants")
+
+# ── Achievement data (parsed from Achievement.kt) ───────────────────────────
+
+# Ids, titles, descriptions and tiers come from the Kotlin enum; only the
+# symbol drawn on each icon lives here. Ids missing from this table get a star.
+DEFAULT_THEME = "star"
+ACHIEVEMENT_THEMES = {
     # Original
-    ("first_steps",        "First Steps",         "Complete any quiz",                              "BRONZE", "star"),
-    ("world_traveler",     "World Traveler",       "Complete the All Countries quiz",                "GOLD",   "globe"),
-    ("perfectionist",      "Perfectionist",        "Get 100% on any quiz",                          "GOLD",   "trophy"),
-    ("speed_demon",        "Speed Demon",          "Complete any quiz in under 2 minutes",           "SILVER", "clock"),
-    ("region_master",      "Region Master",        "Complete all 5 region quizzes",                  "GOLD",   "map"),
-    ("alphabet_soup",      "Alphabet Soup",        "Complete 10 starting-letter quizzes",            "SILVER", "letter"),
-    ("century_club",       "Century Club",         "Name 100+ countries in a single quiz",           "SILVER", "hundred"),
-    ("half_way_there",     "Half Way There",       "Name 50%+ in All Countries",                    "BRONZE", "globe"),
-    ("geography_buff",     "Geography Buff",       "Complete 20 quizzes total",                      "GOLD",   "book"),
-    ("explorer",           "Explorer",             "Try 5 different category groups",                "BRONZE", "compass"),
+    "first_steps":           "star",
+    "world_traveler":        "globe",
+    "perfectionist":         "trophy",
+    "speed_demon":           "clock",
+    "region_master":         "map",
+    "alphabet_soup":         "letter",
+    "century_club":          "hundred",
+    "half_way_there":        "globe",
+    "geography_buff":        "book",
+    "explorer":              "compass",
     # New Bronze
-    ("quick_study",        "Quick Study",          "Complete a quiz in under 5 minutes",             "BRONZE", "clock"),
-    ("island_hopper",      "Island Hopper",        "Complete the Island Countries quiz",             "BRONZE", "island"),
-    ("pattern_finder",     "Pattern Finder",       "Complete any Letter Pattern quiz",               "BRONZE", "pattern"),
+    "quick_study":           "clock",
+    "island_hopper":         "island",
+    "pattern_finder":        "pattern",
     # New Silver
-    ("world_scholar",      "World Scholar",        "Name 75%+ in All Countries",                    "SILVER", "globe"),
-    ("length_master",      "Length Master",        "Complete 5 different name length quizzes",       "SILVER", "ruler"),
-    ("vowel_hunter",       "Vowel Hunter",         "Complete the All Vowels Present quiz",           "SILVER", "letter"),
-    ("continental",        "Continental",           "Complete all region quizzes with 80%+",          "SILVER", "map"),
-    ("letter_collector",   "Letter Collector",      "Complete 15 starting-letter quizzes",            "SILVER", "letter"),
+    "world_scholar":         "globe",
+    "length_master":         "ruler",
+    "vowel_hunter":          "letter",
+    "continental":           "map",
+    "letter_collector":      "letter",
     # New Gold
-    ("ultimate_geographer","Ultimate Geographer",   "Name every country in the world",               "GOLD",   "globe"),
-    ("speed_master",       "Speed Master",          "Complete All Countries in under 15 minutes",    "GOLD",   "clock"),
-    ("pattern_master",     "Pattern Master",        "Complete all Letter Pattern quizzes",            "GOLD",   "pattern"),
-    ("subregion_explorer", "Subregion Explorer",    "Complete 10 different subregion quizzes",        "GOLD",   "map"),
+    "ultimate_geographer":   "globe",
+    "speed_master":          "clock",
+    "pattern_master":        "pattern",
+    "subregion_explorer":    "map",
     # Capitals
-    ("capital_beginner",   "Capital Beginner",      "Complete any capital quiz",                      "BRONZE", "capital"),
-    ("capital_expert",     "Capital Expert",         "Get 80%+ on any capital quiz",                  "SILVER", "capital"),
-    ("world_capitals",     "World Capitals",         "Complete the All Capitals quiz",                "GOLD",   "capital"),
-    ("capital_speed_run",  "Capital Speed Run",      "Complete a capital quiz in under 2 minutes",    "SILVER", "clock"),
-    ("capital_scholar",    "Capital Scholar",         "Complete 10 capital quizzes",                   "SILVER", "book"),
-    ("capital_master",     "Capital Master",          "Get 100% on the All Capitals quiz",            "GOLD",   "trophy"),
+    "capital_beginner":      "capital",
+    "capital_expert":        "capital",
+    "world_capitals":        "capital",
+    "capital_speed_run":     "clock",
+    "capital_scholar":       "book",
+    "capital_master":        "trophy",
     # Flags
-    ("flag_spotter",       "Flag Spotter",            "Complete any flag quiz",                       "BRONZE", "flag"),
-    ("color_expert",       "Color Expert",             "Complete 5 different flag color quizzes",     "SILVER", "palette"),
-    ("rainbow",            "Rainbow",                  "Complete flag quizzes for 6 different colors","GOLD",   "rainbow"),
-    ("flag_perfectionist", "Flag Perfectionist",       "Get 100% on any flag quiz",                  "SILVER", "flag"),
-    ("vexillologist",      "Vexillologist",             "Complete 10 flag quizzes",                   "GOLD",   "flag"),
-    ("flag_master",        "Flag Master",               "Complete Flags of the World quiz with 80%+","GOLD",   "trophy"),
+    "flag_spotter":          "flag",
+    "color_expert":          "palette",
+    "rainbow":               "rainbow",
+    "flag_perfectionist":    "flag",
+    "vexillologist":         "flag",
+    "flag_master":           "trophy",
     # Incorrect guesses & hard mode
-    ("flawless",           "Flawless",                  "Complete a quiz with 0 incorrect guesses",  "BRONZE", "diamond"),
-    ("sharp_mind",         "Sharp Mind",                "Complete 5 quizzes with 0 incorrect guesses","SILVER","diamond"),
-    ("survivor",           "Survivor",                  "Complete a quiz in hard mode",               "BRONZE", "shield"),
-    ("nerves_of_steel",    "Nerves of Steel",           "Get 100% in hard mode",                     "GOLD",   "shield"),
-]
+    "flawless":              "diamond",
+    "sharp_mind":            "diamond",
+    "survivor":              "shield",
+    "nerves_of_steel":       "shield",
+}
+
+
+def load_catalog(path=ACHIEVEMENT_KT):
+    """Return ``((id, title, description, tier, theme), ...)`` in enum order."""
+    entries = load_achievements(path, CATALOG_CACHE)
+    return _with_themes(tuple(map(tuple, entries)), os.path.basename(path))
+
+
+@functools.lru_cache(maxsize=None)
+def _with_themes(entries, source_name):
+    ids = {aid for aid, *_ in entries}
+    for aid in sorted(ids - ACHIEVEMENT_THEMES.keys()):
+        print(f"  Warning: no theme for achievement {aid!r}, using {DEFAULT_THEME!r}")
+    for aid in sorted(ACHIEVEMENT_THEMES.keys() - ids):
+        print(f"  Warning: theme table lists {aid!r}, which is not in {source_name}")
+    return tuple((aid, title, desc, tier, ACHIEVEMENT_THEMES.get(aid, DEFAULT_THEME))
+                 for aid, title, desc, tier in entries)
+
+
+def __getattr__(name):
+    # ACHIEVEMENTS is read from Achievement.kt on first use rather than on import.
+    if name == "ACHIEVEMENTS":
+        return load_catalog()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 TIER_POINTS = {"BRONZE": 5, "SILVER": 15, "GOLD": 30}
 
@@ -80,22 +165,31 @@ TIER_COLORS = {
 }
 
 
-
-def hex_to_rgb(hex_color):
-    h = hex_color.lstrip("#")
-    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
-
-
-def draw_circle_gradient(draw, cx, cy, radius, color_inner, color_outer):
-    """Draw a radial gradient circle."""
-    r1, g1, b1 = hex_to_rgb(color_inner)
-    r2, g2, b2 = hex_to_rgb(color_outer)
-    for r in range(int(radius), 0, -1):
-        t = r / radius
-        cr = int(r1 * (1 - t) + r2 * t)
-        cg = int(g1 * (1 - t) + g2 * t)
-        cb = int(b1 * (1 - t) + b2 * t)
-        draw.ellipse([cx - r, cy - r, cx + r, cy + r], fill=(cr, cg, cb))
+def _polar(radius, degrees, y_scale=1.0):
+    angle = math.radians(degrees)
+    return radius * math.cos(angle), radius * y_scale * math.sin(angle)
+
+
+# Symbol geometry as offsets from the symbol's centre in units of its size
+# (or of its radius, where a symbol has one), worked out once at import so
+# the draw functions only scale and translate it.
+SYMBOL_GEOMETRY = {
+    "star": [_polar(0.45 if i % 2 == 0 else 0.18, i * 36 - 90) for i in range(10)],
+    # (inner end, outer end) of each hour tick, then the hand tips (10 and 2 o'clock)
+    "clock_ticks": [(_polar(0.82, i * 30 - 90), _polar(0.95, i * 30 - 90)) for i in range(12)],
+    "clock_hands": (_polar(0.45, 300 - 90), _polar(0.65, 60 - 90)),
+    # (filled, tip, base left, base right) of the N, E, S, W arrows
+    "compass": [
+        (deg in (0, 270), _polar(0.85, deg - 90),
+         tuple(b + l for b, l in zip(_polar(0.15, deg - 90), _polar(0.15, deg))),
+         tuple(b - l for b, l in zip(_polar(0.15, deg - 90), _polar(0.15, deg))))
+        for deg in (0, 90, 180, 270)
+    ],
+    "island_trunk": [(-0.05 + i / 19 * 0.08, 0.1 - i / 19 * 0.45) for i in range(20)],
+    "island_fronds": [_polar(0.2, deg) for deg in (-150, -120, -60, -30, 0)],
+    "palette_blobs": [_polar(dist, deg, 0.75) for deg, dist in ((45, 0.55), (90, 0.5), (135, 0.55),
+                                                               (180, 0.45), (0, 0.45))],
+}
 
 
 def draw_globe_symbol(draw, cx, cy, size, color):
@@ -178,14 +272,7 @@ def draw_diamond_symbol(draw, cx, cy, size, color):
 
 def draw_star_symbol(draw, cx, cy, size, color):
     """Draw a 5-pointed star."""
-    lw = max(2, size // 20)
-    r_outer = size * 0.45
-    r_inner = size * 0.18
-    points = []
-    for i in range(10):
-        angle = math.radians(i * 36 - 90)
-        r = r_outer if i % 2 == 0 else r_inner
-        points.append((cx + r * math.cos(angle), cy + r * math.sin(angle)))
+    points = [(cx + size * x, cy + size * y) for x, y in SYMBOL_GEOMETRY["star"]]
     draw.polygon(points, outline=color, fill=color)
 
 
@@ -196,21 +283,12 @@ def draw_clock_symbol(draw, cx, cy, size, color):
     # Circle
     draw.ellipse([cx - r, cy - r, cx + r, cy + r], outline=color, width=lw)
     # Hour ticks
-    for i in range(12):
-        angle = math.radians(i * 30 - 90)
-        x1 = cx + r * 0.82 * math.cos(angle)
-        y1 = cy + r * 0.82 * math.sin(angle)
-        x2 = cx + r * 0.95 * math.cos(angle)
-        y2 = cy + r * 0.95 * math.sin(angle)
-        draw.line([(x1, y1), (x2, y2)], fill=color, width=max(1, lw - 1))
-    # Hands - hour pointing at 10
-    h_angle = math.radians(300 - 90)
-    draw.line([(cx, cy), (cx + r * 0.45 * math.cos(h_angle), cy + r * 0.45 * math.sin(h_angle))],
-              fill=color, width=lw + 1)
-    # Minute hand pointing at 2
-    m_angle = math.radians(60 - 90)
-    draw.line([(cx, cy), (cx + r * 0.65 * math.cos(m_angle), cy + r * 0.65 * math.sin(m_angle))],
-              fill=color, width=lw)
+    for (x1, y1), (x2, y2) in SYMBOL_GEOMETRY["clock_ticks"]:
+        draw.line([(cx + r * x1, cy + r * y1), (cx + r * x2, cy + r * y2)], fill=color, width=max(1, lw - 1))
+    # Hands - hour pointing at 10, minute at 2
+    (hx, hy), (mx, my) = SYMBOL_GEOMETRY["clock_hands"]
+    draw.line([(cx, cy), (cx + r * hx, cy + r * hy)], fill=color, width=lw + 1)
+    draw.line([(cx, cy), (cx + r * mx, cy + r * my)], fill=color, width=lw)
     # Center dot
     draw.ellipse([cx - lw, cy - lw, cx + lw, cy + lw], fill=color)
 
@@ -221,24 +299,13 @@ def draw_compass_symbol(draw, cx, cy, size, color):
     r = size * 0.42
     # Outer circle
     draw.ellipse([cx - r, cy - r, cx + r, cy + r], outline=color, width=lw)
-    # Cardinal points (N, S, E, W arrows)
-    for angle_deg in [0, 90, 180, 270]:
-        angle = math.radians(angle_deg - 90)
-        # Arrow point
-        px = cx + r * 0.85 * math.cos(angle)
-        py = cy + r * 0.85 * math.sin(angle)
-        # Arrow base left/right
-        perp = angle + math.pi / 2
-        bx = cx + r * 0.15 * math.cos(angle)
-        by = cy + r * 0.15 * math.sin(angle)
-        lx = bx + r * 0.15 * math.cos(perp)
-        ly = by + r * 0.15 * math.sin(perp)
-        rx = bx - r * 0.15 * math.cos(perp)
-        ry = by - r * 0.15 * math.sin(perp)
-        if angle_deg in [0, 270]:  # N and W filled
-            draw.polygon([(px, py), (lx, ly), (rx, ry)], fill=color)
+    # Cardinal points (N, E, S, W arrows; N and W filled)
+    for filled, *corners in SYMBOL_GEOMETRY["compass"]:
+        triangle = [(cx + r * x, cy + r * y) for x, y in corners]
+        if filled:
+            draw.polygon(triangle, fill=color)
         else:
-            draw.polygon([(px, py), (lx, ly), (rx, ry)], outline=color, width=max(1, lw - 1))
+            draw.polygon(triangle, outline=color, width=max(1, lw - 1))
 
 
 def draw_book_symbol(draw, cx, cy, size, color):
@@ -291,33 +358,22 @@ def draw_island_symbol(draw, cx, cy, size, color):
     iw = size * 0.4
     draw.arc([cx - iw, cy + size * 0.05, cx + iw, cy + size * 0.55], 180, 360, fill=color, width=lw + 1)
     # Palm trunk (curved line)
-    trunk_points = []
-    for i in range(20):
-        t = i / 19
-        x = cx - size * 0.05 + t * size * 0.08
-        y = cy + size * 0.1 - t * size * 0.45
-        trunk_points.append((x, y))
+    trunk_points = [(cx + size * x, cy + size * y) for x, y in SYMBOL_GEOMETRY["island_trunk"]]
     for i in range(len(trunk_points) - 1):
         draw.line([trunk_points[i], trunk_points[i + 1]], fill=color, width=lw)
     # Palm fronds (lines radiating from top)
     top = trunk_points[-1]
-    for angle_deg in [-150, -120, -60, -30, 0]:
-        angle = math.radians(angle_deg)
-        ex = top[0] + size * 0.2 * math.cos(angle)
-        ey = top[1] + size * 0.2 * math.sin(angle)
-        draw.line([top, (ex, ey)], fill=color, width=max(1, lw - 1))
+    for x, y in SYMBOL_GEOMETRY["island_fronds"]:
+        draw.line([top, (top[0] + size * x, top[1] + size * y)], fill=color, width=max(1, lw - 1))
 
 
 def draw_letter_symbol(draw, cx, cy, size, color):
     """Draw ABC letters."""
-    try:
-        font = ImageFont.truetype("arialbd.ttf", int(size * 0.55))
-    except OSError:
-        font = ImageFont.truetype("arial.ttf", int(size * 0.55))
+    font_size = int(size * 0.55)
     text = "Aa"
-    bbox = draw.textbbox((0, 0), text, font=font)
+    bbox = fonts.text_bbox(text, "bold", font_size)
     tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-    draw.text((cx - tw // 2 - bbox[0], cy - th // 2 - bbox[1]), text, fill=color, font=font)
+    fonts.draw_text(draw, (cx - tw // 2 - bbox[0], cy - th // 2 - bbox[1]), text, color, "bold", font_size)
 
 
 def draw_pattern_symbol(draw, cx, cy, size, color):
@@ -341,14 +397,11 @@ def draw_pattern_symbol(draw, cx, cy, size, color):
 
 def draw_hundred_symbol(draw, cx, cy, size, color):
     """Draw '100' text."""
-    try:
-        font = ImageFont.truetype("arialbd.ttf", int(size * 0.5))
-    except OSError:
-        font = ImageFont.truetype("arial.ttf", int(size * 0.5))
+    font_size = int(size * 0.5)
     text = "100"
-    bbox = draw.textbbox((0, 0), text, font=font)
+    bbox = fonts.text_bbox(text, "bold", font_size)
     tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-    draw.text((cx - tw // 2 - bbox[0], cy - th // 2 - bbox[1]), text, fill=color, font=font)
+    fonts.draw_text(draw, (cx - tw // 2 - bbox[0], cy - th // 2 - bbox[1]), text, color, "bold", font_size)
 
 
 def draw_ruler_symbol(draw, cx, cy, size, color):
@@ -390,10 +443,8 @@ def draw_palette_symbol(draw, cx, cy, size, color):
     draw.ellipse([cx - r, cy - r * 0.75, cx + r, cy + r * 0.75], outline=color, width=lw)
     # Paint blobs
     blob_r = size * 0.055
-    for angle_deg, dist in [(45, 0.55), (90, 0.5), (135, 0.55), (180, 0.45), (0, 0.45)]:
-        angle = math.radians(angle_deg)
-        bx = cx + r * dist * math.cos(angle)
-        by = cy + r * 0.75 * dist * math.sin(angle)
+    for x, y in SYMBOL_GEOMETRY["palette_blobs"]:
+        bx, by = cx + r * x, cy + r * y
         draw.ellipse([bx - blob_r, by - blob_r, bx + blob_r, by + blob_r], fill=color)
     # Thumb hole
     draw.ellipse([cx + r * 0.15, cy + r * 0.1, cx + r * 0.4, cy + r * 0.35], outline=color, width=lw)
@@ -410,153 +461,916 @@ def draw_rainbow_symbol(draw, cx, cy, size, color):
                  200, 340, fill=color, width=lw)
 
 
-def create_achievement_icon(achievement_id, title, tier, theme, size=512):
-    """Create a 512x512 achievement icon."""
-    ss = 2
-    s = size * ss
+# Furthest any symbol reaches from its centre, as a fraction of its size
+# (the book's pages); bounds the supersampled symbol layer.
+SYMBOL_EXTENT = 0.62
+
+# Widest tier label, as a fraction of the icon, that stays clear of the ring.
+TIER_LABEL_MAX_WIDTH = 0.30
+
+DRAW_FUNCTIONS = {
+    "globe": draw_globe_symbol,
+    "flag": draw_flag_symbol,
+    "shield": draw_shield_symbol,
+    "trophy": draw_trophy_symbol,
+    "diamond": draw_diamond_symbol,
+    "star": draw_star_symbol,
+    "clock": draw_clock_symbol,
+    "compass": draw_compass_symbol,
+    "book": draw_book_symbol,
+    "map": draw_map_symbol,
+    "island": draw_island_symbol,
+    "letter": draw_letter_symbol,
+    "pattern": draw_pattern_symbol,
+    "hundred": draw_hundred_symbol,
+    "ruler": draw_ruler_symbol,
+    "capital": draw_capital_symbol,
+    "palette": draw_palette_symbol,
+    "rainbow": draw_rainbow_symbol,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def tier_background(tier, s):
+    """
+    ``s`` x ``s`` gradient disc and rings shared by every icon of ``tier``.
+
+    Drawn anti-aliased at the final size, once per process; never draw on it
+    directly.
+    """
     colors = TIER_COLORS[tier]
 
     img = Image.new("RGBA", (s, s), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
 
-    cx, cy = s // 2, s // 2
-    outer_r = s // 2 - s // 20
+    # Laid out on the 2x design's whole-pixel grid and drawn at 1x through
+    # SdfDraw's scale, so centre and radii match what ImageDraw made of its
+    # inclusive boxes ([51, 51, 973, 973] at 512 px is centre 256.25,
+    # radius 230.75) and only the edge filter differs
+    ss = 2
+    shapes = SdfDraw(img, scale=1 / ss)
+    c = s * ss // 2
+    outer_r = s * ss // 2 - s * ss // 20
+    ring_width = s * ss // 14
+
+    # Background circle with gradient, stopping under the ring so their
+    # anti-aliased edges don't stack
+    with instrument.stage("gradient", tier):
+        center = (c + 0.5) / ss
+        fill_radial_gradient_aa(img, center, center, outer_r / ss, colors["bg"], "#000000",
+                                extent=(outer_r + 0.5 - ring_width / 2) / ss)
+
+    with instrument.stage("rings", tier):
+        # Tier-colored ring
+        shapes.ellipse([c - outer_r, c - outer_r, c + outer_r, c + outer_r],
+                       outline=colors["ring"], width=ring_width)
+        # Inner ring highlight
+        inner_ring_r = outer_r - ring_width
+        shapes.ellipse([c - inner_ring_r, c - inner_ring_r, c + inner_ring_r, c + inner_ring_r],
+                       outline=colors["ring_dark"], width=max(2, s * ss // 100))
+    return img
 
-    # Background circle with gradient
-    draw_circle_gradient(draw, cx, cy, outer_r, colors["bg"], "#000000")
 
-    # Tier-colored ring
-    ring_width = s // 14
-    draw.ellipse(
-        [cx - outer_r, cy - outer_r, cx + outer_r, cy + outer_r],
-        outline=colors["ring"], width=ring_width
-    )
-    # Inner ring highlight
-    inner_ring_r = outer_r - ring_width
-    draw.ellipse(
-        [cx - inner_ring_r, cy - inner_ring_r, cx + inner_ring_r, cy + inner_ring_r],
-        outline=colors["ring_dark"], width=max(2, s // 100)
-    )
+def tier_label_font_size(s):
+    return int(s * 0.055)
+
+
+def tier_label_top(s):
+    """First row the tier label can touch; every row above it is the same in all locales."""
+    return s // 2 + int(s * 0.32)
+
+
+@functools.lru_cache(maxsize=None)
+def tier_template(tier, s, label=None):
+    """
+    The tier background with its label (the tier name unless ``label`` is given).
+
+    Copied by create_achievement_icon, so never draw on it directly.
+    """
+    img = tier_background(tier, s).copy()
 
-    # Central symbol
-    symbol_color = colors["glow"]
+    # Tier label at the bottom (clear of the symbol area). Text is drawn at
+    # 2x like the rest of the design, on a layer cropped to the rows from
+    # tier_label_top down, and downsampled there
+    ss = 2
+    top = tier_label_top(s)
+    with instrument.stage("text", tier):
+        tier_font_size = tier_label_font_size(s * ss)
+        tier_text = tier if label is None else label
+        bbox = fonts.text_bbox(tier_text, "bold", tier_font_size)
+        tw = bbox[2] - bbox[0]
+        x, y = s * ss // 2 - tw // 2 - bbox[0], s * ss // 2 + int(s * ss * 0.32)
+        layer = Image.new("RGBA", (s * ss, (s - top) * ss), (0, 0, 0, 0))
+        fonts.draw_text(
+            ImageDraw.Draw(layer), (x, y - top * ss),
+            tier_text, TIER_COLORS[tier]["ring"], "bold", tier_font_size
+        )
+    with instrument.stage("downsample", tier):
+        img.alpha_composite(layer.resize((s, s - top), Image.LANCZOS), (0, top))
+    return img
+
+
+def _symbol_frame(size, ss):
+    """
+    Where the symbol goes on a ``size`` icon drawn ``ss`` times larger.
+
+    Returns ``(symbol size, its centre on the symbol layer, the layer's box
+    on the icon)``; the layer is cropped to the symbol, which stays within
+    ~0.6 x size.
+    """
+    s = size * ss
+    cx, cy = s // 2, s // 2
     symbol_size = int(s * 0.38)
     symbol_cy = cy - s // 30  # slightly above center to leave room for title
+    half = min(int(symbol_size * SYMBOL_EXTENT) // ss + 4, size // 2)
+    x0, y0 = max(0, cx // ss - half), max(0, symbol_cy // ss - half)
+    x1, y1 = min(size, cx // ss + half), min(size, symbol_cy // ss + half)
+    return symbol_size, (cx - x0 * ss, symbol_cy - y0 * ss), (x0, y0, x1, y1)
 
-    DRAW_FUNCTIONS = {
-        "globe": draw_globe_symbol,
-        "flag": draw_flag_symbol,
-        "shield": draw_shield_symbol,
-        "trophy": draw_trophy_symbol,
-        "diamond": draw_diamond_symbol,
-        "star": draw_star_symbol,
-        "clock": draw_clock_symbol,
-        "compass": draw_compass_symbol,
-        "book": draw_book_symbol,
-        "map": draw_map_symbol,
-        "island": draw_island_symbol,
-        "letter": draw_letter_symbol,
-        "pattern": draw_pattern_symbol,
-        "hundred": draw_hundred_symbol,
-        "ruler": draw_ruler_symbol,
-        "capital": draw_capital_symbol,
-        "palette": draw_palette_symbol,
-        "rainbow": draw_rainbow_symbol,
-    }
-    draw_fn = DRAW_FUNCTIONS.get(theme, draw_star_symbol)
-    draw_fn(draw, cx, symbol_cy, symbol_size, symbol_color)
 
-    # Tier label at the bottom
-    try:
-        tier_font = ImageFont.truetype("arialbd.ttf", int(s * 0.055))
-    except OSError:
-        tier_font = ImageFont.truetype("arial.ttf", int(s * 0.055))
-
-    tier_text = tier
-    bbox = draw.textbbox((0, 0), tier_text, font=tier_font)
-    tw = bbox[2] - bbox[0]
-    draw.text(
-        (cx - tw // 2 - bbox[0], cy + int(s * 0.32)),
-        tier_text, fill=colors["ring"], font=tier_font
-    )
+# Symbols are recorded on the layer of a 512 px icon at the normal preset,
+# so that (the release build) replays them unscaled.
+SYMBOL_RECORDING = (512, 2)
 
-    # Downsample
-    img = img.resize((size, size), Image.LANCZOS)
+
+_symbol_lists = {}  # theme -> DisplayList, filled by symbol_display_list
+
+
+def symbol_display_list(theme, cache=None):
+    """
+    The ``theme`` symbol's draw calls (in mask value 255), recorded once for every size.
+
+    With a RenderCache the recording is kept there as JSON, so later runs
+    load it instead of running the drawing code again.
+    """
+    recording = _symbol_lists.get(theme)
+    if recording is not None:
+        return recording
+    draw_fn = DRAW_FUNCTIONS.get(theme, draw_star_symbol)
+    key = cache_key("symbol", theme, inspect.getsource(draw_fn), inspect.getsource(_symbol_frame),
+                    repr(SYMBOL_GEOMETRY), SYMBOL_EXTENT, SYMBOL_RECORDING, display_list.FORMAT) if cache else None
+    data = cache.get(key) if cache else None
+    if data is not None:
+        recording = DisplayList.loads(data)
+    else:
+        symbol_size, (cx, cy), _ = _symbol_frame(*SYMBOL_RECORDING)
+        recording = DisplayList()
+        draw_fn(recording, cx, cy, symbol_size, 255)
+        if cache:
+            cache.put(key, recording.dumps())
+    _symbol_lists[theme] = recording
+    return recording
+
+
+@functools.lru_cache(maxsize=64)
+def symbol_mask(theme, size, quality):
+    """
+    The ``theme`` symbol as a downsampled coverage mask (L), and its (x, y) on the icon.
+
+    Only this part is supersampled, so it has its own layer. The symbol's
+    display list is replayed scaled to the preset's canvas, once per theme
+    and size for every tier and locale; symbol_layer colours it.
+    """
+    preset = QUALITY_PRESETS[quality]
+    ss = preset.supersample
+    symbol_size, (cx, cy), (x0, y0, x1, y1) = _symbol_frame(size, ss)
+    recorded_size, (rx, ry), _ = _symbol_frame(*SYMBOL_RECORDING)
+    k = symbol_size / recorded_size
+    mask = Image.new("L", ((x1 - x0) * ss, (y1 - y0) * ss), 0)
+
+    with instrument.stage("symbol", theme):
+        symbol_display_list(theme).replay(ImageDraw.Draw(mask), k, (cx - rx * k, cy - ry * k))
+    with instrument.stage("downsample", theme):
+        mask = downsample(mask, (x1 - x0, y1 - y0), preset)
+    return mask, (x0, y0)
+
+
+@functools.lru_cache(maxsize=128)
+def symbol_layer(theme, tier, size, quality):
+    """The symbol_mask tinted with ``tier``'s glow colour (RGBA), and its (x, y) on the icon."""
+    mask, position = symbol_mask(theme, size, quality)
+    color = ImageColor.getrgb(TIER_COLORS[tier]["glow"])
+    with instrument.stage("tint", theme):
+        layer = np.empty((mask.height, mask.width, 4), np.uint8)
+        layer[..., :3] = color[:3]
+        alpha = np.asarray(mask)
+        if len(color) == 4 and color[3] != 255:
+            alpha = (alpha.astype(np.uint16) * color[3] + 127) // 255
+        layer[..., 3] = alpha
+    return Image.fromarray(layer, "RGBA"), position
+
+
+def create_achievement_icon(achievement_id, title, tier, theme, size=512, quality=DEFAULT_QUALITY, label=None):
+    """
+    Create a ``size`` x ``size`` achievement icon at the named quality preset.
+
+    ``label`` replaces the English tier name on the icon (for a localized variant).
+    """
+    with instrument.stage("template", achievement_id):
+        img = tier_template(tier, size, label).copy()
+    layer, position = symbol_layer(theme, tier, size, quality)
+    with instrument.stage("composite", achievement_id):
+        img.alpha_composite(layer, position)
     return img
 
 
-def main():
-    print(f"Generating achievements ZIP for {len(ACHIEVEMENTS)} achievements...")
+def render_icon_png(achievement, png_options=None, quality=DEFAULT_QUALITY, label=None):
+    """Render one catalogue entry (with tier ``label``, if given) and return it as an EncodedPng."""
+    aid, title, desc, tier, theme = achievement
+    icon = create_achievement_icon(aid, title, tier, theme, quality=quality, label=label)
+    with instrument.stage("encode", aid):
+        return encode_png(icon, png_options)
 
-    # ── Generate icons ──────────────────────────────────────────────────
-    icon_filenames = {}
-    for i, (aid, title, desc, tier, theme) in enumerate(ACHIEVEMENTS):
-        fname = f"{aid}.png"
-        icon_filenames[aid] = fname
-        icon = create_achievement_icon(aid, title, tier, theme)
-        icon_path = os.path.join(OUTPUT_DIR, fname)
-        icon.save(icon_path, "PNG")
-        print(f"  [{i+1}/{len(ACHIEVEMENTS)}] {fname} ({tier})")
-
-    # ── AchievementsMetadata.csv ────────────────────────────────────────
+
+def _render_task(achievement, png_options, quality):
+    """Process-pool task: the EncodedPng plus the worker's stage timings."""
+    return render_icon_png(achievement, png_options, quality), instrument.drain()
+
+
+@functools.lru_cache(maxsize=None)
+def _renderer_sources(theme):
+    """Source of every function that draws and encodes an icon for ``theme``."""
+    draw_fn = DRAW_FUNCTIONS.get(theme, draw_star_symbol)
+    return [inspect.getsource(draw_fn), inspect.getsource(tier_background),
+            inspect.getsource(tier_label_font_size), inspect.getsource(tier_label_top),
+            inspect.getsource(tier_template), inspect.getsource(_symbol_frame),
+            inspect.getsource(symbol_display_list), inspect.getsource(symbol_mask),
+            inspect.getsource(symbol_layer), inspect.getsource(create_achievement_icon),
+            inspect.getsource(render_icon_png), repr(SYMBOL_GEOMETRY), SYMBOL_EXTENT, SYMBOL_RECORDING,
+            inspect.getsource(gradients), inspect.getsource(sdf), inspect.getsource(fonts),
+            inspect.getsource(display_list), inspect.getsource(downsample), inspect.getsource(png_optimize),
+            inspect.getsource(png_prefix)]
+
+
+def icon_cache_key(achievement, size=512, png_options=None, quality=DEFAULT_QUALITY, label=None):
+    """Content hash of everything that affects the rendered icon for ``achievement``."""
+    aid, title, desc, tier, theme = achievement
+    return cache_key(aid, tier, theme, size, TIER_COLORS[tier], _renderer_sources(theme),
+                     fonts.face_files(), PIL.__version__, png_options, QUALITY_PRESETS[quality], label)
+
+
+def render_icons(achievements, jobs=1, png_options=None, quality=DEFAULT_QUALITY, cache=None):
+    """
+    Render icons for ``achievements``, yielding (index, EncodedPng) as each finishes.
+
+    With ``jobs`` > 1 the icons are rendered in a process pool, so results can
+    arrive out of order; callers key on the index to keep output deterministic.
+    ``cache`` (a RenderCache) supplies and keeps the symbols' display lists.
+    """
+    # Build the tier backgrounds and symbols up front so forked workers inherit them.
+    for tier in sorted({a[3] for a in achievements}):
+        tier_template(tier, 512)
+    for theme in sorted({a[4] for a in achievements}):
+        symbol_display_list(theme, cache)
+    if jobs <= 1:
+        for i, achievement in enumerate(achievements):
+            yield i, render_icon_png(achievement, png_options, quality)
+        return
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=jobs, initializer=instrument.reset,
+                             initargs=(instrument.enabled(),)) as pool:
+        futures = {pool.submit(_render_task, a, png_options, quality): i for i, a in enumerate(achievements)}
+        for future in as_completed(futures):
+            encoded, timings = future.result()
+            instrument.merge(timings)
+            yield futures[future], encoded
+
+
+# ── Publish manifest ────────────────────────────────────────────────────────
+
+def manifest_entry(order, achievement, tables=()):
+    """Everything about one achievement that the Play Console import sees."""
+    aid, title, desc, tier, theme = achievement
+    entry = {
+        "title": title,
+        "description": desc,
+        "tier": tier,
+        "points": TIER_POINTS[tier],
+        "order": order,
+        "icon": icon_cache_key(achievement),
+    }
+    localized = {t.locale: list(t.entries[aid]) for t in tables if aid in t.entries}
+    if localized:
+        entry["localized"] = localized
+    return entry
+
+
+def catalog_manifest(achievements, tables=()):
+    return {a[0]: manifest_entry(i + 1, a, tables) for i, a in enumerate(achievements)}
+
+
+def load_manifest(path):
+    """The achievements recorded by the last ``--mark-published`` build ({} if none)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["achievements"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(path, achievements):
+    data = json.dumps({"format": 1, "achievements": achievements}, indent=2, sort_keys=True) + "\n"
+    write_if_changed(path, data.encode("utf-8"))
+
+
+def diff_manifest(published, current):
+    """
+    Compare two manifests.
+
+    Returns ``(changed, icon_changed, removed)``: ids that are new or differ in
+    any field, the subset whose icon must be re-uploaded, and ids that were
+    published but are gone from the catalogue. The Console matches icon
+    mappings on the title, so a renamed achievement needs its icon again.
+    """
+    changed, icon_changed = set(), set()
+    for aid, entry in current.items():
+        old = published.get(aid)
+        if old == entry:
+            continue
+        changed.add(aid)
+        if old is None or old.get("icon") != entry["icon"] or old.get("title") != entry["title"]:
+            icon_changed.add(aid)
+    return changed, icon_changed, sorted(published.keys() - current.keys())
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the Play Games achievements import ZIP.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="number of worker processes for icon rendering (default: CPU count; 1 = in-process)",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help=f"ZIP (or --preview PNG) to write (default: {ZIP_PATH}, or {DELTA_ZIP_PATH} with --delta)",
+    )
+    parser.add_argument(
+        "--delta", action="store_true",
+        help="only include achievements that are new or changed since the published manifest",
+    )
+    parser.add_argument(
+        "--mark-published", action="store_true",
+        help="record this build's catalogue in the manifest once the ZIP is written",
+    )
+    parser.add_argument(
+        "--preview", action="store_true",
+        help=f"only render a labelled contact sheet of every icon (default: {PREVIEW_PATH}); no CSVs or ZIP",
+    )
+    parser.add_argument("--preview-size", type=int, default=128, help="icon size on the contact sheet")
+    parser.add_argument(
+        "--translations", default=TRANSLATIONS_DIR,
+        help=f"directory of <locale>.json translation tables (default: {TRANSLATIONS_DIR})",
+    )
+    parser.add_argument(
+        "--allow-missing-translations", action="store_true",
+        help="warn about untranslated achievements instead of failing (they get no localized row)",
+    )
+    parser.add_argument(
+        "--localized-icons", nargs="?", const=LOCALIZED_ICONS_DIR, metavar="DIR",
+        help=f"also write each locale's icons with translated tier labels to DIR/<locale>/ "
+             f"(default: {LOCALIZED_ICONS_DIR})",
+    )
+    parser.add_argument(
+        "--variants", nargs="?", const=VARIANTS_DIR, metavar="DIR",
+        help=f"also write locked/dimmed/high-contrast/dark variants of every icon to DIR/<variant>/ "
+             f"(default: {VARIANTS_DIR})",
+    )
+    parser.add_argument(
+        "--variants-format", choices=FORMAT_CHOICES, default="png",
+        help="format of the --variants icons: png, lossless webp, or auto to keep the smallest that doesn't "
+             "decode slower (the import ZIP always stays PNG)",
+    )
+    parser.add_argument(
+        "--near-lossless", action="append", type=near_lossless_rule, default=[], metavar="GLOB=LEVEL",
+        help="also try near-lossless WebP, off by at most LEVEL, for variants matching GLOB "
+             "(names are <variant>/<id>, e.g. 'locked/*=2'; repeatable)",
+    )
+    parser.add_argument(
+        "--quality", choices=list(QUALITY_PRESETS),
+        help=f"supersampling preset (default: draft with --preview, else {DEFAULT_QUALITY})",
+    )
+    parser.add_argument(
+        "--allow-font-substitutes", action="store_true",
+        help="render even if Arial is missing (the text then won't match the committed artwork)",
+    )
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help=f"publish manifest (default: {MANIFEST_PATH})")
+    parser.add_argument(
+        "--write-files", nargs="?", const=OUTPUT_DIR, metavar="DIR",
+        help=f"also write the loose icons and CSVs to DIR (default: {OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        "--optimize-png", action="store_true",
+        help="search for the smallest PNG encoding of each icon and print a size report",
+    )
+    parser.add_argument(
+        "--png-tolerance", type=int, default=0,
+        help="max per-channel error a smaller encoding may introduce (default: 0, pixel exact)",
+    )
+    parser.add_argument(
+        "--png-time-budget", type=float, default=PngOptions().time_budget,
+        help="seconds the optimizer may spend per icon",
+    )
+    parser.add_argument("--timings", action="store_true", help="record per-stage timings and peak memory")
+    parser.add_argument("--profile", action="store_true", help="like --timings, plus a cProfile stats dump")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help=f"where reports go (default: {PROFILE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and don't update the render cache")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help=f"render cache directory (default: {CACHE_DIR})")
+    parser.add_argument(
+        "--cache-size-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="evict least recently used cache entries beyond this size",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with instrument.session("achievements", args.profile_dir, timings=args.timings, profile=args.profile):
+        return build(args)
+
+
+# ── Translations ────────────────────────────────────────────────────────────
+
+def tier_label_fits(label, size=512):
+    """Whether ``label`` fits between the inner ring's edges at the label's height."""
+    bbox = fonts.text_bbox(label, "bold", tier_label_font_size(size))
+    return bbox[2] - bbox[0] <= size * TIER_LABEL_MAX_WIDTH
+
+
+def load_translations(directory=TRANSLATIONS_DIR, achievements=None, allow_missing=False):
+    """
+    The validated translation tables in ``directory``, in locale order.
+
+    Prints warnings and raises TranslationError listing every error (missing
+    translations are only warnings with ``allow_missing``).
+    """
+    achievements = load_catalog() if achievements is None else achievements
+    tables = load_tables(directory)
+    problems = []
+    for table in tables:
+        errors, warnings = validate(table, achievements, tier_label_fits, allow_missing)
+        for warning in warnings:
+            print(f"  Warning: {warning}")
+        problems += errors
+    if problems:
+        raise TranslationError(problems)
+    return tuple(tables)
+
+
+def localized_label(table, tier):
+    """``table``'s label for ``tier``, or None where the icon keeps the English one."""
+    label = table.tiers.get(tier, tier)
+    return None if label == tier else label
+
+
+def icon_prefix_key(achievement, quality=DEFAULT_QUALITY):
+    """Cache key of the English icon's rows above the tier label, as encoded by icon_png_prefix."""
+    return cache_key("prefix", icon_cache_key(achievement, quality=quality))
+
+
+def icon_png_prefix(achievement, quality=DEFAULT_QUALITY):
+    """The English icon's rows above the tier label, deflated once for every locale's variant."""
+    aid, title, desc, tier, theme = achievement
+    icon = create_achievement_icon(aid, title, tier, theme, quality=quality)
+    with instrument.stage("encode", aid):
+        return png_prefix.encode_prefix(icon, tier_label_top(icon.height))
+
+
+def localized_icon_png(achievement, label, png_options=None, quality=DEFAULT_QUALITY, prefix=None):
+    """
+    PNG bytes of ``achievement``'s icon with the tier ``label``.
+
+    With a ``prefix`` from icon_png_prefix (and no size optimisation) only
+    the rows from the label down are encoded.
+    """
+    aid, title, desc, tier, theme = achievement
+    icon = create_achievement_icon(aid, title, tier, theme, quality=quality, label=label)
+    with instrument.stage("encode", aid):
+        data = png_prefix.encode_with_prefix(icon, prefix) if prefix and png_options is None else None
+        return data or encode_png(icon, png_options).data
+
+
+def render_localized_icons(achievements, tables, directory=LOCALIZED_ICONS_DIR, png_options=None,
+                           quality=DEFAULT_QUALITY, cache=None):
+    """
+    Write every icon with each table's tier labels to ``<directory>/<locale>/<id>.png``.
+
+    Rendered in-process so every locale reuses the same tier backgrounds and
+    symbol layers, and each icon's rows above the label are encoded once
+    (and cached) for all locales; only the label rows are redone per locale.
+    An icon whose label is unchanged shares its cache entry with the English
+    icon. Returns the number of icons rendered (not taken from ``cache``).
+    """
+    start = time.perf_counter()
+    counts = {t.locale: [0, 0] for t in tables}  # locale -> [rendered, cached]
+    for a in achievements:
+        prefix = None
+        for table in tables:
+            label = localized_label(table, a[3])
+            key = icon_cache_key(a, png_options=png_options, quality=quality, label=label)
+            png = cache.get(key) if cache else None
+            if png is not None:
+                counts[table.locale][1] += 1
+            else:
+                if label is not None and png_options is None and prefix is None:
+                    prefix = cache.get(icon_prefix_key(a, quality)) if cache else None
+                    if prefix is None:
+                        prefix = icon_png_prefix(a, quality)
+                        if cache:
+                            cache.put(icon_prefix_key(a, quality), prefix)
+                png = localized_icon_png(a, label, png_options, quality, prefix)
+                counts[table.locale][0] += 1
+                if cache:
+                    cache.put(key, png)
+            with instrument.stage("write", table.locale):
+                write_if_changed(os.path.join(directory, table.locale, f"{a[0]}.png"), png)
+    for locale, (rendered, cached) in counts.items():
+        print(f"  {locale}: {rendered} rendered, {cached} cached")
+    print(f"  Localized icons: {len(achievements) * len(tables)} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return sum(rendered for rendered, _ in counts.values())
+
+
+# ── Variants ────────────────────────────────────────────────────────────────
+
+def variant_cache_key(achievement, name, png_options=None, quality=DEFAULT_QUALITY, formats=None):
+    return cache_key("variant", icon_cache_key(achievement, quality=quality), name, VARIANTS[name],
+                     inspect.getsource(variants), png_options, formats, inspect.getsource(encoders))
+
+
+def variant_pngs(name, png_options, image_format, *icon_pngs):
+    """
+    The ``name`` variant of each icon in ``icon_pngs`` (a build target).
+
+    Variants are lossless WebP if ``image_format`` is "webp", else PNG.
+    """
+    batch = stack(Image.open(io.BytesIO(png)) for png in icon_pngs)
+    with instrument.stage("variants", name):
+        derived = derive(batch, (name,))[name]
+    with instrument.stage("encode", name):
+        pngs = tuple(encode_webp(Image.fromarray(icon, "RGBA")) if image_format == "webp"
+                     else encode_png(Image.fromarray(icon, "RGBA"), png_options).data
+                     for icon in derived)
+    return pngs[0] if len(pngs) == 1 else pngs  # a single output is a bare blob
+
+
+def render_variants(achievements, directory=VARIANTS_DIR, names=tuple(VARIANTS), png_options=None,
+                    quality=DEFAULT_QUALITY, cache=None, formats=None):
+    """
+    Write every icon's variants to ``<directory>/<variant>/<id>.png``.
+
+    The icons are drawn once (not at all if every variant is cached) and all
+    variants are derived from them in one batched pass, see
+    ``assetgen.variants``. With ``formats`` (``encoders.FormatOptions``) they
+    may be WebP instead, named ``<id>.webp``. Returns the number of icons drawn.
+    """
+    start = time.perf_counter()
+    formats = formats or FormatOptions(png_options=png_options)
+    format_rows = []
+    keys = {(n, a[0]): variant_cache_key(a, n, png_options, quality, formats) for a in achievements for n in names}
+    pngs = {k: cache.get(key) for k, key in keys.items()} if cache else {}
+    missing = [a for a in achievements if any(pngs.get((n, a[0])) is None for n in names)]
+    if missing:
+        batch = stack(create_achievement_icon(aid, title, tier, theme, quality=quality)
+                      for aid, title, desc, tier, theme in missing)
+        with instrument.stage("variants"):
+            derived = derive(batch, names)
+        for n in names:
+            for i, a in enumerate(missing):
+                if pngs.get((n, a[0])) is None:
+                    with instrument.stage("encode", a[0]):
+                        best, candidates = encode_best(Image.fromarray(derived[n][i], "RGBA"),
+                                                       f"{n}/{a[0]}", formats)
+                    pngs[n, a[0]] = best.data
+                    if len(candidates) > 1:
+                        format_rows.append((f"{n}/{a[0]}", best, candidates))
+                    if cache:
+                        cache.put(keys[n, a[0]], pngs[n, a[0]])
+    with instrument.stage("write"):
+        for (n, aid), data in pngs.items():
+            write_resource(os.path.join(directory, n, aid), data)
+    print(f"  Variants: {', '.join(names)} of {len(achievements)} icons ({len(missing)} drawn) "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    if format_rows:
+        print(format_comparison(format_rows))
+    return len(missing)
+
+
+# ── CSVs and build targets ──────────────────────────────────────────────────
+
+def metadata_csv(achievements, selected):
+    """AchievementsMetadata.csv for the ``selected`` indices into ``achievements``."""
     # Columns (NO header): Name, Description, Incremental value, Steps Needed, Initial State, Points, List Order
-    metadata_buf = io.StringIO()
-    writer = csv.writer(metadata_buf)
-    for i, (aid, title, desc, tier, theme) in enumerate(ACHIEVEMENTS):
+    # List Order is the position in the full catalogue, also in a delta build.
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for i in selected:
+        aid, title, desc, tier, theme = achievements[i]
         points = TIER_POINTS[tier]
         initial_state = "Revealed"
         writer.writerow([title, desc, "False", "", initial_state, points, i + 1])
-    metadata_csv = metadata_buf.getvalue()
-    with open(os.path.join(OUTPUT_DIR, "AchievementsMetadata.csv"), "w", newline="", encoding="utf-8") as f:
-        f.write(metadata_csv)
-    print(f"  AchievementsMetadata.csv ({len(ACHIEVEMENTS)} rows)")
+    return buf.getvalue()
+
 
-    # ── AchievementsLocalizations.csv ───────────────────────────────────
+def localizations_csv(achievements, selected, tables=()):
+    """AchievementsLocalizations.csv: a row per selected achievement per translation table."""
     # Columns (NO header): Name, Localized name, Localized description, locale
-    # Default locale comes from Metadata; this file is for NON-default locales only.
-    # Empty file since we only support the default locale (en-US).
-    with open(os.path.join(OUTPUT_DIR, "AchievementsLocalizations.csv"), "w", newline="", encoding="utf-8") as f:
-        pass  # empty file
-    print(f"  AchievementsLocalizations.csv (empty - default locale only)")
+    # Default locale comes from Metadata; this file is for NON-default locales only,
+    # so it is empty when there are no translation tables.
+    buf = io.StringIO()
+    csv.writer(buf).writerows(localization_rows(achievements, tables, selected))
+    return buf.getvalue()
+
 
-    # ── AchievementsIconsMappings.csv ────────────────────────────────────
+def mappings_csv(achievements, with_icons):
+    """AchievementsIconsMappings.csv for the ``with_icons`` indices into ``achievements``."""
     # Columns (NO header): Name, icon filename
-    mapping_buf = io.StringIO()
-    writer = csv.writer(mapping_buf)
-    for aid, title, desc, tier, theme in ACHIEVEMENTS:
-        writer.writerow([title, icon_filenames[aid]])
-    mapping_csv = mapping_buf.getvalue()
-    with open(os.path.join(OUTPUT_DIR, "AchievementsIconsMappings.csv"), "w", newline="", encoding="utf-8") as f:
-        f.write(mapping_csv)
-    print(f"  AchievementsIconsMappings.csv ({len(ACHIEVEMENTS)} rows)")
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for i in with_icons:
+        aid, title, desc, tier, theme = achievements[i]
+        writer.writerow([title, f"{aid}.png"])
+    return buf.getvalue()
+
+
+def icon_png_bytes(achievement, png_options=None, quality=DEFAULT_QUALITY, label=None):
+    return render_icon_png(achievement, png_options, quality, label).data
+
+
+def zip_blobs(names, *blobs):
+    """The import ZIP holding ``blobs`` under ``names``."""
+    return build_zip(dict(zip(names, blobs)))
+
+
+def targets(achievements=None, output=ZIP_PATH, png_options=None, quality=DEFAULT_QUALITY, files_dir=None,
+            tables=None, localized_dir=None, variants_dir=None, variants_format="png"):
+    """
+    Build-graph targets for every icon, the three CSVs and the import ZIP.
+
+    The icons and CSVs are only kept in memory (and the graph's cache)
+    unless ``files_dir`` is given; the ZIP is written to ``output``.
+    ``tables`` defaults to the validated tables in TRANSLATIONS_DIR; with
+    ``localized_dir`` each locale's icons are targets too, and with
+    ``variants_dir`` each variant (of every icon at once) is a target,
+    written in ``variants_format`` ("png" or "webp", see
+    encoders.TARGET_FORMATS).
+    """
+    from assetgen.graph import Target
+
+    achievements = load_catalog() if achievements is None else achievements
+    tables = load_translations(achievements=achievements) if tables is None else tables
+    indices = list(range(len(achievements)))
+
+    def loose(name):
+        return os.path.join(files_dir, name) if files_dir else None
+
+    result = []
+    for a in achievements:
+        name = f"{a[0]}.png"
+        result.append(Target(f"achievements/{name}", icon_png_bytes, (a, png_options, quality),
+                             key=icon_cache_key(a, png_options=png_options, quality=quality),
+                             outputs=[loose(name)]))
+    for name, fn in (("AchievementsMetadata.csv", metadata_csv),
+                     ("AchievementsIconsMappings.csv", mappings_csv)):
+        result.append(Target(f"achievements/{name}", fn, (achievements, indices),
+                             key=cache_key(inspect.getsource(fn), achievements, TIER_POINTS),
+                             outputs=[loose(name)]))
+    name = "AchievementsLocalizations.csv"
+    result.append(Target(f"achievements/{name}", localizations_csv, (achievements, indices, tables),
+                         key=cache_key(inspect.getsource(localizations_csv), inspect.getsource(localization_rows),
+                                       achievements, tables),
+                         outputs=[loose(name)]))
+    names = [t.name.split("/", 1)[1] for t in result]
+    icon_targets = [t.name for t in result if t.name.endswith(".png")]
+    result.append(Target(f"achievements/{os.path.basename(output)}", zip_blobs, (names,),
+                         deps=[t.name for t in result],
+                         key=cache_key(inspect.getsource(zip_blobs), inspect.getsource(build_zip), names),
+                         outputs=[output]))
+
+    # Each relabelled icon depends on its English icon's encoded top rows, so
+    # adding a locale only encodes the label rows of its icons.
+    prefixes = set()
+    for table in tables if localized_dir else ():
+        for a in achievements:
+            label = localized_label(table, a[3])
+            name = f"{table.locale}/{a[0]}.png"
+            deps = []
+            if label is not None and png_options is None:
+                deps = [f"achievements/prefix/{a[0]}"]
+                if a[0] not in prefixes:
+                    prefixes.add(a[0])
+                    result.append(Target(deps[0], icon_png_prefix, (a, quality), key=icon_prefix_key(a, quality)))
+            result.append(Target(f"achievements/localized/{name}", localized_icon_png,
+                                 (a, label, png_options, quality), deps=deps,
+                                 key=icon_cache_key(a, png_options=png_options, quality=quality, label=label),
+                                 outputs=[os.path.join(localized_dir, name)]))
+
+    ext = target_extension(variants_format) if variants_dir else None
+    for name in VARIANTS if variants_dir else ():
+        result.append(Target(f"achievements/variants/{name}", variant_pngs, (name, png_options, variants_format),
+                             deps=icon_targets,
+                             key=cache_key(inspect.getsource(variant_pngs), inspect.getsource(variants),
+                                           VARIANTS[name], png_options, variants_format),
+                             outputs=[os.path.join(variants_dir, name, a[0] + ext) for a in achievements]))
+    return result
+
+
+def build_preview(args):
+    """Render every achievement small and tile them into one contact sheet, grouped by tier."""
+    achievements = load_catalog()
+    quality = args.quality or "draft"
+    path = args.output or PREVIEW_PATH
+    size = args.preview_size
+    print(f"Previewing {len(achievements)} achievements at {size}px ({quality})...")
+
+    groups = []
+    for tier, colors in TIER_COLORS.items():
+        items = [(title, create_achievement_icon(aid, title, tier, theme, size, quality))
+                 for aid, title, desc, t, theme in achievements if t == tier]
+        if items:
+            groups.append((f"{tier.title()} ({len(items)})", colors["ring"], items))
+    with instrument.stage("sheet"):
+        sheet = contact_sheet(groups, size)
+    with instrument.stage("write"):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        sheet.save(path, compress_level=1)  # a throwaway review image; speed over size
+    print(f"  Contact sheet: {path} ({sheet.width}x{sheet.height})")
+
+
+ZipResult = namedtuple("ZipResult", "path digest changed size size_rows")
+ZipResult.__doc__ = """\
+What build_achievements_zip wrote: the ZIP's path, sha256, whether the file
+changed, its size in bytes and the per-icon (name, before, after, method) rows."""
+
+
+def build_achievements_zip(output, achievements=None, selected=None, with_icons=None, jobs=1,
+                           png_options=None, quality=DEFAULT_QUALITY, cache=None, files_dir=None, tables=()):
+    """
+    Render the icons and CSVs and write the import ZIP to ``output``.
+
+    ``achievements`` defaults to the Achievement.kt catalogue. ``selected``
+    and ``with_icons`` index into it: the achievements to put in the CSVs, and
+    those whose icons to include (both default to all). ``cache`` is an
+    optional RenderCache, ``files_dir`` also writes the loose files there,
+    and ``tables`` are the translation tables for the localizations CSV.
+    """
+    achievements = load_catalog() if achievements is None else achievements
+    selected = list(range(len(achievements))) if selected is None else selected
+    with_icons = selected if with_icons is None else with_icons
+
+    # ── Generate icons ──────────────────────────────────────────────────
+    icon_filenames = {aid: f"{aid}.png" for aid, *_ in achievements}
+    entries = {}
+    keys = {i: icon_cache_key(achievements[i], png_options=png_options, quality=quality)
+            for i in with_icons} if cache else {}
+    size_rows = {}
+    done = 0
+
+    def add_icon(i, png, note=""):
+        nonlocal done
+        done += 1
+        aid, tier = achievements[i][0], achievements[i][3]
+        fname = icon_filenames[aid]
+        entries[fname] = png
+        print(f"  [{done}/{len(with_icons)}] {fname} ({tier}){note}")
+
+    pending = []
+    for i in with_icons:
+        with instrument.stage("cache", achievements[i][0]):
+            png = cache.get(keys[i]) if cache else None
+        if png is None:
+            pending.append(i)
+        else:
+            size_rows[i] = (icon_filenames[achievements[i][0]], None, len(png), "cached")
+            add_icon(i, png, " (cached)")
+
+    jobs = max(1, min(jobs, len(pending)))
+    for j, encoded in render_icons([achievements[i] for i in pending], jobs, png_options, quality, cache):
+        i = pending[j]
+        if cache:
+            with instrument.stage("cache", achievements[i][0]):
+                cache.put(keys[i], encoded.data)
+        size_rows[i] = (icon_filenames[achievements[i][0]], encoded.baseline_size, len(encoded.data),
+                        encoded.method)
+        add_icon(i, encoded.data)
+
+    # ── CSVs ────────────────────────────────────────────────────────────
+    entries["AchievementsMetadata.csv"] = metadata_csv(achievements, selected)
+    print(f"  AchievementsMetadata.csv ({len(selected)} rows)")
+    entries["AchievementsLocalizations.csv"] = localizations_csv(achievements, selected, tables)
+    if tables:
+        rows = sum(1 for _ in localization_rows(achievements, tables, selected))
+        print(f"  AchievementsLocalizations.csv ({rows} rows, {len(tables)} locales)")
+    else:
+        print(f"  AchievementsLocalizations.csv (empty - default locale only)")
+    entries["AchievementsIconsMappings.csv"] = mappings_csv(achievements, with_icons)
+    print(f"  AchievementsIconsMappings.csv ({len(with_icons)} rows)")
+
+    # ── Loose files (optional) ──────────────────────────────────────────
+    if files_dir:
+        os.makedirs(files_dir, exist_ok=True)
+        for name, data in entries.items():
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            with open(os.path.join(files_dir, name), "wb") as f:
+                f.write(data)
+        print(f"  Wrote {len(entries)} files to {files_dir}")
 
     # ── Create ZIP ──────────────────────────────────────────────────────
-    zip_path = os.path.join(os.path.dirname(__file__), "store_assets", "achievements_import.zip")
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        # CSVs
-        zf.write(os.path.join(OUTPUT_DIR, "AchievementsMetadata.csv"), "AchievementsMetadata.csv")
-        zf.write(os.path.join(OUTPUT_DIR, "AchievementsLocalizations.csv"), "AchievementsLocalizations.csv")
-        zf.write(os.path.join(OUTPUT_DIR, "AchievementsIconsMappings.csv"), "AchievementsIconsMappings.csv")
-        # Icons
-        for aid in icon_filenames:
-            fname = icon_filenames[aid]
-            zf.write(os.path.join(OUTPUT_DIR, fname), fname)
-
-    zip_size = os.path.getsize(zip_path)
-    print(f"\n  achievements_import.zip: {zip_size / 1024:.0f} KB ({len(ACHIEVEMENTS)} achievements + 3 CSVs)")
+    # Streamed from memory: PNGs are stored (already deflated), CSVs deflated.
+    with instrument.stage("zip"):
+        zip_bytes = build_zip(entries)
+    with instrument.stage("write"):
+        digest, changed = write_if_changed(output, zip_bytes)
+    return ZipResult(output, digest, changed, len(zip_bytes), [size_rows[i] for i in sorted(size_rows)])
+
+
+def build(args):
+    try:
+        # A preview is only looked at, so a stand-in face just warns.
+        fonts.require_faces(args.allow_font_substitutes or args.preview)
+    except fonts.FontError as e:
+        print(f"  Font error: {e}", file=sys.stderr)
+        return 1
+    if args.preview:
+        build_preview(args)
+        return
+    achievements = load_catalog()
+    zip_path = args.output or (DELTA_ZIP_PATH if args.delta else ZIP_PATH)
+    try:
+        tables = load_translations(args.translations, achievements, args.allow_missing_translations)
+    except TranslationError as e:
+        print("  Translation errors:\n    " + "\n    ".join(e.problems))
+        return 1
+    current = catalog_manifest(achievements, tables) if args.delta or args.mark_published else None
+
+    # Indices into achievements that go into the CSVs, and those that need an icon.
+    selected = list(range(len(achievements)))
+    with_icons = selected
+    if args.delta:
+        changed, icon_changed, removed = diff_manifest(load_manifest(args.manifest), current)
+        selected = [i for i, a in enumerate(achievements) if a[0] in changed]
+        with_icons = [i for i in selected if achievements[i][0] in icon_changed]
+        for aid in removed:
+            print(f"  Warning: {aid!r} was published but is no longer in Achievement.kt "
+                  f"(remove it in the Play Console)")
+        if not selected:
+            print(f"No achievements changed since {args.manifest}; nothing to build.")
+            return
+        print(f"Generating delta ZIP for {len(selected)} of {len(achievements)} achievements "
+              f"({len(with_icons)} icons)...")
+    else:
+        print(f"Generating achievements ZIP for {len(achievements)} achievements...")
+
+    png_options = PngOptions(args.png_tolerance, args.png_time_budget) if args.optimize_png else None
+    cache = None if args.no_cache else RenderCache(args.cache_dir, args.cache_size_mb * 1024 * 1024)
+    result = build_achievements_zip(
+        zip_path, achievements, selected, with_icons, jobs=args.jobs, png_options=png_options,
+        quality=args.quality or DEFAULT_QUALITY, cache=cache, files_dir=args.write_files, tables=tables,
+    )
+    if args.localized_icons and tables:
+        print(f"  Localized icons -> {args.localized_icons}")
+        render_localized_icons(achievements, tables, args.localized_icons, png_options,
+                               args.quality or DEFAULT_QUALITY, cache)
+    if args.variants:
+        print(f"  Icon variants -> {args.variants}")
+        render_variants(achievements, args.variants, png_options=png_options,
+                        quality=args.quality or DEFAULT_QUALITY, cache=cache,
+                        formats=FormatOptions(args.variants_format, args.near_lossless, png_options))
+    if cache:
+        cache.evict()
+        print(f"  Render cache: {cache.summary()}")
+    if png_options and result.size_rows:
+        print("\n  PNG sizes:")
+        print(format_size_report(result.size_rows))
+
+    status = "written" if result.changed else "unchanged"
+    print(f"\n  {os.path.basename(zip_path)}: {result.size / 1024:.0f} KB "
+          f"({len(selected)} achievements, {len(with_icons)} icons + 3 CSVs, {status})")
+    print(f"  sha256: {result.digest}")
+    check = validate_path(zip_path)
+    print(format_report(check))
+
+    if args.mark_published and check.errors:
+        print(f"  Manifest: {args.manifest} not updated (the ZIP failed validation)")
+    elif args.mark_published:
+        # A delta only uploads what changed, so what is live afterwards is the whole catalogue.
+        save_manifest(args.manifest, current)
+        print(f"  Manifest: {args.manifest} ({len(current)} achievements marked published)")
 
     # ── Summary ─────────────────────────────────────────────────────────
-    bronze = sum(1 for a in ACHIEVEMENTS if a[3] == "BRONZE")
-    silver = sum(1 for a in ACHIEVEMENTS if a[3] == "SILVER")
-    gold = sum(1 for a in ACHIEVEMENTS if a[3] == "GOLD")
-    total_points = sum(TIER_POINTS[a[3]] for a in ACHIEVEMENTS)
+    built = [achievements[i] for i in selected]
+    bronze = sum(1 for a in built if a[3] == "BRONZE")
+    silver = sum(1 for a in built if a[3] == "SILVER")
+    gold = sum(1 for a in built if a[3] == "GOLD")
+    total_points = sum(TIER_POINTS[a[3]] for a in built)
     print(f"\n  Summary:")
     print(f"    Bronze: {bronze} ({bronze * 5} pts)")
     print(f"    Silver: {silver} ({silver * 15} pts)")
     print(f"    Gold:   {gold} ({gold * 30} pts)")
-    print(f"    Total:  {len(ACHIEVEMENTS)} achievements, {total_points} points")
+    print(f"    Total:  {len(built)} achievements, {total_points} points")
     print(f"\n  Output: {zip_path}")
+    if check.errors:
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
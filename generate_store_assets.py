@@ -1,11 +1,57 @@
-"""Generate Google Play Store assets: icon (512x512) and feature graphic (1024x500)."""
-
-from PIL import Image, ImageDraw, ImageFont
+"""
+Generate Google Play Store assets: icon (512x512) and feature graphic (1024x500).
+
+With --launcher-icons the app's legacy mipmap launcher icons (square and
+round, mdpi to xxxhdpi) are derived from the same master render as the
+store icon. --res-format webp|auto writes them as lossless (optionally
+near-lossless) WebP, or whichever format is best per icon, and prints a
+size and decode-time comparison (``assetgen.encoders``). The store icon and
+feature graphic are always PNG.
+
+--feature-variants [SPEC] renders only the feature-graphic variants listed in
+a spec file (``assetgen.feature_variants``; default
+store_assets/feature_variants.json) to store_assets/feature_variants/, in
+parallel, with a labelled comparison.png. The gradient, rings and globe
+badge are cached and already downsampled, so each variant only draws and
+resamples its text band and encodes.
+"""
+
+import functools
+import io
 import math
 import os
+import sys
+import time
+from collections import namedtuple
+
+from assetgen import compositing, fonts, gradients, instrument, png_optimize, sdf
+from assetgen.archive import write_if_changed
+from assetgen.compositing import LayerCompositor
+from assetgen.contact_sheet import contact_sheet
+from assetgen.encoders import (FORMAT_CHOICES, FormatOptions, encode_best, encode_webp, format_comparison,
+                               near_lossless_rule, target_extension, write_resource)
+from assetgen.feature_variants import SpecError, load_spec
+from assetgen.gradients import fill_radial_gradient_aa
+from assetgen.lazy import lazy_import
+from assetgen.png_optimize import PngOptions, encode_png, format_size_report
+from assetgen.render_cache import cache_key
+from assetgen.sdf import SdfDraw
+
+PIL = lazy_import("PIL")
+Image = lazy_import("PIL.Image")
+ImageColor = lazy_import("PIL.ImageColor")
+ImageDraw = lazy_import("PIL.ImageDraw")
+# Slow to import and only used by some commands
+inspect = lazy_import("inspect")
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "store_assets")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+RES_DIR = os.path.join(os.path.dirname(__file__), "app", "src", "main", "res")
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), ".profile")
+FEATURE_SPEC_PATH = os.path.join(os.path.dirname(__file__), "store_assets", "feature_variants.json")
+FEATURE_VARIANTS_DIR = os.path.join(os.path.dirname(__file__), "store_assets", "feature_variants")
+
+# Legacy launcher icon size (px) per density bucket
+MIPMAP_SIZES = {"mdpi": 48, "hdpi": 72, "xhdpi": 96, "xxhdpi": 144, "xxxhdpi": 192}
 
 # Colors from the app theme
 TEAL = "#00796B"
@@ -65,154 +111,521 @@ def draw_globe(draw, cx, cy, radius, outline_color, fill_color, line_width=2.5):
     )
 
 
-def draw_question_mark(draw, cx, cy, size, color):
+def draw_question_mark(draw, cx, cy, size, color, shadow_color="#CC7000"):
     """Draw a bold question mark centered at (cx, cy)."""
-    try:
-        font = ImageFont.truetype("arialbd.ttf", int(size))
-    except OSError:
-        try:
-            font = ImageFont.truetype("arial.ttf", int(size))
-        except OSError:
-            font = ImageFont.load_default()
-
     text = "?"
-    bbox = draw.textbbox((0, 0), text, font=font)
+    bbox = fonts.text_bbox(text, "bold", size)
     tw = bbox[2] - bbox[0]
     th = bbox[3] - bbox[1]
     x = cx - tw / 2 - bbox[0]
     y = cy - th / 2 - bbox[1]
-    # Shadow for depth
-    draw.text((x + 2, y + 2), text, fill="#CC7000", font=font)
-    draw.text((x, y), text, fill=color, font=font)
+    # Shadow for depth (2px at the 1024px icon master)
+    shadow = max(1, round(size / 160))
+    fonts.draw_text(draw, (x + shadow, y + shadow), text, shadow_color, "bold", size)
+    fonts.draw_text(draw, (x, y), text, color, "bold", size)
 
 
-def create_icon(size=512):
-    """Create the 512x512 Play Store icon."""
-    # Use supersampling for smoother results
-    ss = 2  # supersample factor
-    s = size * ss
+def render_icon_art(s):
+    """
+    Draw the square, unmasked icon artwork directly on an ``s`` x ``s`` canvas.
+
+    This is the master (1024 px for the 512 px store icon): the globe is
+    anti-aliased as it is drawn, but the question mark is plain hinted text,
+    so callers downsample the result rather than draw it at the final size.
+    """
     img = Image.new("RGBA", (s, s), TEAL)
     draw = ImageDraw.Draw(img)
 
-    # Subtle radial gradient effect - draw concentric circles
+    # Subtle radial gradient effect (teal centre fading to dark teal), centred
+    # where ImageDraw put the inclusive boxes of the original concentric discs
     cx, cy = s // 2, s // 2
-    for i in range(s // 2, 0, -1):
-        t = i / (s // 2)
-        r = int(0 * (1 - t) + 0 * t)
-        g = int(77 * t + 121 * (1 - t))
-        b = int(64 * t + 107 * (1 - t))
-        color = f"#{r:02x}{g:02x}{b:02x}"
-        draw.ellipse([cx - i, cy - i, cx + i, cy + i], fill=color)
-
-    # Rounded square mask for Play Store style
-    radius = s // 2
-    globe_radius = int(s * 0.35)
+    with instrument.stage("gradient", "icon"):
+        fill_radial_gradient_aa(img, cx + 0.5, cy + 0.5, s // 2, TEAL, TEAL_DARK)
 
     # Draw globe
-    draw_globe(draw, cx, cy - int(s * 0.02), globe_radius, TEAL_DARK, WHITE, line_width=s * 0.015)
+    with instrument.stage("globe", "icon"):
+        draw_globe(SdfDraw(img), cx, cy - int(s * 0.02), int(s * 0.35), TEAL_DARK, WHITE, line_width=s * 0.015)
 
     # Draw question mark on the globe
-    draw_question_mark(draw, cx + int(s * 0.02), cy - int(s * 0.02), s * 0.32, ORANGE)
+    with instrument.stage("text", "icon"):
+        draw_question_mark(draw, cx + int(s * 0.02), cy - int(s * 0.02), s * 0.32, ORANGE)
+    return img
 
-    # Downsample
-    img = img.resize((size, size), Image.LANCZOS)
 
-    # Add rounded corners (Play Store icons have ~20% radius)
-    corner_radius = int(size * 0.20)
+def apply_rounded_corners(img, ratio=0.20):
+    """Clip ``img`` to a rounded square (Play Store icons have ~20% radius)."""
+    size = img.width
+    corner_radius = int(size * ratio)
     mask = Image.new("L", (size, size), 0)
     mask_draw = ImageDraw.Draw(mask)
     mask_draw.rounded_rectangle([0, 0, size, size], radius=corner_radius, fill=255)
     img.putalpha(mask)
-
     return img
 
 
-def create_feature_graphic(width=1024, height=500):
-    """Create the 1024x500 feature graphic."""
-    ss = 2
-    w, h = width * ss, height * ss
-    img = Image.new("RGB", (w, h))
-    draw = ImageDraw.Draw(img)
+def create_icon(size=512):
+    """Create the 512x512 Play Store icon."""
+    # Use supersampling for smoother results
+    ss = 2  # supersample factor
+    img = render_icon_art(size * ss)
 
-    # Gradient background (teal dark to teal)
-    for x in range(w):
-        t = x / w
-        r = int(0 * (1 - t) + 0 * t)
-        g = int(64 * (1 - t) + 121 * t)
-        b = int(53 * (1 - t) + 107 * t)
-        draw.line([(x, 0), (x, h)], fill=(r, g, b))
-
-    # Decorative faint globe outlines in background
-    for bx, by, br, alpha in [
-        (w * 0.1, h * 0.15, h * 0.3, 30),
-        (w * 0.85, h * 0.8, h * 0.25, 20),
-        (w * 0.5, h * 0.9, h * 0.15, 15),
-    ]:
-        overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-        ov_draw = ImageDraw.Draw(overlay)
-        ov_draw.ellipse(
-            [int(bx - br), int(by - br), int(bx + br), int(by + br)],
-            outline=(255, 255, 255, alpha), width=int(h * 0.01),
-        )
-        img = Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB")
-        draw = ImageDraw.Draw(img)
-
-    # Main globe on the left side
-    globe_cx = int(w * 0.22)
-    globe_cy = int(h * 0.5)
+    # Downsample
+    with instrument.stage("downsample", "icon"):
+        img = img.resize((size, size), Image.LANCZOS)
+
+    # Add rounded corners
+    with instrument.stage("mask", "icon"):
+        return apply_rounded_corners(img)
+
+
+def icon_pyramid(sizes, master_size=1024):
+    """
+    Render the icon artwork once at ``master_size`` and derive every size in ``sizes``.
+
+    Each level is downsampled from the next larger one rather than from the
+    master, so the whole set costs one render plus a chain of cheap resizes.
+    Returns {size: unmasked RGBA image}.
+    """
+    levels = {}
+    current = render_icon_art(master_size)
+    for size in sorted(set(sizes), reverse=True):
+        with instrument.stage("downsample", f"icon@{size}"):
+            current = current.resize((size, size), Image.LANCZOS)
+        levels[size] = current
+    return levels
+
+
+def _launcher_mask(size, shape):
+    """Anti-aliased launcher mask ("square" = rounded square, "round" = circle)."""
+    ss = 4
+    mask = Image.new("L", (size * ss, size * ss), 0)
+    mask_draw = ImageDraw.Draw(mask)
+    box = [0, 0, size * ss - 1, size * ss - 1]
+    if shape == "round":
+        mask_draw.ellipse(box, fill=255)
+    else:
+        mask_draw.rounded_rectangle(box, radius=int(size * ss * 0.20), fill=255)
+    return mask.resize((size, size), Image.LANCZOS)
+
+
+def create_launcher_icons(store_size=512):
+    """
+    Build the Play Store icon and every legacy launcher mipmap from one master render.
+
+    Returns ``(store_icon, launchers)`` where ``launchers`` maps a path relative
+    to RES_DIR to its image.
+    """
+    levels = icon_pyramid([store_size, *MIPMAP_SIZES.values()], master_size=store_size * 2)
+    store_icon = apply_rounded_corners(levels[store_size].copy())
+    launchers = {}
+    for density, size in MIPMAP_SIZES.items():
+        for name, shape in (("ic_launcher.png", "square"), ("ic_launcher_round.png", "round")):
+            icon = levels[size].copy()
+            icon.putalpha(_launcher_mask(size, shape))
+            launchers[os.path.join(f"mipmap-{density}", name)] = icon
+    return store_icon, launchers
+
+
+# ── Feature graphic ─────────────────────────────────────────────────────────
+
+FeatureStyle = namedtuple("FeatureStyle", "title subtitle accent badge badge_shadow globe")
+FeatureStyle.__doc__ = """\
+Everything a feature-graphic variant can change: the two ``title`` lines,
+the ``subtitle``, the ``accent`` colour of the second title line, the
+question-mark ``badge`` colour and its shadow, and which side the ``globe``
+sits on (a key of GLOBE_PLACEMENTS)."""
+
+DEFAULT_FEATURE = FeatureStyle(("Geography", "Quiz"), "How many countries can you name?",
+                               ORANGE_LIGHT, ORANGE, "#CC7000", "left")
+
+# Globe centre and title left edge per placement, as fractions of the width.
+GLOBE_PLACEMENTS = {"left": (0.22, 0.42), "right": (0.78, 0.06)}
+
+FEATURE_SS = 2
+# Output pixels around the text band that are resampled but not kept: the
+# Lanczos kernel (3 output pixels each side) reaches them from outside the band.
+BAND_MARGIN = 4
+
+
+def feature_style(overrides):
+    """DEFAULT_FEATURE with a variant spec's ``overrides`` (see assetgen.feature_variants)."""
+    overrides = dict(overrides)
+    if "title" in overrides:
+        overrides["title"] = tuple(overrides["title"])
+    if "accent" in overrides and "badge" not in overrides:
+        overrides["badge"] = overrides["accent"]
+    if "badge" in overrides:
+        r, g, b = ImageColor.getrgb(overrides["badge"])[:3]
+        overrides["badge_shadow"] = (round(r * 0.8), round(g * 0.8), round(b * 0.8))
+    return DEFAULT_FEATURE._replace(**overrides)
+
+
+@functools.lru_cache(maxsize=4)
+def feature_background(width, height):
+    """Supersampled gradient and faint decorative rings, shared by every variant of this size."""
+    w, h = width * FEATURE_SS, height * FEATURE_SS
+    # Gradient background (teal dark to teal), built as one array
+    with instrument.stage("gradient", "feature_graphic"):
+        layers = LayerCompositor.with_linear_gradient((w, h), (0, 64, 53), TEAL)
+
+    # Decorative faint globe outlines in background, blended in a single pass
+    with instrument.stage("overlay", "feature_graphic"):
+        for bx, by, br, alpha in [
+            (w * 0.1, h * 0.15, h * 0.3, 30),
+            (w * 0.85, h * 0.8, h * 0.25, 20),
+            (w * 0.5, h * 0.9, h * 0.15, 15),
+        ]:
+            layers.overlay.ellipse(
+                [int(bx - br), int(by - br), int(bx + br), int(by + br)],
+                outline=(255, 255, 255, alpha), width=int(h * 0.01),
+            )
+        return layers.flatten()
+
+
+@functools.lru_cache(maxsize=16)
+def feature_badge(height, badge, badge_shadow):
+    """
+    The globe with its question mark as an RGBA layer, and the layer's centre.
+
+    Everything drawn lands on the opaque globe disc, so pasting the layer
+    gives the same pixels as drawing straight onto the background.
+    """
+    h = height * FEATURE_SS
     globe_r = int(h * 0.35)
-    draw_globe(draw, globe_cx, globe_cy, globe_r, TEAL_DARK, WHITE, line_width=h * 0.012)
-    draw_question_mark(draw, globe_cx + int(h * 0.01), globe_cy, h * 0.28, ORANGE)
+    c = globe_r + int(h * 0.02)
+    layer = Image.new("RGBA", (2 * c + 1, 2 * c + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    with instrument.stage("globe", "feature_graphic"):
+        draw_globe(draw, c, c, globe_r, TEAL_DARK, WHITE, line_width=h * 0.012)
+    with instrument.stage("text", "feature_graphic"):
+        draw_question_mark(draw, c + int(h * 0.01), c, h * 0.28, badge, badge_shadow)
+    return layer, c
+
+
+@functools.lru_cache(maxsize=16)
+def feature_base(width, height, globe, badge, badge_shadow):
+    """
+    Everything but the title text, supersampled and downsampled.
+
+    Returns ``(big, small)``; both are shared, so copy before drawing on them.
+    """
+    big = feature_background(width, height).copy()
+    layer, c = feature_badge(height, badge, badge_shadow)
+    w, h = big.size
+    big.paste(layer, (int(w * GLOBE_PLACEMENTS[globe][0]) - c, int(h * 0.5) - c), layer)
+    with instrument.stage("downsample", "feature_graphic"):
+        return big, big.resize((width, height), Image.LANCZOS)
+
+
+def feature_text(width, height, style):
+    """The title and subtitle as ``(xy, text, fill, face, size)`` in supersampled pixels."""
+    w, h = width * FEATURE_SS, height * FEATURE_SS
+    title_size = int(h * 0.16)
+    subtitle_size = int(h * 0.055)
+    title_x = int(w * GLOBE_PLACEMENTS[style.globe][1])
+    return [
+        ((title_x, int(h * 0.24)), style.title[0], WHITE, "bold", title_size),
+        ((title_x, int(h * 0.44)), style.title[1], style.accent, "bold", title_size),
+        ((title_x, int(h * 0.72)), style.subtitle, "#B2DFDB", "regular", subtitle_size),
+    ]
+
+
+def text_box(ops):
+    """Bounding box of the ``feature_text`` ops (may extend past the canvas)."""
+    boxes = []
+    for (x, y), text, _, face, size in ops:
+        left, top, right, bottom = fonts.text_bbox(text, face, size)
+        boxes.append((int(x) + left, int(y) + top, int(x) + right, int(y) + bottom))
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def create_feature_graphic(width=1024, height=500, style=DEFAULT_FEATURE):
+    """
+    Create the 1024x500 feature graphic, or a variant of it with ``style``.
+
+    The background and globe badge come from per-process caches, already
+    downsampled; only the band holding the text is drawn and resampled again.
+    """
+    big, small = feature_base(width, height, style.globe, style.badge, style.badge_shadow)
+    ops = feature_text(width, height, style)
+
+    # The text band in output pixels, with room for the resampling kernel
+    x0, y0, x1, y1 = text_box(ops)
+    m = BAND_MARGIN
+    band = (max(0, x0 // FEATURE_SS - 2 * m), max(0, y0 // FEATURE_SS - 2 * m),
+            min(width, -(-x1 // FEATURE_SS) + 2 * m), min(height, -(-y1 // FEATURE_SS) + 2 * m))
+    region = big.crop(tuple(v * FEATURE_SS for v in band))
+    draw = ImageDraw.Draw(region)
+    with instrument.stage("text", "feature_graphic"):
+        for (x, y), text, fill, face, size in ops:
+            fonts.draw_text(draw, (x - band[0] * FEATURE_SS, y - band[1] * FEATURE_SS), text, fill, face, size)
+
+    # Downsample the band and keep the part the kernel saw whole
+    with instrument.stage("downsample", "feature_graphic"):
+        region = region.resize((band[2] - band[0], band[3] - band[1]), Image.LANCZOS)
+    keep = (m if band[0] else 0, m if band[1] else 0,
+            region.width - (m if band[2] < width else 0), region.height - (m if band[3] < height else 0))
+    img = small.copy()
+    img.paste(region.crop(keep), (band[0] + keep[0], band[1] + keep[1]))
+    return img
 
-    # App title text
-    try:
-        title_font = ImageFont.truetype("arialbd.ttf", int(h * 0.16))
-    except OSError:
-        title_font = ImageFont.truetype("arial.ttf", int(h * 0.16))
 
-    try:
-        subtitle_font = ImageFont.truetype("arial.ttf", int(h * 0.055))
-    except OSError:
-        subtitle_font = ImageFont.load_default()
+# ── Feature graphic variants ─────────────────────────────────────────────────
+
+# Comparison sheet tile: a feature graphic at 3/8 scale.
+VARIANT_CELL = (384, 188)
+
+
+def feature_variant_png(width, height, style, png_options=None):
+    img = create_feature_graphic(width, height, style)
+    with instrument.stage("encode", "feature_variants"):
+        return encode_png(img, png_options)
 
-    title_x = int(w * 0.42)
 
-    # "Geography" on first line
-    draw.text(
-        (title_x, int(h * 0.24)),
-        "Geography",
-        fill=WHITE, font=title_font,
+def _variant_task(width, height, style, png_options):
+    """Process-pool task: the variant's EncodedPng plus the worker's stage timings."""
+    return feature_variant_png(width, height, style, png_options), instrument.drain()
+
+
+def render_feature_variants(variants, output_dir=FEATURE_VARIANTS_DIR, jobs=1, png_options=None,
+                            width=1024, height=500):
+    """
+    Render each spec ``Variant`` to ``<output_dir>/<name>.png``, plus comparison.png.
+
+    The background and globe badges are built once up front (so forked
+    workers inherit them); each variant then only draws, resamples and
+    encodes its text band. Returns the comparison sheet's path.
+    """
+    styles = [feature_style(v.overrides) for v in variants]
+    for v, style in zip(variants, styles):
+        feature_base(width, height, style.globe, style.badge, style.badge_shadow)
+        x0, y0, x1, y1 = text_box(feature_text(width, height, style))
+        if x0 < 0 or y0 < 0 or x1 > width * FEATURE_SS or y1 > height * FEATURE_SS:
+            print(f"  Warning: {v.name}: text runs off the {width}x{height} canvas")
+
+    if jobs <= 1:
+        encoded = [feature_variant_png(width, height, style, png_options) for style in styles]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs, initializer=instrument.reset,
+                                 initargs=(instrument.enabled(),)) as pool:
+            futures = [pool.submit(_variant_task, width, height, style, png_options) for style in styles]
+            encoded = []
+            for future in futures:
+                png, timings = future.result()
+                instrument.merge(timings)
+                encoded.append(png)
+
+    groups = {}
+    for v, png in zip(variants, encoded):
+        write_if_changed(os.path.join(output_dir, f"{v.name}.png"), png.data)
+        thumb = Image.open(io.BytesIO(png.data))
+        thumb.thumbnail(VARIANT_CELL, Image.LANCZOS)
+        groups.setdefault(v.locale, []).append((v.name, thumb))
+    with instrument.stage("contact_sheet", "feature_variants"):
+        sheet = contact_sheet([(locale, ORANGE_LIGHT, items) for locale, items in groups.items()],
+                              VARIANT_CELL, columns=min(4, max(len(items) for items in groups.values())))
+    sheet_path = os.path.join(output_dir, "comparison.png")
+    save_png(sheet, sheet_path)
+    return sheet_path
+
+
+# ── Build targets ───────────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=None)
+def _renderer_sources():
+    """Source of this script and every library module its renderers use."""
+    return [inspect.getsource(m) for m in (sys.modules[__name__], fonts, compositing, gradients, sdf, png_optimize)]
+
+
+def asset_key(*params):
+    """Content hash of everything that affects a store asset rendered with ``params``."""
+    return cache_key(params, _renderer_sources(), fonts.face_files(), PIL.__version__)
+
+
+def store_icon_png(size=512, png_options=None):
+    return encode_png(create_icon(size), png_options).data
+
+
+def feature_graphic_png(width=1024, height=500, png_options=None):
+    return encode_png(create_feature_graphic(width, height), png_options).data
+
+
+def launcher_icon_pngs(store_size=512, png_options=None, res_format="png"):
+    """
+    The store icon, then each launcher icon in ``launcher_paths()`` order.
+
+    Launcher icons are lossless WebP if ``res_format`` is "webp", else PNG.
+    """
+    icon, launchers = create_launcher_icons(store_size)
+    blobs = [encode_png(icon, png_options).data]
+    for path in launcher_paths():
+        img = launchers[path]
+        blobs.append(encode_webp(img) if res_format == "webp" else encode_png(img, png_options).data)
+    return tuple(blobs)
+
+
+def launcher_paths():
+    """Launcher icon paths relative to RES_DIR, in the order create_launcher_icons builds them."""
+    return [os.path.join(f"mipmap-{density}", name)
+            for density in MIPMAP_SIZES for name in ("ic_launcher.png", "ic_launcher_round.png")]
+
+
+def targets(output_dir=OUTPUT_DIR, res_dir=RES_DIR, launcher_icons=False, png_options=None, res_format="png"):
+    """
+    Build-graph targets for the store icon and feature graphic.
+
+    With ``launcher_icons`` the store icon and every mipmap come from one
+    target, since they share a single master render; the mipmaps are
+    written in ``res_format`` ("png" or "webp", see encoders.TARGET_FORMATS).
+    """
+    from assetgen.graph import Target
+
+    icon_path = os.path.join(output_dir, "play_store_icon_512.png")
+    result = [Target("store/feature_graphic_1024x500.png", feature_graphic_png, (1024, 500, png_options),
+                     key=asset_key("feature_graphic", 1024, 500, png_options),
+                     outputs=[os.path.join(output_dir, "feature_graphic_1024x500.png")])]
+    if launcher_icons:
+        ext = target_extension(res_format)
+        paths = [os.path.splitext(p)[0] + ext for p in launcher_paths()]
+        result.append(Target("store/launcher_icons", launcher_icon_pngs, (512, png_options, res_format),
+                             key=asset_key("launcher_icons", 512, png_options, res_format),
+                             outputs=[icon_path] + [os.path.join(res_dir, p) for p in paths]))
+    else:
+        result.append(Target("store/play_store_icon_512.png", store_icon_png, (512, png_options),
+                             key=asset_key("icon", 512, png_options), outputs=[icon_path]))
+    return result
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the Play Store icon and feature graphic.")
+    parser.add_argument(
+        "--launcher-icons", action="store_true",
+        help="derive the store icon and all mipmap launcher icons from one master render",
     )
-    # "Quiz" on second line
-    draw.text(
-        (title_x, int(h * 0.44)),
-        "Quiz",
-        fill=ORANGE_LIGHT, font=title_font,
+    parser.add_argument(
+        "--res-format", choices=FORMAT_CHOICES, default="png",
+        help="format of the launcher icons: png, lossless webp, or auto to keep the smallest that doesn't "
+             "decode slower (store uploads always stay PNG)",
     )
-
-    # Subtitle
-    draw.text(
-        (title_x, int(h * 0.72)),
-        "How many countries can you name?",
-        fill="#B2DFDB", font=subtitle_font,
+    parser.add_argument(
+        "--near-lossless", action="append", type=near_lossless_rule, default=[], metavar="GLOB=LEVEL",
+        help="also try near-lossless WebP, off by at most LEVEL, for launcher icons matching GLOB "
+             "(e.g. 'mipmap-xxxhdpi/*=2'; repeatable)",
+    )
+    parser.add_argument(
+        "--allow-font-substitutes", action="store_true",
+        help="render even if Arial is missing (the text then won't match the committed artwork)",
+    )
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help=f"where store assets go (default: {OUTPUT_DIR})")
+    parser.add_argument(
+        "--res-dir", default=RES_DIR, help=f"Android res directory for launcher icons (default: {RES_DIR})",
+    )
+    parser.add_argument(
+        "--optimize-png", action="store_true",
+        help="search for the smallest PNG encoding of each asset and print a size report",
     )
+    parser.add_argument(
+        "--png-tolerance", type=int, default=0,
+        help="max per-channel error a smaller encoding may introduce (default: 0, pixel exact)",
+    )
+    parser.add_argument(
+        "--png-time-budget", type=float, default=PngOptions().time_budget,
+        help="seconds the optimizer may spend per asset",
+    )
+    parser.add_argument(
+        "--feature-variants", nargs="?", const=FEATURE_SPEC_PATH, metavar="SPEC",
+        help=f"render only the feature-graphic variants in SPEC and a comparison sheet (default: {FEATURE_SPEC_PATH})",
+    )
+    parser.add_argument(
+        "--variants-dir", default=FEATURE_VARIANTS_DIR,
+        help=f"where --feature-variants output goes (default: {FEATURE_VARIANTS_DIR})",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="worker processes for --feature-variants (default: CPU count; 1 = in-process)",
+    )
+    parser.add_argument("--timings", action="store_true", help="record per-stage timings and peak memory")
+    parser.add_argument("--profile", action="store_true", help="like --timings, plus a cProfile stats dump")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help=f"where reports go (default: {PROFILE_DIR})")
+    return parser.parse_args(argv)
 
-    # Downsample
-    img = img.resize((width, height), Image.LANCZOS)
-    return img
 
+def save_png(img, path, png_options=None):
+    """Encode ``img`` (optionally size-optimised), write it to ``path`` and return the EncodedPng."""
+    with instrument.stage("encode", os.path.basename(path)):
+        encoded = encode_png(img, png_options)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(encoded.data)
+    return encoded
 
-if __name__ == "__main__":
-    print("Generating Play Store icon (512x512)...")
-    icon = create_icon(512)
-    icon_path = os.path.join(OUTPUT_DIR, "play_store_icon_512.png")
-    icon.save(icon_path, "PNG")
+
+def main(argv=None):
+    args = parse_args(argv)
+    with instrument.session("store_assets", args.profile_dir, timings=args.timings, profile=args.profile):
+        return build(args)
+
+
+def build(args):
+    png_options = PngOptions(args.png_tolerance, args.png_time_budget) if args.optimize_png else None
+    if args.feature_variants:
+        try:
+            variants = load_spec(args.feature_variants)
+        except (OSError, SpecError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        # Variants are design previews, not uploads, so a stand-in face only warns.
+        fonts.require_faces(allow_substitutes=True)
+        print(f"Generating {len(variants)} feature graphic variants from {args.feature_variants}...")
+        start = time.perf_counter()
+        sheet_path = render_feature_variants(variants, args.variants_dir, args.jobs, png_options)
+        print(f"  Saved: {len(variants)} variants to {args.variants_dir} "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        print(f"  Comparison sheet: {sheet_path}")
+        return 0
+
+    try:
+        fonts.require_faces(args.allow_font_substitutes)
+    except fonts.FontError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    size_rows = []
+    format_rows = []
+
+    if args.launcher_icons:
+        print("Generating Play Store icon (512x512) and launcher mipmaps from one master...")
+        icon, launchers = create_launcher_icons(512)
+        res_options = FormatOptions(args.res_format, args.near_lossless, png_options)
+        for rel_path, launcher in launchers.items():
+            with instrument.stage("encode", rel_path):
+                if args.res_format == "png":
+                    encoded = encode_png(launcher, png_options)
+                    size_rows.append((rel_path, encoded.baseline_size, len(encoded.data), encoded.method))
+                    data = encoded.data
+                else:
+                    best, candidates = encode_best(launcher, rel_path, res_options)
+                    format_rows.append((rel_path, best, candidates))
+                    data = best.data
+            # Replaces the same icon in another format, which Android would reject as a duplicate
+            path = write_resource(os.path.splitext(os.path.join(args.res_dir, rel_path))[0], data)
+            print(f"  Saved: {path} ({launcher.width}x{launcher.height})")
+    else:
+        print("Generating Play Store icon (512x512)...")
+        icon = create_icon(512)
+    icon_path = os.path.join(args.output_dir, "play_store_icon_512.png")
+    encoded = save_png(icon, icon_path, png_options)
+    size_rows.append((os.path.basename(icon_path), encoded.baseline_size, len(encoded.data), encoded.method))
     print(f"  Saved: {icon_path}")
 
     print("Generating feature graphic (1024x500)...")
     feature = create_feature_graphic(1024, 500)
-    feature_path = os.path.join(OUTPUT_DIR, "feature_graphic_1024x500.png")
-    feature.save(feature_path, "PNG")
+    feature_path = os.path.join(args.output_dir, "feature_graphic_1024x500.png")
+    encoded = save_png(feature, feature_path, png_options)
+    size_rows.append((os.path.basename(feature_path), encoded.baseline_size, len(encoded.data), encoded.method))
     print(f"  Saved: {feature_path}")
 
     # Verify sizes
@@ -221,4 +634,16 @@ if __name__ == "__main__":
         img = Image.open(path)
         print(f"  {os.path.basename(path)}: {img.size[0]}x{img.size[1]}, {size_kb:.0f} KB")
 
-    print("\nDone! Files in:", OUTPUT_DIR)
+    if png_options:
+        print("\n  PNG sizes:")
+        print(format_size_report(size_rows))
+    if format_rows:
+        print("\n  Launcher icon formats:")
+        print(format_comparison(format_rows))
+
+    print("\nDone! Files in:", args.output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
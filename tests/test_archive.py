@@ -0,0 +1,49 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+from assetgen.archive import FIXED_DATE_TIME, build_zip, write_if_changed
+
+ENTRIES = {"b.png": b"\x89PNG fake", "a.csv": "Name,Café\n", "c/d.csv": "x\n" * 100}
+
+
+class BuildZipTest(unittest.TestCase):
+    def test_insertion_order_does_not_matter(self):
+        reordered = dict(reversed(list(ENTRIES.items())))
+        self.assertEqual(build_zip(ENTRIES), build_zip(reordered))
+
+    def test_entries(self):
+        with zipfile.ZipFile(io.BytesIO(build_zip(ENTRIES))) as zf:
+            self.assertEqual(zf.namelist(), sorted(ENTRIES))
+            self.assertEqual(zf.read("a.csv"), "Name,Café\n".encode("utf-8"))
+            for info in zf.infolist():
+                self.assertEqual(info.date_time, FIXED_DATE_TIME)
+                self.assertEqual((info.create_system, info.external_attr >> 16), (3, 0o644))
+            # Already-compressed payloads are stored, text is deflated.
+            self.assertEqual(zf.getinfo("b.png").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.getinfo("c/d.csv").compress_type, zipfile.ZIP_DEFLATED)
+            self.assertIsNone(zf.testzip())
+
+    def test_content_change_changes_bytes(self):
+        self.assertNotEqual(build_zip(ENTRIES), build_zip(dict(ENTRIES, **{"a.csv": "Name,Cafe\n"})))
+
+
+class WriteIfChangedTest(unittest.TestCase):
+    def test_unchanged_file_is_left_alone(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sub", "out.zip")
+            digest, changed = write_if_changed(path, b"one")
+            self.assertTrue(changed)
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(write_if_changed(path, b"one"), (digest, False))
+            self.assertEqual(os.stat(path).st_mtime_ns, 0)
+            self.assertTrue(write_if_changed(path, b"two")[1])
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"two")
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["out.zip"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image, ImageDraw
+
+import generate_achievements_zip as achievements
+from assetgen.display_list import FORMAT, DisplayList
+from assetgen.render_cache import RenderCache
+
+
+def rasterise(recording, scale=0.5):
+    mask = Image.new("L", (300, 300), 0)
+    recording.replay(ImageDraw.Draw(mask), scale)
+    return mask.tobytes()
+
+
+class SerialisationTest(unittest.TestCase):
+    def test_round_trip_replays_identically(self):
+        # The letter symbol records text too; JSON turns its tuples into lists.
+        for theme in ("compass", "letter", "rainbow"):
+            with self.subTest(theme=theme):
+                recording = achievements.symbol_display_list(theme)
+                loaded = DisplayList.loads(recording.dumps())
+                self.assertEqual(len(loaded), len(recording))
+                self.assertEqual(rasterise(loaded), rasterise(recording))
+
+    def test_other_format_rejected(self):
+        data = DisplayList([["line", [0, 0, 1, 1], 255, 1, None]]).dumps().replace(
+            f'"format":{FORMAT}'.encode(), f'"format":{FORMAT + 1}'.encode())
+        with self.assertRaises(ValueError):
+            DisplayList.loads(data)
+
+
+class SymbolCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = RenderCache(tmp.name)
+        # Start each lookup from an empty in-process memo.
+        patch = mock.patch.object(achievements, "_symbol_lists", {})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_recording_is_stored_then_loaded(self):
+        recorded = achievements.symbol_display_list("globe", self.cache)
+        self.assertEqual((self.cache.misses, self.cache.writes), (1, 1))
+        achievements._symbol_lists.clear()
+        loaded = achievements.symbol_display_list("globe", self.cache)
+        self.assertIsNot(loaded, recorded)
+        self.assertEqual((self.cache.hits, self.cache.writes), (1, 1))
+        self.assertEqual(rasterise(loaded), rasterise(recorded))
+
+    def test_memo_wins_over_cache(self):
+        first = achievements.symbol_display_list("star", self.cache)
+        self.assertIs(achievements.symbol_display_list("star", self.cache), first)
+        self.assertEqual(self.cache.hits + self.cache.misses, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from assetgen import fonts
+
+
+class RequireFacesTest(unittest.TestCase):
+    def use_fonts(self, *names):
+        """Make ``names`` (empty files) the only fonts on the search path."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for name in names:
+            open(os.path.join(tmp.name, name), "wb").close()
+        patch = mock.patch.object(fonts, "font_search_path", return_value=[tmp.name])
+        patch.start()
+        self.addCleanup(patch.stop)
+        for cached in (fonts._font_index, fonts.resolve_face):
+            cached.cache_clear()
+            self.addCleanup(cached.cache_clear)
+        return tmp.name
+
+    def test_arial_installed(self):
+        directory = self.use_fonts("arial.ttf", "ARIALBD.TTF")
+        self.assertEqual(fonts.resolve_face("bold"), os.path.join(directory, "ARIALBD.TTF"))
+        self.assertEqual(fonts.substituted_faces(), [])
+        fonts.require_faces()
+
+    def test_substitute_is_an_error(self):
+        self.use_fonts("arial.ttf", "DejaVuSans-Bold.ttf")
+        self.assertEqual(fonts.substituted_faces(), ["bold"])
+        with self.assertRaisesRegex(fonts.FontError, "arialbd.ttf not found"):
+            fonts.require_faces()
+
+    def test_bold_falling_back_to_regular_arial_is_a_substitute(self):
+        self.use_fonts("arial.ttf")
+        self.assertEqual(fonts.substituted_faces(), ["bold"])
+
+    def test_allowed_substitutes_warn(self):
+        self.use_fonts()
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            fonts.require_faces(allow_substitutes=True)
+        self.assertIn("WARNING", stderr.getvalue())
+        self.assertIn(fonts.BUILTIN_FONT, stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+import generate_achievements_zip as achievements
+import generate_store_assets as store
+from assetgen import encoders
+
+CATALOG = [("first_steps", "First Steps", "Complete any quiz", "BRONZE", "star"),
+           ("world_traveler", "World Traveler", "Complete the All Countries quiz", "GOLD", "globe")]
+
+
+def png_bytes(size=16):
+    buf = io.BytesIO()
+    Image.new("RGBA", (size, size), (200, 120, 40, 255)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+class LauncherFormatTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.res_dir = tmp.name
+
+    def launcher_target(self, res_format):
+        targets = store.targets(tempfile.gettempdir(), self.res_dir, launcher_icons=True, res_format=res_format)
+        return next(t for t in targets if t.name == "store/launcher_icons")
+
+    def check(self, res_format, ext):
+        target = self.launcher_target(res_format)
+        icon_path, *launchers = target.outputs
+        self.assertTrue(icon_path.endswith(".png"))
+        self.assertEqual({os.path.splitext(p)[1] for p in launchers}, {ext})
+        icon, *blobs = target.fn(*target.args)
+        self.assertEqual(encoders.extension(icon), ".png")
+        self.assertEqual({encoders.extension(b) for b in blobs}, {ext})
+
+    def test_png(self):
+        self.check("png", ".png")
+
+    def test_webp(self):
+        self.check("webp", ".webp")
+
+    def test_format_ignores_files_on_disk(self):
+        # A WebP already in the res dir must not switch a PNG build to WebP.
+        stem = os.path.splitext(os.path.join(self.res_dir, store.launcher_paths()[0]))[0]
+        os.makedirs(os.path.dirname(stem), exist_ok=True)
+        open(stem + ".webp", "wb").close()
+        self.assertTrue(all(p.endswith(".png") for p in self.launcher_target("png").outputs))
+
+    def test_key_depends_on_format(self):
+        self.assertNotEqual(self.launcher_target("png").key, self.launcher_target("webp").key)
+
+    def test_auto_is_rejected(self):
+        with self.assertRaises(ValueError):
+            store.targets(launcher_icons=True, res_format="auto")
+
+
+class VariantFormatTest(unittest.TestCase):
+    def variant_targets(self, variants_format):
+        targets = achievements.targets(CATALOG, output=os.path.join(tempfile.gettempdir(), "import.zip"), tables=[],
+                                       variants_dir=tempfile.gettempdir(), variants_format=variants_format)
+        return [t for t in targets if t.name.startswith("achievements/variants/")]
+
+    def check(self, variants_format, ext):
+        targets = self.variant_targets(variants_format)
+        self.assertEqual(len(targets), len(achievements.VARIANTS))
+        icons = [png_bytes() for _ in CATALOG]
+        for target in targets:
+            self.assertEqual({os.path.splitext(p)[1] for p in target.outputs}, {ext})
+            blobs = target.fn(*target.args, *icons)
+            self.assertEqual({encoders.extension(b) for b in blobs}, {ext})
+
+    def test_png(self):
+        self.check("png", ".png")
+
+    def test_webp(self):
+        self.check("webp", ".webp")
+
+    def test_auto_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.variant_targets("auto")
+
+
+class RemoveOtherFormatsTest(unittest.TestCase):
+    def test_removes_only_image_siblings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("icon.png", "icon.webp", "data.csv", "data.png"):
+                open(os.path.join(directory, name), "wb").close()
+            encoders.remove_other_formats(os.path.join(directory, "icon.webp"))
+            encoders.remove_other_formats(os.path.join(directory, "data.csv"))
+            self.assertEqual(sorted(os.listdir(directory)), ["data.csv", "data.png", "icon.webp"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from assetgen import gradients
+
+RED, BLUE = (255, 0, 0), (0, 0, 255)
+
+
+class GradientTest(unittest.TestCase):
+    def test_linear_gradient_ramps_across_width(self):
+        px = np.asarray(gradients.linear_gradient((64, 4), RED, BLUE))
+        self.assertEqual(tuple(px[0, 0]), RED)
+        self.assertTrue((np.diff(px[0, :, 2].astype(int)) >= 0).all())
+        self.assertTrue((px == px[:1]).all())
+
+    def test_vertical_gradient_and_mode(self):
+        img = gradients.linear_gradient((4, 64), RED, BLUE, horizontal=False, mode="RGBA")
+        self.assertEqual(img.mode, "RGBA")
+        self.assertEqual(img.getpixel((0, 0)), RED + (255,))
+        self.assertEqual(img.getpixel((0, 0)), img.getpixel((3, 0)))
+
+    def test_radial_array_centre_and_mask(self):
+        rgb, mask = gradients.radial_gradient_array(41, 41, 20, 20, 20, RED, BLUE)
+        self.assertEqual(rgb.shape, (41, 41, 3))
+        self.assertTrue(mask[20, 20] and mask[20, 0])
+        self.assertFalse(mask[0, 0])
+        self.assertGreater(rgb[20, 20, 0], rgb[20, 2, 0])
+
+    def test_fill_radial_gradient_aa(self):
+        img = Image.new("RGBA", (48, 48), (0, 0, 0, 0))
+        gradients.fill_radial_gradient_aa(img, 24, 24, 20, RED, BLUE)
+        alpha = np.asarray(img)[:, :, 3]
+        self.assertEqual((alpha[24, 24], alpha[0, 0]), (255, 0))
+        # The edge is anti-aliased rather than stepped.
+        self.assertTrue(((alpha > 0) & (alpha < 255)).any())
+        self.assertAlmostEqual(alpha.sum() / 255, np.pi * 20 ** 2, delta=2)
+
+    def test_extent_cuts_the_disc(self):
+        full, cut = (Image.new("RGB", (48, 48)) for _ in range(2))
+        gradients.fill_radial_gradient_aa(full, 24, 24, 20, RED, BLUE)
+        gradients.fill_radial_gradient_aa(cut, 24, 24, 20, RED, BLUE, extent=15)
+        self.assertEqual(cut.getpixel((24, 6)), (0, 0, 0))
+        self.assertNotEqual(full.getpixel((24, 6)), (0, 0, 0))
+        self.assertEqual(cut.getpixel((24, 24)), full.getpixel((24, 24)))
+
+
+if __name__ == "__main__":
+    unittest.main()
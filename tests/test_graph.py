@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from assetgen.graph import BuildError, BuildGraph, Target, load_state
+from assetgen.render_cache import RenderCache
+
+CALLS = []
+
+
+def make_text(text):
+    CALLS.append(text)
+    return text.encode()
+
+
+def join_blobs(*blobs):
+    CALLS.append("join")
+    return b"+".join(blobs)
+
+
+def explode():
+    raise ValueError("boom")
+
+
+class BuildGraphTest(unittest.TestCase):
+    def setUp(self):
+        CALLS.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.state = os.path.join(self.dir, "state.json")
+        self.out = os.path.join(self.dir, "out.txt")
+
+    def graph(self, a="a"):
+        return BuildGraph([
+            Target("join", join_blobs, deps=("a", "b"), outputs=(self.out,)),
+            Target("a", make_text, (a,)),
+            Target("b", make_text, ("b",)),
+        ])
+
+    def run_graph(self, graph, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return graph.run(state_path=self.state, **kwargs)
+
+    def test_order_and_output(self):
+        graph = self.graph()
+        self.assertLess(graph.order.index("a"), graph.order.index("join"))
+        report = self.run_graph(graph)
+        self.assertEqual(sorted(report.built), ["a", "b", "join"])
+        with open(self.out, "rb") as f:
+            self.assertEqual(f.read(), b"a+b")
+        self.assertIn("join", load_state(self.state))
+
+    def test_up_to_date_targets_are_skipped(self):
+        self.run_graph(self.graph())
+        CALLS.clear()
+        report = self.run_graph(self.graph())
+        self.assertEqual((report.built, CALLS), ([], []))
+        self.assertEqual(sorted(report.skipped), ["a", "b", "join"])
+
+    def test_changed_input_rebuilds_dependents(self):
+        cache = RenderCache(os.path.join(self.dir, "cache"))
+        self.run_graph(self.graph(), cache=cache)
+        CALLS.clear()
+        report = self.run_graph(self.graph("A"), cache=cache)
+        # b's blob comes from the cache; only a and what depends on it run.
+        self.assertEqual(sorted(report.built), ["a", "join"])
+        self.assertEqual(sorted(CALLS), ["A", "join"])
+        with open(self.out, "rb") as f:
+            self.assertEqual(f.read(), b"A+b")
+
+    def test_deleted_output_is_restored_from_cache(self):
+        cache = RenderCache(os.path.join(self.dir, "cache"))
+        self.run_graph(self.graph(), cache=cache)
+        os.remove(self.out)
+        CALLS.clear()
+        report = self.run_graph(self.graph(), cache=cache)
+        self.assertEqual((report.built, report.restored, CALLS), ([], ["join"], []))
+        self.assertTrue(os.path.exists(self.out))
+
+    def test_failure_skips_dependents(self):
+        graph = BuildGraph([Target("bad", explode), Target("after", join_blobs, deps=("bad",), outputs=(self.out,)),
+                            Target("ok", make_text, ("ok",), outputs=(os.path.join(self.dir, "ok.txt"),))])
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaisesRegex(BuildError, "after, bad"):
+            self.run_graph(graph)
+        self.assertFalse(os.path.exists(self.out))
+        self.assertEqual(list(load_state(self.state)), ["ok"])
+
+    def test_malformed_graphs(self):
+        with self.assertRaisesRegex(BuildError, "duplicate"):
+            BuildGraph([Target("a", make_text, ("a",)), Target("a", make_text, ("b",))])
+        with self.assertRaisesRegex(BuildError, "unknown targets: c"):
+            BuildGraph([Target("a", join_blobs, deps=("c",))])
+        with self.assertRaisesRegex(BuildError, "cycle"):
+            BuildGraph([Target("a", join_blobs, deps=("b",)), Target("b", join_blobs, deps=("a",))])
+
+
+if __name__ == "__main__":
+    unittest.main()
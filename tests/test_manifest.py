@@ -0,0 +1,77 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import generate_achievements_zip as achievements
+from assetgen.validate import Report
+
+CATALOG = [("first_steps", "First Steps", "Complete any quiz", "BRONZE", "star"),
+           ("world_traveler", "World Traveler", "Complete the All Countries quiz", "GOLD", "globe")]
+
+
+def entry(title="First Steps", description="Complete any quiz", icon="icon-key"):
+    return {"title": title, "description": description, "tier": "BRONZE", "points": 5, "order": 1, "icon": icon}
+
+
+class DiffManifestTest(unittest.TestCase):
+    def test_unchanged(self):
+        self.assertEqual(achievements.diff_manifest({"a": entry()}, {"a": entry()}), (set(), set(), []))
+
+    def test_new_and_removed(self):
+        changed, icon_changed, removed = achievements.diff_manifest({"old": entry()}, {"new": entry()})
+        self.assertEqual((changed, icon_changed, removed), ({"new"}, {"new"}, ["old"]))
+
+    def test_description_change_keeps_icon(self):
+        changed, icon_changed, _ = achievements.diff_manifest({"a": entry()}, {"a": entry(description="Finish a quiz")})
+        self.assertEqual((changed, icon_changed), ({"a"}, set()))
+
+    def test_icon_change(self):
+        changed, icon_changed, _ = achievements.diff_manifest({"a": entry()}, {"a": entry(icon="other-key")})
+        self.assertEqual((changed, icon_changed), ({"a"}, {"a"}))
+
+    def test_title_change_remaps_icon(self):
+        # Icon mappings are matched on the title, so a renamed row needs one.
+        changed, icon_changed, _ = achievements.diff_manifest({"a": entry()}, {"a": entry(title="Baby Steps")})
+        self.assertEqual((changed, icon_changed), ({"a"}, {"a"}))
+
+    def test_title_change_in_delta_mappings(self):
+        catalog = [("a", "Baby Steps", "Complete any quiz", "BRONZE", "star"),
+                   ("b", "Globetrotter", "Complete the All Countries quiz", "GOLD", "globe")]
+        published = {"a": entry(), "b": entry("Globetrotter", "Complete the All Countries quiz")}
+        current = {"a": entry("Baby Steps"), "b": published["b"]}
+        _, icon_changed, _ = achievements.diff_manifest(published, current)
+        with_icons = [i for i, a in enumerate(catalog) if a[0] in icon_changed]
+        self.assertEqual(achievements.mappings_csv(catalog, with_icons).splitlines(), ["Baby Steps,a.png"])
+
+
+
+class MarkPublishedTest(unittest.TestCase):
+    def build(self, errors):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        manifest = os.path.join(tmp.name, "published.json")
+        args = achievements.parse_args(["--mark-published", "--manifest", manifest, "--no-cache", "-j", "1",
+                                        "-o", os.path.join(tmp.name, "out.zip"), "--allow-font-substitutes"])
+        report = Report(args.output, errors, [], len(CATALOG), len(CATALOG), 0, 35)
+        with mock.patch.object(achievements, "load_catalog", return_value=CATALOG), \
+                mock.patch.object(achievements, "load_translations", return_value={}), \
+                mock.patch.object(achievements, "validate_path", return_value=report), \
+                contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            status = achievements.build(args)
+        return status, achievements.load_manifest(manifest)
+
+    def test_valid_zip_is_marked_published(self):
+        status, published = self.build(errors=[])
+        self.assertFalse(status)
+        self.assertEqual(sorted(published), ["first_steps", "world_traveler"])
+
+    def test_invalid_zip_leaves_manifest_alone(self):
+        status, published = self.build(errors=["achievements.csv: bad row"])
+        self.assertEqual((status, published), (1, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
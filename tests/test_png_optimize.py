@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from assetgen import png_optimize
+from assetgen.png_optimize import PngOptions, encode_png, max_error
+
+
+def gradient(alpha=255):
+    ys, xs = np.mgrid[0:96, 0:96]
+    rgba = np.stack([xs * 2, ys * 2, (xs + ys), np.full_like(xs, alpha)], axis=2).astype(np.uint8)
+    return Image.fromarray(rgba, "RGBA")
+
+
+class EncodePngTest(unittest.TestCase):
+    def check(self, img, options=PngOptions()):
+        encoded = encode_png(img, options)
+        self.assertLessEqual(len(encoded.data), encoded.baseline_size)
+        self.assertLessEqual(max_error(np.asarray(img.convert("RGBA")), encoded.data), options.tolerance)
+        return encoded
+
+    def test_without_options_is_a_plain_save(self):
+        encoded = encode_png(gradient(), None)
+        self.assertEqual((len(encoded.data), encoded.method), (encoded.baseline_size, "default"))
+
+    def test_opaque_alpha_dropped(self):
+        self.assertTrue(self.check(gradient()).method.startswith("rgb"))
+
+    def test_few_colours_become_a_palette(self):
+        img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+        img.paste((200, 120, 40, 255), (8, 8, 56, 56))
+        self.assertTrue(self.check(img).method.startswith("palette"))
+
+    def test_strategy_search_never_loses(self):
+        img = gradient(alpha=200)
+        optimised = png_optimize._save(img, optimize=True)
+        encoded = self.check(img)
+        self.assertLessEqual(len(encoded.data), len(optimised))
+        self.assertIn(encoded.method.split(", zlib ")[-1], {"as-is", *png_optimize.ZLIB_STRATEGIES})
+
+    def test_quantized_only_with_a_tolerance(self):
+        img = gradient(alpha=200)
+        self.assertNotIn("quantized", self.check(img).method)
+        self.check(img, PngOptions(tolerance=16))
+
+    def test_spent_budget_keeps_the_baseline(self):
+        encoded = self.check(gradient(), PngOptions(time_budget=0))
+        self.assertEqual(encoded.method, "default")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from assetgen.render_cache import RenderCache, cache_key
+
+
+class CacheKeyTest(unittest.TestCase):
+    def test_stable_and_order_sensitive(self):
+        self.assertEqual(cache_key("a", {"y": 1, "x": 2}), cache_key("a", {"x": 2, "y": 1}))
+        self.assertNotEqual(cache_key("a", "b"), cache_key("b", "a"))
+        # Parts are length-prefixed, so they can't run into each other.
+        self.assertNotEqual(cache_key("ab", "c"), cache_key("a", "bc"))
+        self.assertNotEqual(cache_key(b"x"), cache_key("x"))
+
+
+class RenderCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def test_get_put_counters(self):
+        cache = RenderCache(self.dir)
+        key = cache_key("icon")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, b"png")
+        self.assertEqual(cache.get(key), b"png")
+        self.assertEqual((cache.hits, cache.misses, cache.writes), (1, 1, 1))
+        self.assertEqual(RenderCache(self.dir).get(key), b"png")
+
+    def test_evict_drops_least_recently_used(self):
+        cache = RenderCache(self.dir, max_bytes=250)
+        keys = [cache_key(i) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, bytes(100))
+            os.utime(cache._path(key), ns=(i, i))
+        cache.get(keys[0])  # touching an entry makes it the most recent
+        self.assertEqual(cache.evict(), 200)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
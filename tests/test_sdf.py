@@ -0,0 +1,62 @@
+import math
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from assetgen import sdf
+
+WHITE = (255, 255, 255, 255)
+
+
+def canvas(size):
+    return Image.new("RGBA", size, (0, 0, 0, 0))
+
+
+def alpha(img):
+    return np.asarray(img)[:, :, 3]
+
+
+class SdfDrawTest(unittest.TestCase):
+    def test_disc_coverage_matches_area(self):
+        img = canvas((64, 64))
+        sdf.SdfDraw(img).ellipse((12, 12, 51, 51), fill=WHITE)
+        px = alpha(img).astype(np.float64)
+        self.assertAlmostEqual(px.sum() / 255, math.pi * 20 ** 2, delta=2)
+        self.assertEqual((px[32, 32], px[32, 11], px[32, 52]), (255, 0, 0))
+        # ImageDraw's inclusive box: the edge pixels are covered on both sides alike.
+        self.assertEqual(px[32, 12], px[32, 51])
+        self.assertEqual(px[12, 32], px[51, 32])
+
+    def test_scale_matches_drawing_at_size(self):
+        small, large = canvas((32, 32)), canvas((64, 64))
+        sdf.SdfDraw(small, scale=2).ellipse((6, 6, 25, 25), outline=WHITE, width=3)
+        sdf.SdfDraw(large).ellipse((12, 12, 51, 51), outline=WHITE, width=6)
+        # Scaling draws beyond a small canvas; compare the quarter both contain.
+        self.assertEqual(int(alpha(small).sum()), int(alpha(large.crop((0, 0, 32, 32))).sum()))
+
+    def test_ring_leaves_centre_untouched(self):
+        img = canvas((40, 40))
+        sdf.SdfDraw(img).ellipse((0, 0, 39, 39), outline=(255, 0, 0, 255), width=4)
+        self.assertEqual(img.getpixel((20, 20)), (0, 0, 0, 0))
+        self.assertEqual(img.getpixel((2, 20)), (255, 0, 0, 255))
+
+    def test_arc_covers_only_its_sweep(self):
+        img = canvas((40, 40))
+        sdf.SdfDraw(img).arc((0, 0, 39, 39), 0, 90, fill=WHITE, width=4)
+        # Angles run clockwise from 3 o'clock, so 0-90 is the bottom-right quarter.
+        self.assertEqual(img.getpixel((20, 37))[3], 255)
+        self.assertEqual(img.getpixel((37, 20))[3], 255)
+        self.assertEqual(img.getpixel((20, 2))[3], 0)
+        self.assertEqual(img.getpixel((2, 20))[3], 0)
+
+    def test_horizontal_line(self):
+        img = canvas((20, 10))
+        sdf.SdfDraw(img).line([(2, 4), (17, 4)], fill=WHITE, width=3)
+        px = alpha(img)
+        self.assertTrue((px[3:6, 3:17] == 255).all())
+        self.assertEqual(px[0].sum() + px[8:].sum(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
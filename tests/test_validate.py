@@ -0,0 +1,102 @@
+import io
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+import generate_achievements_zip as achievements
+from assetgen.archive import build_zip
+from assetgen.validate import LOCALIZATIONS_CSV, MAPPINGS_CSV, METADATA_CSV, validate_path
+
+CATALOG = [("first_steps", "First Steps", "Complete any quiz", "BRONZE", "star"),
+           ("world_traveler", "World Traveler", "Complete the All Countries quiz", "GOLD", "globe")]
+
+
+def png(size=(512, 512)):
+    buf = io.BytesIO()
+    Image.new("RGBA", size, (0, 0, 0, 0)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def entries(**overrides):
+    """A valid import archive's entries, with ``overrides`` applied (None removes an entry)."""
+    selected = list(range(len(CATALOG)))
+    result = {
+        METADATA_CSV: achievements.metadata_csv(CATALOG, selected),
+        LOCALIZATIONS_CSV: "First Steps,Erste Schritte,Beende ein Quiz,de-DE\n",
+        MAPPINGS_CSV: achievements.mappings_csv(CATALOG, selected),
+        "first_steps.png": png(),
+        "world_traveler.png": png(),
+    }
+    result.update({name.replace("__", "."): data for name, data in overrides.items()})
+    return {name: data for name, data in result.items() if data is not None}
+
+
+class ValidatePathTest(unittest.TestCase):
+    def validate(self, **overrides):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "import.zip")
+        with open(path, "wb") as f:
+            f.write(build_zip(entries(**overrides)))
+        return validate_path(path)
+
+    def assertError(self, report, text):
+        self.assertTrue(any(text in e for e in report.errors), report.errors)
+
+    def test_valid_archive(self):
+        report = self.validate()
+        self.assertEqual((report.errors, report.warnings), ([], []))
+        self.assertEqual((report.achievements, report.icons, report.localizations, report.points), (2, 2, 1, 35))
+
+    def test_loose_files_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, data in entries().items():
+                with open(os.path.join(tmp, name), "wb") as f:
+                    f.write(data.encode("utf-8") if isinstance(data, str) else data)
+            report = validate_path(tmp)
+        self.assertEqual((report.errors, report.icons), ([], 2))
+
+    def test_wrong_icon_size(self):
+        self.assertError(self.validate(first_steps__png=png((256, 256))), "first_steps.png: 256x256")
+
+    def test_icon_not_a_png(self):
+        self.assertError(self.validate(first_steps__png=b"GIF89a" + bytes(40)), "first_steps.png: not a PNG")
+
+    def test_missing_icon(self):
+        self.assertError(self.validate(world_traveler__png=None), "'world_traveler.png' is not in the archive")
+
+    def test_bad_points_and_duplicate_name(self):
+        metadata = ("First Steps,Complete any quiz,False,,Revealed,7,1\n"
+                    "First Steps,Complete it again,False,,Revealed,5,2\n")
+        report = self.validate(**{"AchievementsMetadata__csv": metadata})
+        self.assertError(report, "points must be a multiple of 5")
+        self.assertError(report, "duplicate name 'First Steps'")
+
+    def test_total_points_limit(self):
+        metadata = "".join(f"A{i},Do it,False,,Revealed,200,{i + 1}\n" for i in range(6))
+        report = self.validate(**{"AchievementsMetadata__csv": metadata, "AchievementsIconsMappings__csv": ""})
+        self.assertError(report, "1200 points in total")
+
+    def test_default_locale_in_localizations(self):
+        rows = "First Steps,First Steps,Complete any quiz,en-US\n"
+        self.assertError(self.validate(**{"AchievementsLocalizations__csv": rows}), "en-US is the default locale")
+
+    def test_missing_metadata(self):
+        self.assertError(self.validate(**{"AchievementsMetadata__csv": None}), f"no {METADATA_CSV}")
+
+    def test_legacy_mappings_name_is_a_warning(self):
+        report = self.validate(**{"AchievementsIconMappings__csv": "x,y\n"})
+        self.assertEqual(report.errors, [])
+        self.assertTrue(any("legacy name" in w for w in report.warnings), report.warnings)
+
+    def test_unreadable_archive(self):
+        with tempfile.NamedTemporaryFile(suffix=".zip") as f:
+            f.write(b"not a zip")
+            f.flush()
+            self.assertError(validate_path(f.name), "cannot read")
+
+
+if __name__ == "__main__":
+    unittest.main()
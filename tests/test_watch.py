@@ -0,0 +1,37 @@
+import importlib
+import inspect
+import unittest
+
+import generate_achievements_zip as achievements
+import generate_store_assets as store
+from assetgen.watch import LIBRARY_MODULES
+
+# Hold process-wide state rather than rendering code; never reloaded.
+UNWATCHED = {"instrument", "lazy"}
+
+
+def assetgen_imports(module):
+    """Names of the assetgen modules ``module`` imports (or imports something from)."""
+    names = set()
+    for value in vars(module).values():
+        name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+        if isinstance(name, str) and name.startswith("assetgen."):
+            names.add(name.split(".")[1])
+    return names - UNWATCHED - {module.__name__.rsplit(".", 1)[-1]}
+
+
+class LibraryModulesTest(unittest.TestCase):
+    def test_covers_everything_the_generators_import(self):
+        imported = assetgen_imports(achievements) | assetgen_imports(store)
+        self.assertEqual(imported - set(LIBRARY_MODULES), set())
+
+    def test_dependency_order(self):
+        # A reload re-runs every later module, so each module's dependencies must come first.
+        for position, name in enumerate(LIBRARY_MODULES):
+            module = importlib.import_module(f"assetgen.{name}")
+            with self.subTest(module=name):
+                self.assertEqual(assetgen_imports(module) - set(LIBRARY_MODULES[:position]), set())
+
+
+if __name__ == "__main__":
+    unittest.main()